@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+# Model.from_db ожидает значения в порядке полей модели.
+USER_CACHE_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname in {
+        "id", "username", "role", "is_staff", "is_superuser", "is_active"
+    }
+)
+
+
+def get_user_cache_key(user_id) -> str:
+    return f"auth-user:{user_id}"
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса к таблице пользователей.
+
+    Поля пользователя, нужные для проверки прав, кэшируются на
+    AUTH_USER_CACHE_TIMEOUT секунд. Пользователь из кэша загружает
+    остальные поля из базы только при обращении к ним. Кэш сбрасывается
+    сигналами из `api.signals` при изменении и удалении пользователя.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+        key = get_user_cache_key(user_id)
+        values = cache.get(key)
+        if values is not None:
+            user = User.from_db(DEFAULT_DB_ALIAS, USER_CACHE_FIELDS, values)
+        else:
+            user = User.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).first()
+            if user is None:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                )
+            cache.set(
+                key,
+                tuple(getattr(user, field) for field in USER_CACHE_FIELDS),
+                settings.AUTH_USER_CACHE_TIMEOUT,
+            )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        return user
@@ -1,5 +1,8 @@
 import django_filters
-from reviews.models import Title, Genre, Category
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+from reviews.models import Title, Genre, Category, normalize_search_value
 
 
 class TitleFilters(django_filters.FilterSet):
@@ -16,3 +19,79 @@ class TitleFilters(django_filters.FilterSet):
     class Meta:
         model = Title
         fields = ("year",)
+
+
+class TitleOrderingFilter(OrderingFilter):
+    """Сортировка произведений по денормализованным полям.
+
+    `?ordering=` принимает одно поле из `sort_keys`, с `-` для сортировки
+    по убыванию. Первичный ключ добавляется в том же направлении, поэтому
+    каждому значению соответствует индекс `(поле, id)`, а курсорная
+    пагинация получает уникальный ключ сортировки.
+    """
+
+    sort_keys = {
+        "rating": "rating_key",
+        "year": "year",
+        "name": "name",
+        "review_count": "review_count",
+    }
+    default_ordering = ("id",)
+
+    def get_ordering(self, request, queryset, view):
+        param = request.query_params.get(self.ordering_param, "").strip()
+        if not param:
+            return self.default_ordering
+        field = self.sort_keys.get(param.lstrip("-"))
+        if field is None:
+            choices = ", ".join(
+                f"{key}, -{key}" for key in self.sort_keys
+            )
+            raise ValidationError(
+                {self.ordering_param: f"Допустимые значения: {choices}."}
+            )
+        prefix = "-" if param.startswith("-") else ""
+        return (f"{prefix}{field}", f"{prefix}id")
+
+
+def get_prefix_upper_bound(prefix: str) -> str:
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class NormalizedSearchFilter(SearchFilter):
+    """Поиск по нормализованному индексируемому полю.
+
+    По умолчанию `?search=` ищет значения, начинающиеся с запроса, без
+    учета регистра. `?search_mode=exact` ищет точное совпадение, а
+    `?search_mode=regex` включает поиск по `search_fields` как в
+    стандартном `SearchFilter`.
+    """
+
+    search_mode_param = "search_mode"
+    search_modes = ("prefix", "exact", "regex")
+
+    def get_search_mode(self, request) -> str:
+        mode = request.query_params.get(self.search_mode_param, "prefix")
+        if mode not in self.search_modes:
+            raise ValidationError(
+                {self.search_mode_param: (
+                    f"Допустимые значения: {', '.join(self.search_modes)}."
+                )}
+            )
+        return mode
+
+    def filter_queryset(self, request, queryset, view):
+        mode = self.get_search_mode(request)
+        if mode == "regex":
+            return super().filter_queryset(request, queryset, view)
+        value = request.query_params.get(self.search_param, "").strip()
+        if not value:
+            return queryset
+        field = view.normalized_search_field
+        value = normalize_search_value(value)
+        if mode == "exact":
+            return queryset.filter(**{field: value})
+        return queryset.filter(**{
+            f"{field}__gte": value,
+            f"{field}__lt": get_prefix_upper_bound(value),
+        })
@@ -0,0 +1,269 @@
+import logging
+import time
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.cache import (
+    get_namespace_versions,
+    increment_counter,
+    make_key,
+)
+from core.metrics import get_registry
+from core.queries import QueryBudgetExceeded, count_queries
+
+logger = logging.getLogger(__name__)
+
+
+class CacheNamespacesMixin:
+    """Пространства имен кэша, от которых зависит ответ представления.
+
+    По умолчанию ответ зависит только от `cache_namespace`; версии
+    пространств имен читаются из кэша один раз за запрос.
+    """
+
+    cache_namespace = None
+
+    def get_cache_namespaces(self) -> tuple:
+        return (self.cache_namespace,)
+
+    def get_namespace_versions(self) -> tuple:
+        if not hasattr(self, "_namespace_versions"):
+            self._namespace_versions = get_namespace_versions(
+                *self.get_cache_namespaces()
+            )
+        return self._namespace_versions
+
+
+class CachedListMixin(CacheNamespacesMixin):
+    """Кэширует ответы на GET-запросы к списку объектов.
+
+    Ключ строится по адресу запроса и версиям пространств имен из
+    `get_cache_namespaces`, которые увеличиваются сигналами из
+    `api.signals`.
+    """
+
+    cache_header = "X-Cache"
+
+    def get_response_cache_key(self, request) -> str:
+        uri = request.build_absolute_uri().encode()
+        return make_key(
+            self.cache_namespace,
+            self.get_namespace_versions(),
+            md5(uri).hexdigest(),
+        )
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            increment_counter("hits", self.cache_namespace)
+            return Response(data, headers={self.cache_header: "HIT"})
+        increment_counter("misses", self.cache_namespace)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        response[self.cache_header] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedResponseMixin(CachedListMixin):
+    """Кэширует ответы на GET-запросы к списку и к отдельному объекту."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin(CacheNamespacesMixin):
+    """Отвечает 304 на условные GET-запросы к list и retrieve.
+
+    ETag вычисляется по адресу запроса, формату ответа и версиям
+    пространств имен из `get_cache_namespaces`. Сигналы увеличивают
+    версии при любом изменении, в том числе при удалении объектов и
+    изменении связанных объектов, поэтому проверка не обращается к базе
+    данных. Last-Modified не передается: время последнего изменения
+    списка или ответа со связанными объектами точно не известно.
+
+    Ответы 304 корректны, только если все процессы приложения используют
+    общий кэш (Redis, Memcached, база данных). Версии хранятся без срока
+    действия, и с локальным `LocMemCache`, который используется по
+    умолчанию, каждый процесс видит только свои изменения: процесс, не
+    обработавший изменение, продолжит отвечать 304 на старый ETag, пока
+    не будет перезапущен. В production бэкенд кэша задается переменными
+    окружения `CACHE_BACKEND` и `CACHE_LOCATION`.
+    """
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        fingerprint = "|".join((
+            request.build_absolute_uri(),
+            request.accepted_renderer.format,
+            *map(str, self.get_namespace_versions()),
+        ))
+        etag = f'"{md5(fingerprint.encode()).hexdigest()}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response["ETag"] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class QueryBudgetMixin:
+    """Проверяет число SQL-запросов, выполненных при обработке запроса.
+
+    Бюджет задается для каждого действия в `query_budgets`. При
+    QUERY_BUDGET_STRICT превышение бюджета или его отсутствие вызывает
+    исключение, иначе превышение записывается в лог.
+    """
+
+    query_budgets = {}
+
+    def get_action_name(self, request):
+        if hasattr(self, "action_map"):
+            return self.action
+        return request.method.lower()
+
+    def get_query_budget(self, action):
+        return self.query_budgets.get(action)
+
+    def dispatch(self, request, *args, **kwargs):
+        with count_queries() as counter:
+            response = super().dispatch(request, *args, **kwargs)
+        request.query_counter = counter
+        if response.status_code != status.HTTP_405_METHOD_NOT_ALLOWED:
+            self.check_query_budget(request, counter.count)
+        return response
+
+    def check_query_budget(self, request, count):
+        action = self.get_action_name(request)
+        if action is None:
+            return
+        budget = self.get_query_budget(action)
+        strict = getattr(settings, "QUERY_BUDGET_STRICT", False)
+        if budget is None:
+            if strict:
+                raise QueryBudgetExceeded(
+                    f"Для {type(self).__name__}.{action} не задан бюджет "
+                    f"SQL-запросов"
+                )
+            return
+        if count <= budget:
+            return
+        message = (
+            f"{type(self).__name__}.{action}: выполнено {count} "
+            f"SQL-запросов при бюджете {budget}"
+        )
+        if strict:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class SerializerMetricsMixin:
+    """Записывает в реестр метрик время сериализации ответа."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        to_representation = serializer.to_representation
+        labels = (("view", type(self).__name__), ("action", self.action))
+
+        def timed_to_representation(instance):
+            started = time.perf_counter()
+            try:
+                return to_representation(instance)
+            finally:
+                get_registry().observe(
+                    "yamdb_serializer_duration_seconds",
+                    labels,
+                    time.perf_counter() - started,
+                )
+
+        serializer.to_representation = timed_to_representation
+        return serializer
+
+
+class SparseFieldsMixin:
+    """Загружает из базы только поля, запрошенные через `?fields=` и
+    `?omit=`.
+
+    Связи из `select_related_fields` и `prefetch_related_fields`
+    подгружаются, только если соответствующее поле есть в ответе. Поля из
+    `sparse_required_fields` загружаются всегда, например ключи
+    сортировки, которые фильтр задает после построения queryset.
+    `sparse_field_sources` сопоставляет вычисляемые поля ответа с полями
+    модели, из которых они рассчитываются.
+    """
+
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    sparse_required_fields = ()
+    sparse_field_sources = {}
+
+    def get_sparse_fields(self):
+        serializer_class = self.get_serializer_class()
+        if not hasattr(serializer_class, "get_sparse_fields"):
+            return None
+        return serializer_class.get_sparse_fields(self.request)
+
+    def optimize_queryset(self, queryset):
+        fields = self.get_sparse_fields()
+        sparse = fields is not None
+        if not sparse:
+            fields = self.get_serializer_class().Meta.fields
+        select_related = [
+            field for field in self.select_related_fields if field in fields
+        ]
+        prefetch_related = [
+            field for field in self.prefetch_related_fields if field in fields
+        ]
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        if not sparse:
+            return queryset
+        model = queryset.model
+        # Поля сортировки нужны курсорной пагинации.
+        ordering = [
+            field.lstrip("-")
+            for field in queryset.query.order_by or model._meta.ordering
+            if isinstance(field, str)
+        ]
+        concrete = {field.name for field in model._meta.concrete_fields}
+        sources = [
+            source for field in fields
+            for source in self.sparse_field_sources.get(field, ())
+        ]
+        return queryset.only(*(
+            field for field in dict.fromkeys(
+                (
+                    model._meta.pk.name,
+                    *fields,
+                    *sources,
+                    *ordering,
+                    *self.sparse_required_fields,
+                )
+            )
+            if field in concrete and field not in prefetch_related
+        ))
@@ -0,0 +1,163 @@
+import json
+from base64 import b64decode, b64encode
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, CursorPagination,
+                                       PageNumberPagination)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class PubDateCursorPagination(CursorPagination):
+    ordering = ("-pub_date", "id")
+
+
+class OptionalCursorPagination(BasePagination):
+    """Постраничная пагинация с переключением на курсорную по запросу.
+
+    Курсорный режим включается параметром `?pagination=cursor` или
+    передачей курсора и не выполняет подсчет всех объектов.
+    """
+
+    mode_query_param = "pagination"
+    cursor_mode = "cursor"
+    page_number_class = PageNumberPagination
+    cursor_class = PubDateCursorPagination
+
+    def __init__(self):
+        self.paginator = self.page_number_class()
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, "display_page_controls", False)
+
+    def use_cursor(self, request) -> bool:
+        return (
+            request.query_params.get(self.mode_query_param) == self.cursor_mode
+            or self.cursor_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.paginator = self.cursor_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_schema_fields(self, view):
+        return self.paginator.get_schema_fields(view)
+
+    def get_schema_operation_parameters(self, view):
+        return self.paginator.get_schema_operation_parameters(view)
+
+
+class KeysetPagination(BasePagination):
+    """Курсорная пагинация по всем полям сортировки.
+
+    Порядок берется из `order_by` queryset, последнее поле должно быть
+    уникальным. Курсор хранит значения этих полей у последнего объекта
+    страницы, поэтому любая страница читается по индексу без смещения,
+    даже если значения первого поля у многих объектов совпадают.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Неверный курсор."
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            position = json.loads(
+                b64decode(encoded.encode("ascii"), altchars=b"-_")
+            )
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or (
+            len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        # Значения из курсора приводятся к типам полей сортировки, чтобы
+        # подделанный курсор не приводил к ошибке при построении запроса.
+        try:
+            return [
+                self.to_python(model, field, value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (FieldDoesNotExist, ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def to_python(self, model, field, value):
+        if value is None or isinstance(value, (dict, list)):
+            raise ValueError(f"Недопустимое значение курсора: {value!r}")
+        return model._meta.get_field(field.lstrip("-")).to_python(value)
+
+    def encode_cursor(self, position) -> str:
+        data = json.dumps(position, cls=DjangoJSONEncoder).encode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            b64encode(data, altchars=b"-_").decode("ascii"),
+        )
+
+    def get_position_filter(self, position):
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = [str(field) for field in queryset.query.order_by]
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+        page = list(queryset[:self.page_size + 1])
+        self.next_position = None
+        if len(page) > self.page_size:
+            page = page[:self.page_size]
+            self.next_position = [
+                getattr(page[-1], field.lstrip("-"))
+                for field in self.ordering
+            ]
+        return page
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+
+class OptionalKeysetPagination(OptionalCursorPagination):
+    """Постраничная пагинация с курсорным режимом по ключу сортировки."""
+
+    cursor_class = KeysetPagination
@@ -1,13 +1,62 @@
 from rest_framework import serializers
-from django.db.models import Avg
+from rest_framework.permissions import SAFE_METHODS
 from django.contrib.auth import get_user_model
+from django.db import connection, transaction
 from django.utils import timezone
 
+from core.cache import get_object_namespace, invalidate_on_commit
 from reviews.models import Review, Comment, Title, Genre, Category, TitleGenre
+from reviews.ratings import get_score_distribution
+from reviews.search import get_search_backend
 
 User = get_user_model()
 
 
+class SparseFieldsSerializerMixin:
+    """Оставляет в ответе только поля, перечисленные в параметре `?fields=`,
+    за вычетом полей из `?omit=`.
+
+    Параметры учитываются только для безопасных методов, поэтому на
+    проверку входных данных при записи они не влияют.
+    """
+
+    fields_query_param = "fields"
+    omit_query_param = "omit"
+
+    @classmethod
+    def get_query_param_values(cls, request, name) -> list:
+        value = request.query_params.get(name, "")
+        return [field.strip() for field in value.split(",") if field.strip()]
+
+    @classmethod
+    def get_sparse_fields(cls, request):
+        """Возвращает имена запрошенных полей или None для полного ответа."""
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        fields = cls.get_query_param_values(request, cls.fields_query_param)
+        omit = cls.get_query_param_values(request, cls.omit_query_param)
+        if not fields and not omit:
+            return None
+        unknown = set(fields).union(omit).difference(cls.Meta.fields)
+        if unknown:
+            raise serializers.ValidationError({
+                cls.fields_query_param: [
+                    f"Неизвестные поля: {', '.join(sorted(unknown))}."
+                ]
+            })
+        return tuple(
+            field for field in cls.Meta.fields
+            if (not fields or field in fields) and field not in omit
+        )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.get_sparse_fields(self.context.get("request"))
+        if fields is not None:
+            for name in set(self.fields).difference(fields):
+                self.fields.pop(name)
+
+
 class SignUpSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -29,7 +78,9 @@ class TokenSerializer(serializers.Serializer):
     confirmation_code = serializers.CharField(required=True)
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     author = serializers.SlugRelatedField(
         slug_field="username",
         read_only=True,
@@ -46,7 +97,9 @@ class ReviewSerializer(serializers.ModelSerializer):
         )
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     author = serializers.SlugRelatedField(
         slug_field="username",
         read_only=True,
@@ -74,21 +127,39 @@ class CategorySerializers(serializers.ModelSerializer):
         fields = ("name", "slug")
 
 
-class TitleGetSerializers(serializers.ModelSerializer):
+class TitleGetSerializers(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     genre = GenreSerializers(many=True)
     category = CategorySerializers()
-    rating = serializers.SerializerMethodField()
+    rating = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Title
         fields = ("id", "name", "year", "rating", "description", "genre",
                   "category")
 
-    def get_rating(self, obj):
-        rating = obj.reviews.aggregate(rating=Avg("score"))
-        if rating.get("rating") is None:
-            return None
-        return round(rating.get("rating"))
+
+class TitleRatingSerializer(serializers.Serializer):
+    """Распределение оценок произведения и рейтинги, рассчитанные по нему."""
+
+    count = serializers.IntegerField()
+    mean = serializers.FloatField(allow_null=True)
+    median = serializers.FloatField(allow_null=True)
+    bayesian = serializers.FloatField()
+    histogram = serializers.DictField(child=serializers.IntegerField())
+
+    def to_representation(self, instance):
+        return super().to_representation(
+            get_score_distribution(instance.score_histogram)
+        )
+
+
+class TitleDetailSerializer(TitleGetSerializers):
+    scores = TitleRatingSerializer(source="*", read_only=True)
+
+    class Meta(TitleGetSerializers.Meta):
+        fields = (*TitleGetSerializers.Meta.fields, "scores")
 
 
 class TitleSerializers(serializers.ModelSerializer):
@@ -111,6 +182,46 @@ class TitleSerializers(serializers.ModelSerializer):
         )
         return title
 
+    def update(self, instance, validated_data):
+        genres = validated_data.pop("genre", None)
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        with transaction.atomic():
+            if genres is not None:
+                self.update_genres(instance, genres)
+            if validated_data:
+                # Рейтинг и другие денормализованные поля не перезаписываются
+                # значениями, прочитанными до сохранения.
+                instance.save(update_fields=validated_data)
+        return instance
+
+    def update_genres(self, title, genres):
+        """Добавляет и удаляет только изменившиеся связи с жанрами."""
+        current = set(
+            TitleGenre.objects.filter(title=title).values_list(
+                "genre_id", flat=True
+            )
+        )
+        new = {genre.pk for genre in genres}
+        removed = current - new
+        added = [pk for pk in dict.fromkeys(genre.pk for genre in genres)
+                 if pk not in current]
+        if removed:
+            TitleGenre.objects.filter(
+                title=title, genre_id__in=removed
+            ).delete()
+        if added:
+            TitleGenre.objects.bulk_create([
+                TitleGenre(title=title, genre_id=pk, rating=title.rating)
+                for pk in added
+            ])
+        if removed or added:
+            # bulk_create не отправляет сигналов, а жанры выводятся и в
+            # карточке, и в списках произведений.
+            invalidate_on_commit(
+                "titles", get_object_namespace("title", title.pk)
+            )
+
     def validate_year(self, value):
         max_year = timezone.now().year
         if value > max_year:
@@ -120,7 +231,108 @@ class TitleSerializers(serializers.ModelSerializer):
         return value
 
 
-class UserSerializer(serializers.ModelSerializer):
+def set_inserted_primary_keys(objects):
+    """Назначает первичные ключи объектам, созданным bulk_create в SQLite.
+
+    Django не получает ключи строк, вставленных в SQLite. В базу пишет
+    только одно соединение, поэтому внутри транзакции ключи вставленных
+    строк идут подряд и заканчиваются значением `last_insert_rowid()`.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT last_insert_rowid()")
+        last_pk = cursor.fetchone()[0]
+    for pk, obj in enumerate(objects, last_pk - len(objects) + 1):
+        obj.pk = pk
+
+
+class TitleBulkCreateSerializer(serializers.ListSerializer):
+    """Массовое создание произведений.
+
+    Слаги жанров и категорий всех произведений проверяются одним запросом
+    к каждой таблице, а произведения и их жанры сохраняются пачкой в одной
+    транзакции.
+    """
+
+    def does_not_exist(self, value):
+        message = serializers.SlugRelatedField.default_error_messages[
+            "does_not_exist"
+        ]
+        return message.format(slug_name="slug", value=value)
+
+    def to_internal_value(self, data):
+        # Ошибки выбрасываются здесь, а не в validate, чтобы сохранить
+        # их список по произведениям.
+        attrs = super().to_internal_value(data)
+        genres = Genre.objects.in_bulk(
+            {slug for item in attrs for slug in item["genre"]},
+            field_name="slug",
+        )
+        categories = Category.objects.in_bulk(
+            {item["category"] for item in attrs}, field_name="slug"
+        )
+        errors = []
+        for item in attrs:
+            item_errors = {}
+            missing = [slug for slug in item["genre"] if slug not in genres]
+            if missing:
+                item_errors["genre"] = [
+                    self.does_not_exist(slug) for slug in missing
+                ]
+            if item["category"] not in categories:
+                item_errors["category"] = [
+                    self.does_not_exist(item["category"])
+                ]
+            errors.append(item_errors)
+            item["genre"] = [
+                genres[slug] for slug in dict.fromkeys(item["genre"])
+                if slug in genres
+            ]
+            item["category"] = categories.get(item["category"])
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        titles = [
+            Title(**{
+                field: value for field, value in item.items()
+                if field != "genre"
+            })
+            for item in validated_data
+        ]
+        with transaction.atomic():
+            returns_rows = connection.features.can_return_rows_from_bulk_insert
+            if returns_rows or connection.vendor == "sqlite":
+                Title.objects.bulk_create(titles)
+                if not returns_rows:
+                    set_inserted_primary_keys(titles)
+                get_search_backend().index(titles)
+            else:
+                # Без RETURNING первичные ключи известны только после
+                # сохранения каждого произведения.
+                for title in titles:
+                    title.save()
+            TitleGenre.objects.bulk_create([
+                TitleGenre(title=title, genre=genre)
+                for title, item in zip(titles, validated_data)
+                for genre in item["genre"]
+            ])
+            invalidate_on_commit("titles")
+        return titles
+
+
+class TitleBulkItemSerializer(TitleSerializers):
+    genre = serializers.ListField(child=serializers.SlugField())
+    category = serializers.SlugField()
+
+    class Meta(TitleSerializers.Meta):
+        fields = ("name", "year", "description", "genre", "category")
+        list_serializer_class = TitleBulkCreateSerializer
+
+
+class UserSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     class Meta:
         model = User
         fields = (
@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import get_object_namespace, invalidate_on_commit
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    Title,
+    TitleGenre,
+)
+from reviews.deletion import is_author_deleted, is_title_deleted
+from reviews.signals import connect_denormalization_receiver
+
+from .authentication import get_user_cache_key
+
+User = get_user_model()
+
+CACHE_DEPENDENCIES = {
+    Genre: ("genres", "titles"),
+    Category: ("categories", "titles"),
+}
+# Поля произведения, которые не выводятся в списках произведений.
+TITLE_DETAIL_FIELDS = {"score_sum", "score_histogram"}
+
+
+def invalidate_cached_responses(sender, **kwargs):
+    invalidate_on_commit(*CACHE_DEPENDENCIES[sender])
+
+
+def invalidate_title(title_id, update_fields=None):
+    namespaces = [get_object_namespace("title", title_id)]
+    if update_fields is None or not TITLE_DETAIL_FIELDS.issuperset(
+        update_fields
+    ):
+        namespaces.append("titles")
+    invalidate_on_commit(*namespaces)
+
+
+def invalidate_cached_title(sender, instance, update_fields=None,
+                            **kwargs):
+    invalidate_title(instance.pk, update_fields)
+
+
+def invalidate_cached_title_genre(sender, instance, **kwargs):
+    invalidate_title(instance.title_id)
+
+
+def invalidate_cached_review(sender, instance, **kwargs):
+    # Отзывы выводятся только в ответах о своем произведении, а рейтинг
+    # списков обновляется через сохранение произведения. При удалении
+    # произведения или автора кэш сбрасывается обработчиком их удаления.
+    if is_title_deleted(instance.title_id) or is_author_deleted(
+        instance.author_id
+    ):
+        return
+    namespaces = [get_object_namespace("title", instance.title_id)]
+    if kwargs["signal"] is post_delete:
+        namespaces.append(get_object_namespace("review", instance.pk))
+    invalidate_on_commit(*namespaces)
+
+
+def invalidate_cached_comment(sender, instance, **kwargs):
+    invalidate_on_commit(get_object_namespace("review", instance.review_id))
+
+
+for model in CACHE_DEPENDENCIES:
+    connect_denormalization_receiver(
+        post_save, invalidate_cached_responses, model
+    )
+    connect_denormalization_receiver(
+        post_delete, invalidate_cached_responses, model
+    )
+for model, receiver_func in (
+    (Title, invalidate_cached_title),
+    (TitleGenre, invalidate_cached_title_genre),
+    (Review, invalidate_cached_review),
+    (Comment, invalidate_cached_comment),
+):
+    connect_denormalization_receiver(post_save, receiver_func, model)
+    connect_denormalization_receiver(post_delete, receiver_func, model)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    key = get_user_cache_key(instance.pk)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+    # Имена авторов выводятся в отзывах и комментариях. Новый
+    # пользователь еще не может быть их автором.
+    if not kwargs.get("created"):
+        invalidate_on_commit("users")
+    # Рейтинг произведений с отзывами удаленного пользователя
+    # пересчитывается без сигналов сохранения произведений.
+    title_ids = getattr(instance, "_reviewed_title_ids", None)
+    if title_ids:
+        invalidate_on_commit("titles", *(
+            get_object_namespace("title", title_id) for title_id in title_ids
+        ))
@@ -0,0 +1,100 @@
+import time
+from hashlib import md5
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from reviews.models import normalize_search_value
+
+MICROSECONDS = 1_000_000
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Ограничение частоты запросов по алгоритму маркерной корзины.
+
+    Частота задается в DEFAULT_THROTTLE_RATES в формате DRF: "5/min"
+    означает корзину на 5 запросов, которая полностью наполняется за
+    минуту. В кэше хранится теоретическое время следующего запроса
+    (GCRA), а каждый запрос резервирует свой интервал атомарным
+    `cache.incr`, поэтому одновременные запросы не могут пройти сверх
+    лимита.
+    """
+
+    scope_suffix = None
+    cache_format = "throttle:{scope}:{ident}"
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_scope(self, view):
+        scope = getattr(view, "throttle_scope", None)
+        if scope is None:
+            return None
+        return f"{scope}_{self.scope_suffix}"
+
+    def get_ident_value(self, request):
+        raise NotImplementedError(
+            ".get_ident_value() must be overridden"
+        )
+
+    def get_rate(self, scope):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if rate is None:
+            return None
+        num_requests, period = rate.split("/")
+        return int(num_requests), PERIODS[period[0]]
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(view)
+        rate = self.get_rate(scope) if scope else None
+        ident = self.get_ident_value(request)
+        if rate is None or not ident:
+            return True
+        burst, duration = rate
+        interval = duration * MICROSECONDS // burst
+        key = self.cache_format.format(
+            scope=scope, ident=md5(ident.encode()).hexdigest()
+        )
+        timeout = duration + 1
+        now = int(time.time() * MICROSECONDS)
+
+        if cache.add(key, now + interval, timeout):
+            return True
+        try:
+            tat = cache.incr(key, interval)
+        except ValueError:
+            return True
+        previous = tat - interval
+        if previous < now:
+            # Корзина успела наполниться: переносим отсчет на текущее время.
+            tat = cache.incr(key, now - previous)
+        cache.touch(key, timeout)
+        if tat - now <= burst * interval:
+            return True
+        cache.decr(key, interval)
+        self.wait_seconds = (tat - now - burst * interval) / MICROSECONDS
+        return False
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    scope_suffix = "ip"
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class UsernameTokenBucketThrottle(TokenBucketThrottle):
+    """Ограничивает запросы, относящиеся к одному имени пользователя."""
+
+    scope_suffix = "user"
+
+    def get_ident_value(self, request):
+        username = request.data.get("username")
+        if not isinstance(username, str) or not username:
+            return None
+        return normalize_search_value(username)
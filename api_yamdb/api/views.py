@@ -1,14 +1,14 @@
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
+from django.core.cache import cache
 from django_filters.rest_framework import DjangoFilterBackend
 from django.conf import settings
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.decorators import action
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from rest_framework.filters import SearchFilter
 from rest_framework.serializers import ValidationError
 from rest_framework import status
 from rest_framework.views import APIView
@@ -19,15 +19,40 @@ from .serializers import (
     CommentSerializer,
     TitleSerializers,
     TitleGetSerializers,
+    TitleDetailSerializer,
+    TitleRatingSerializer,
+    TitleBulkItemSerializer,
     GenreSerializers,
     CategorySerializers,
     SignUpSerializer,
     TokenSerializer,
     UserSerializer,
 )
-from reviews.models import Title, Review, Genre, Category, User
+from core.cache import get_object_namespace
+from core.outbox import enqueue_email
+from reviews.models import Title, TitleGenre, Review, Genre, Category, User
+from reviews.ratings import get_trending_threshold
+from reviews.search import get_search_backend
 from .viewsets import ListCreateDeleteViewSet
-from .filters import TitleFilters
+from .filters import (
+    TitleFilters,
+    TitleOrderingFilter,
+    NormalizedSearchFilter,
+)
+from .pagination import (
+    KeysetPagination,
+    OptionalCursorPagination,
+    OptionalKeysetPagination,
+)
+from .mixins import (
+    CachedListMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    QueryBudgetMixin,
+    SerializerMetricsMixin,
+    SparseFieldsMixin,
+)
+from .throttling import IPTokenBucketThrottle, UsernameTokenBucketThrottle
 from .permissions import (
     IsAuthorModeratorAdminOrReadOnly,
     IsAdminOrReadOnly,
@@ -38,12 +63,23 @@ from .permissions import (
 User = get_user_model()
 
 
-class SignUpUserViewSet(APIView):
+class SignUpUserViewSet(QueryBudgetMixin, APIView):
+    query_budgets = {
+        "post": 5,
+    }
     permission_classes = (AllowAny,)
+    throttle_classes = (IPTokenBucketThrottle, UsernameTokenBucketThrottle)
+    throttle_scope = "signup"
 
     def send_confirmation_code(self, user):
+        # Повторные запросы в течение SIGNUP_EMAIL_WINDOW не создают новых
+        # писем: код из уже отправленного письма остается действительным.
+        if not cache.add(
+            f"signup-email:{user.pk}", True, settings.SIGNUP_EMAIL_WINDOW
+        ):
+            return
         confirmation_code = default_token_generator.make_token(user)
-        send_mail(
+        enqueue_email(
             subject="Conformation code",
             message=confirmation_code,
             from_email=settings.NOREPLY_EMAIL,
@@ -69,8 +105,13 @@ class SignUpUserViewSet(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class TokenAPIView(APIView):
+class TokenAPIView(QueryBudgetMixin, APIView):
+    query_budgets = {
+        "post": 1,
+    }
     permission_classes = (AllowAny,)
+    throttle_classes = (IPTokenBucketThrottle, UsernameTokenBucketThrottle)
+    throttle_scope = "token"
 
     def post(self, request):
         serializer = TokenSerializer(data=request.data)
@@ -94,7 +135,20 @@ class TokenAPIView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ReviewViewSet(ModelViewSet):
+class ReviewViewSet(
+    QueryBudgetMixin,
+    SerializerMetricsMixin,
+    SparseFieldsMixin,
+    ConditionalGetMixin,
+    ModelViewSet,
+):
+    query_budgets = {
+        "list": 4,
+        "retrieve": 3,
+        "create": 7,
+        "partial_update": 8,
+        "destroy": 10,
+    }
     http_method_names = (
         "get",
         "post",
@@ -103,12 +157,19 @@ class ReviewViewSet(ModelViewSet):
     )
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthorModeratorAdminOrReadOnly,)
+    pagination_class = OptionalCursorPagination
+    select_related_fields = ("author",)
+
+    def get_cache_namespaces(self):
+        return (
+            "users", get_object_namespace("title", self.kwargs["title_id"])
+        )
 
     def get_title(self) -> Title:
         return get_object_or_404(Title, pk=self.kwargs.get("title_id"))
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.optimize_queryset(self.get_title().reviews.all())
 
     def perform_create(self, serializer):
         title = self.get_title()
@@ -123,7 +184,20 @@ class ReviewViewSet(ModelViewSet):
         )
 
 
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(
+    QueryBudgetMixin,
+    SerializerMetricsMixin,
+    SparseFieldsMixin,
+    ConditionalGetMixin,
+    ModelViewSet,
+):
+    query_budgets = {
+        "list": 4,
+        "retrieve": 3,
+        "create": 3,
+        "partial_update": 4,
+        "destroy": 4,
+    }
     http_method_names = (
         "get",
         "post",
@@ -132,6 +206,15 @@ class CommentViewSet(ModelViewSet):
     )
     serializer_class = CommentSerializer
     permission_classes = (IsAuthorModeratorAdminOrReadOnly,)
+    pagination_class = OptionalCursorPagination
+    select_related_fields = ("author",)
+
+    def get_cache_namespaces(self):
+        return (
+            "users",
+            get_object_namespace("title", self.kwargs["title_id"]),
+            get_object_namespace("review", self.kwargs["review_id"]),
+        )
 
     def get_review(self) -> Review:
         return get_object_or_404(
@@ -141,7 +224,7 @@ class CommentViewSet(ModelViewSet):
         )
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.optimize_queryset(self.get_review().comments.all())
 
     def perform_create(self, serializer):
         serializer.save(
@@ -150,41 +233,254 @@ class CommentViewSet(ModelViewSet):
         )
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(
+    QueryBudgetMixin,
+    SerializerMetricsMixin,
+    SparseFieldsMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    ModelViewSet,
+):
+    query_budgets = {
+        "list": 5,
+        "retrieve": 3,
+        "rating": 1,
+        "similar": 3,
+        "search": 4,
+        "top": 5,
+        "trending": 4,
+        "bulk_create": 9,
+        "create": 10,
+        "partial_update": 11,
+        "destroy": 10,
+    }
     queryset = Title.objects.all()
+    lookup_value_regex = r"\d+"
+    cache_namespace = "titles"
     http_method_names = (
         "get",
         "post",
         "patch",
         "delete",
     )
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, TitleOrderingFilter)
     filterset_class = TitleFilters
+    pagination_class = OptionalKeysetPagination
     permission_classes = (IsAdminOrReadOnly,)
+    select_related_fields = ("category",)
+    prefetch_related_fields = ("genre",)
+    sparse_required_fields = tuple(TitleOrderingFilter.sort_keys.values())
+    sparse_field_sources = {"scores": ("score_histogram",)}
+
+    def get_queryset(self):
+        if self.request.method == "GET":
+            return self.optimize_queryset(Title.objects.all())
+        return Title.objects.all()
+
+    def get_cache_namespaces(self):
+        # Ответы об одном произведении сбрасываются только при изменении
+        # этого произведения, а списки и подборки - при изменении любого.
+        if self.action == "retrieve":
+            return (
+                "genres",
+                "categories",
+                get_object_namespace("title", self.kwargs["pk"]),
+            )
+        if self.action == "rating":
+            return (get_object_namespace("title", self.kwargs["pk"]),)
+        return super().get_cache_namespaces()
 
     def get_serializer_class(self):
+        if self.action == "retrieve":
+            return TitleDetailSerializer
         if self.request.method == "GET":
             return TitleGetSerializers
         return TitleSerializers
 
+    @action(
+        detail=False,
+        methods=("post",),
+        url_path="bulk",
+        permission_classes=(IsAdmin,),
+    )
+    def bulk_create(self, request):
+        if (
+            isinstance(request.data, list)
+            and len(request.data) > settings.TITLE_BULK_MAX_ITEMS
+        ):
+            raise ValidationError({"non_field_errors": [
+                "За один запрос можно создать не больше "
+                f"{settings.TITLE_BULK_MAX_ITEMS} произведений."
+            ]})
+        serializer = TitleBulkItemSerializer(
+            data=request.data, many=True, allow_empty=False
+        )
+        serializer.is_valid(raise_exception=True)
+        titles = serializer.save()
+        queryset = (
+            Title.objects.filter(pk__in=[title.pk for title in titles])
+            .select_related("category")
+            .prefetch_related("genre")
+        )
+        return Response(
+            TitleSerializers(queryset, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    def get_top_page(self, request):
+        genre_slug = request.query_params.get("genre")
+        category_slug = request.query_params.get("category")
+        if genre_slug and category_slug:
+            raise ValidationError(
+                "Укажите только один из параметров genre и category."
+            )
+        if genre_slug:
+            # Лучшие произведения жанра выбираются по копии рейтинга в
+            # таблице жанров, чтобы страница читалась по одному индексу.
+            genre = get_object_or_404(Genre, slug=genre_slug)
+            links = self.paginate_queryset(
+                TitleGenre.objects.filter(genre=genre, rating__isnull=False)
+                .only("title_id", "rating")
+                .order_by("-rating", "-title_id")
+            )
+            titles = self.optimize_queryset(Title.objects.all()).in_bulk(
+                [link.title_id for link in links]
+            )
+            return [titles[link.title_id] for link in links]
+        queryset = Title.objects.filter(rating_key__gt=0)
+        if category_slug:
+            category = get_object_or_404(Category, slug=category_slug)
+            queryset = queryset.filter(category=category)
+        return self.paginate_queryset(
+            self.optimize_queryset(queryset.order_by("-rating_key", "-id"))
+        )
+
+    def get_leaderboard_response(self, page):
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(
+        detail=False,
+        url_path="top",
+        pagination_class=KeysetPagination,
+    )
+    def top(self, request):
+        return self.get_cached_response(
+            lambda request: self.get_leaderboard_response(
+                self.get_top_page(request)
+            ),
+            request,
+        )
+
+    @action(
+        detail=False,
+        url_path="trending",
+        pagination_class=KeysetPagination,
+    )
+    def trending(self, request):
+        queryset = Title.objects.filter(
+            trending_score__gte=get_trending_threshold()
+        ).order_by("-trending_score", "id")
+        return self.get_cached_response(
+            lambda request: self.get_leaderboard_response(
+                self.paginate_queryset(self.optimize_queryset(queryset))
+            ),
+            request,
+        )
+
+    @action(detail=True, url_path="rating")
+    def rating(self, request, pk=None):
+        def get_rating(request):
+            title = get_object_or_404(
+                Title.objects.only("pk", "score_histogram"), pk=pk
+            )
+            return Response(TitleRatingSerializer(title).data)
+
+        return self.get_cached_response(get_rating, request)
+
+    @action(detail=True, url_path="similar")
+    def similar(self, request, pk=None):
+        def get_similar(request):
+            # Список читается по индексу (title, rank) таблицы похожих
+            # произведений, которую заполняет rebuild_similar_titles.
+            titles = list(self.optimize_queryset(
+                Title.objects.filter(similar_to__title_id=pk)
+                .order_by("similar_to__rank")
+            ))
+            if not titles:
+                get_object_or_404(Title.objects.only("pk"), pk=pk)
+            return Response(self.get_serializer(titles, many=True).data)
+
+        return self.get_cached_response(get_similar, request)
+
+    @action(
+        detail=False,
+        url_path="search",
+        pagination_class=PageNumberPagination,
+    )
+    def search(self, request):
+        query = request.query_params.get("q", "")
+        if not query.strip():
+            raise ValidationError({"q": "Укажите поисковый запрос."})
+        queryset = get_search_backend().search(
+            self.filter_queryset(self.get_queryset()), query
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
-class GenreViewSet(ListCreateDeleteViewSet):
+
+class GenreViewSet(
+    QueryBudgetMixin,
+    SerializerMetricsMixin,
+    CachedListMixin,
+    ListCreateDeleteViewSet,
+):
+    query_budgets = {
+        "list": 3,
+        "create": 3,
+        "destroy": 6,
+    }
     queryset = Genre.objects.all()
+    cache_namespace = "genres"
     serializer_class = GenreSerializers
-    filter_backends = (SearchFilter,)
+    filter_backends = (NormalizedSearchFilter,)
     search_fields = ("$name",)
+    normalized_search_field = "name_lower"
     permission_classes = (IsAdminOrReadOnly,)
 
 
-class CategoryViewSet(ListCreateDeleteViewSet):
+class CategoryViewSet(
+    QueryBudgetMixin,
+    SerializerMetricsMixin,
+    CachedListMixin,
+    ListCreateDeleteViewSet,
+):
+    query_budgets = {
+        "list": 3,
+        "create": 3,
+        "destroy": 5,
+    }
     queryset = Category.objects.all()
+    cache_namespace = "categories"
     serializer_class = CategorySerializers
-    filter_backends = (SearchFilter,)
+    filter_backends = (NormalizedSearchFilter,)
     search_fields = ("$name",)
+    normalized_search_field = "name_lower"
     permission_classes = (IsAdminOrReadOnly,)
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(
+    QueryBudgetMixin, SerializerMetricsMixin, SparseFieldsMixin, ModelViewSet
+):
+    query_budgets = {
+        "list": 3,
+        "retrieve": 2,
+        "create": 4,
+        "partial_update": 3,
+        "destroy": 30,
+        "user_profile": 3,
+    }
     queryset = User.objects.all()
     http_method_names = (
         "get",
@@ -193,12 +489,16 @@ class UserViewSet(ModelViewSet):
         "delete",
     )
     serializer_class = UserSerializer
-    filter_backends = (SearchFilter,)
+    filter_backends = (NormalizedSearchFilter,)
     search_fields = ("$username",)
+    normalized_search_field = "username_lower"
     permission_classes = (IsAdmin,)
     lookup_field = "username"
     lookup_value_regex = r"[\w.@+-]+"
 
+    def get_queryset(self):
+        return self.optimize_queryset(User.objects.all())
+
     @action(
         detail=False,
         methods=("get", "patch"),
@@ -206,11 +506,15 @@ class UserViewSet(ModelViewSet):
         permission_classes=(IsOwner,),
     )
     def user_profile(self, request):
+        user = request.user
+        if user.get_deferred_fields():
+            # Пользователь из кэша аутентификации содержит не все поля.
+            user = User.objects.get(pk=user.pk)
         if request.method == "GET":
-            serializer = self.get_serializer(request.user)
+            serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
         serializer = self.get_serializer(
-            request.user, data=request.data, partial=True
+            user, data=request.data, partial=True
         )
         if serializer.is_valid():
             if "role" in serializer.validated_data.keys():
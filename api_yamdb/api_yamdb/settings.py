@@ -28,6 +28,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.QueryCountMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -104,10 +106,20 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    # Число доверенных прокси-серверов перед приложением. Без прокси адрес
+    # клиента берется из REMOTE_ADDR, а присланный клиентом заголовок
+    # X-Forwarded-For не может обойти ограничение частоты запросов.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 0)),
+    "DEFAULT_THROTTLE_RATES": {
+        "signup_ip": "30/min",
+        "signup_user": "5/min",
+        "token_ip": "30/min",
+        "token_user": "10/min",
+    },
 }
 
 SIMPLE_JWT = {
@@ -115,7 +127,45 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Версии пространств имен кэша определяют ETag и актуальность
+# закэшированных ответов, поэтому при нескольких процессах нужен общий
+# кэш: LocMemCache подходит только для разработки и тестов.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "api_yamdb"),
+    }
+}
+
+API_CACHE_TIMEOUT = 300
+AUTH_USER_CACHE_TIMEOUT = 60
+
+TITLE_BULK_MAX_ITEMS = 1000
+
+TRENDING_HALF_LIFE = 2 * 24 * 3600
+TRENDING_WINDOW = 7 * 24 * 3600
+
+# Априорная оценка байесовского рейтинга и число отзывов, которому она
+# равносильна.
+RATING_PRIOR_MEAN = 5.5
+RATING_PRIOR_WEIGHT = 5
+
+SIMILAR_TITLES_COUNT = 20
+
+QUERY_BUDGET_STRICT = False
+
+METRICS_DIR = os.getenv("METRICS_DIR")
+METRICS_FLUSH_INTERVAL = 1.0
+
 EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
 
 NOREPLY_EMAIL = "noreply@yamdb.com"
+SIGNUP_EMAIL_WINDOW = 300
+
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_BACKOFF = 30
+EMAIL_OUTBOX_MAX_BACKOFF = 3600
+EMAIL_OUTBOX_LEASE = 300
@@ -0,0 +1,13 @@
+from django.contrib import admin
+
+from .models import OutgoingEmail
+
+
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        "pk", "subject", "created", "attempts", "next_attempt_at", "sent_at"
+    )
+    list_filter = ("sent_at",)
+
+
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
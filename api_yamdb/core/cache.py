@@ -0,0 +1,90 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .metrics import get_registry
+
+CACHE_PREFIX = "api-cache"
+GLOBAL_NAMESPACE = "__all__"
+
+
+def get_version_key(namespace: str) -> str:
+    return f"{CACHE_PREFIX}:version:{namespace}"
+
+
+def get_object_namespace(namespace: str, pk) -> str:
+    """Пространство имен ответов, зависящих от одного объекта."""
+    return f"{namespace}:{pk}"
+
+
+def get_namespace_versions(*namespaces) -> tuple:
+    """Возвращает версии общего и переданных пространств имен кэша.
+
+    Версии читаются одним обращением к кэшу. Новая версия начинается с
+    текущего времени, чтобы после вытеснения ключа версии из кэша не
+    вернуть записи, сохраненные до этого.
+    """
+    keys = [
+        get_version_key(namespace)
+        for namespace in (GLOBAL_NAMESPACE, *namespaces)
+    ]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        initial = time.time_ns()
+        for key in missing:
+            cache.add(key, initial, timeout=None)
+        versions.update(cache.get_many(missing))
+        for key in missing:
+            versions.setdefault(key, initial)
+    return tuple(versions[key] for key in keys)
+
+
+def invalidate_namespaces(*namespaces):
+    for namespace in namespaces:
+        try:
+            cache.incr(get_version_key(namespace))
+        except ValueError:
+            cache.add(get_version_key(namespace), time.time_ns(), timeout=None)
+
+
+class PendingInvalidation:
+    """Пространства имен, которые нужно сбросить после фиксации транзакции.
+
+    Одна транзакция регистрирует не больше одного такого обработчика,
+    поэтому каждое пространство имен сбрасывается один раз, сколько бы
+    объектов транзакция ни изменила.
+    """
+
+    def __init__(self, namespaces):
+        self.namespaces = set(namespaces)
+
+    def __call__(self):
+        invalidate_namespaces(*self.namespaces)
+
+
+def invalidate_on_commit(*namespaces):
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        for entry in connection.run_on_commit:
+            if isinstance(entry[1], PendingInvalidation):
+                entry[1].namespaces.update(namespaces)
+                return
+    transaction.on_commit(PendingInvalidation(namespaces))
+
+
+def invalidate_all():
+    invalidate_namespaces(GLOBAL_NAMESPACE)
+
+
+def make_key(namespace: str, versions, suffix: str) -> str:
+    version = ".".join(map(str, versions))
+    return f"{CACHE_PREFIX}:{namespace}:{version}:{suffix}"
+
+
+def increment_counter(name: str, namespace: str):
+    get_registry().inc(
+        "yamdb_cache_requests_total",
+        (("namespace", namespace), ("result", name)),
+    )
@@ -0,0 +1,44 @@
+import csv
+import io
+
+QUOTE = b'"'
+
+
+def read_header(path: str):
+    """Возвращает заголовок csv файла и смещение первой строки данных."""
+    with open(path, "rb") as csv_file:
+        line = csv_file.readline()
+    header = next(csv.reader([line.decode("utf-8", errors="ignore")]))
+    return header, len(line)
+
+
+def split_into_shards(path: str, shard_size: int) -> list:
+    """Делит csv файл на части по границам записей.
+
+    Граница ставится только после строки, за которой не остается открытых
+    кавычек, поэтому многострочные значения не разрываются.
+    """
+    _, start = read_header(path)
+    shards = []
+    shard_start = position = start
+    in_quotes = False
+    with open(path, "rb") as csv_file:
+        csv_file.seek(start)
+        for line in csv_file:
+            position += len(line)
+            if line.count(QUOTE) % 2:
+                in_quotes = not in_quotes
+            if not in_quotes and position - shard_start >= shard_size:
+                shards.append((shard_start, position))
+                shard_start = position
+    if position > shard_start:
+        shards.append((shard_start, position))
+    return shards
+
+
+def parse_shard(path: str, start: int, end: int) -> list:
+    with open(path, "rb") as csv_file:
+        csv_file.seek(start)
+        data = csv_file.read(end - start)
+    text = io.StringIO(data.decode("utf-8", errors="ignore"), newline="")
+    return [row for row in csv.reader(text) if row]
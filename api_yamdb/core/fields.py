@@ -0,0 +1,45 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import models
+
+_state = threading.local()
+
+
+@contextmanager
+def creation_dates_kept():
+    """Сохраняет заданные явно значения полей `CreationDateTimeField`.
+
+    Действует только в текущем потоке: команды генерации данных и тесты
+    могут задавать даты публикации, не меняя поведение полей для
+    запросов, которые в это время обрабатываются в других потоках.
+    """
+    previous = getattr(_state, "enabled", False)
+    _state.enabled = True
+    try:
+        yield
+    finally:
+        _state.enabled = previous
+
+
+class CreationDateTimeField(models.DateTimeField):
+    """Дата создания с `auto_now_add=True`, которую внутри
+    `creation_dates_kept()` можно задать явно."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs["auto_now_add"] = True
+        super().__init__(*args, **kwargs)
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if add and value is not None and getattr(_state, "enabled", False):
+            value = self.to_python(value)
+            setattr(model_instance, self.attname, value)
+            return value
+        return super().pre_save(model_instance, add)
+
+    def deconstruct(self):
+        # В миграциях поле остается обычным DateTimeField: отличается
+        # только поведение при сохранении.
+        name, _, args, kwargs = super().deconstruct()
+        return name, "django.db.models.DateTimeField", args, kwargs
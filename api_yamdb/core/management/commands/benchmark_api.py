@@ -0,0 +1,406 @@
+import json
+import math
+import statistics
+import time
+from collections import Counter
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.urls import router_v1
+from core.cache import invalidate_all
+from core.queries import QueryCounter
+from reviews.models import Category, Comment, Genre, Review, Title
+
+User = get_user_model()
+
+BENCHMARK_USERNAME = "benchmark_admin"
+SAVEPOINT_STATEMENTS = (
+    "SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT"
+)
+
+
+def percentile(values, percent):
+    """Процентиль по методу ближайшего ранга."""
+    values = sorted(values)
+    return values[max(0, math.ceil(len(values) * percent / 100) - 1)]
+
+
+class RequestQueryCounter(QueryCounter):
+    """Не учитывает точки сохранения.
+
+    В замере каждый запрос выполняется во внешней транзакции, поэтому
+    транзакции представлений становятся точками сохранения, которых нет
+    при обычной работе.
+    """
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.startswith(SAVEPOINT_STATEMENTS):
+            return execute(sql, params, many, context)
+        return super().__call__(execute, sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Замер задержки и числа SQL-запросов для всех адресов API на "
+        "текущих данных. Запросы на запись выполняются в транзакции, "
+        "которая откатывается, поэтому данные в базе не меняются"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--only",
+            action="append",
+            help="Run only this scenario; may be repeated",
+        )
+        parser.add_argument(
+            "--warm-cache",
+            action="store_true",
+            help="Keep the response cache between requests",
+        )
+        parser.add_argument("--bulk-size", type=int, default=10)
+        parser.add_argument(
+            "--output", help="Write the results to this JSON file"
+        )
+        parser.add_argument(
+            "--compare", help="Print the difference with this JSON file"
+        )
+
+    def get_objects(self):
+        title = Title.objects.order_by("-review_count", "pk").first()
+        comment = Comment.objects.select_related("review").order_by(
+            "pk"
+        ).first()
+        if title is None or comment is None:
+            raise CommandError(
+                "В базе нет произведений или комментариев, "
+                "заполните ее командой generate_data"
+            )
+        review = title.reviews.select_related("author").first() or (
+            comment.review
+        )
+        admin = User.objects.create(
+            username=BENCHMARK_USERNAME,
+            email=f"{BENCHMARK_USERNAME}@yamdb.fake",
+            role="admin",
+        )
+        return {
+            "title": title,
+            "review": review,
+            "comment": comment,
+            "genre": Genre.objects.order_by("pk").first(),
+            "category": Category.objects.order_by("pk").first(),
+            "admin": admin,
+        }
+
+    def get_scenarios(self, objects, bulk_size):
+        """Возвращает сценарии: имя адреса в роутере, метод, аргументы
+        адреса, параметры строки запроса и тело запроса."""
+        title = objects["title"]
+        review = objects["review"]
+        comment = objects["comment"]
+        genre = objects["genre"]
+        category = objects["category"]
+        admin = objects["admin"]
+        title_data = {
+            "name": "Benchmark title",
+            "year": 2000,
+            "genre": [genre.slug],
+            "category": category.slug,
+        }
+        search_query = title.name.split()[0]
+        title_kwargs = {"title_id": title.pk}
+        review_kwargs = {"title_id": review.title_id, "pk": review.pk}
+        comments_kwargs = {
+            "title_id": comment.review.title_id,
+            "review_id": comment.review_id,
+        }
+        comment_kwargs = {**comments_kwargs, "pk": comment.pk}
+        user_kwargs = {"username": review.author.username}
+        return {
+            "api_root": ("api-root", "get", {}, "", None),
+            "titles_list": ("title-list", "get", {}, "", None),
+            "titles_list_filtered": (
+                "title-list", "get", {}, f"genre={genre.slug}", None
+            ),
+            "titles_list_sparse": (
+                "title-list", "get", {}, "fields=id,name", None
+            ),
+            "titles_list_ordered": (
+                "title-list", "get", {}, "ordering=-rating&pagination=cursor",
+                None,
+            ),
+            "titles_search": (
+                "title-search", "get", {}, f"q={search_query}", None
+            ),
+            "titles_top": ("title-top", "get", {}, "", None),
+            "titles_top_genre": (
+                "title-top", "get", {}, f"genre={genre.slug}", None
+            ),
+            "titles_trending": ("title-trending", "get", {}, "", None),
+            "titles_retrieve": (
+                "title-detail", "get", {"pk": title.pk}, "", None
+            ),
+            "titles_rating": (
+                "title-rating", "get", {"pk": title.pk}, "", None
+            ),
+            "titles_similar": (
+                "title-similar", "get", {"pk": title.pk}, "", None
+            ),
+            "titles_create": ("title-list", "post", {}, "", title_data),
+            "titles_bulk_create": (
+                "title-bulk-create", "post", {}, "",
+                [
+                    {**title_data, "name": f"Benchmark title {idx}"}
+                    for idx in range(bulk_size)
+                ],
+            ),
+            "titles_partial_update": (
+                "title-detail", "patch", {"pk": title.pk}, "",
+                {"genre": [genre.slug]},
+            ),
+            "titles_destroy": (
+                "title-detail", "delete", {"pk": title.pk}, "", None
+            ),
+            "reviews_list": ("reviews-list", "get", title_kwargs, "", None),
+            "reviews_list_cursor": (
+                "reviews-list", "get", title_kwargs, "pagination=cursor",
+                None,
+            ),
+            "reviews_retrieve": (
+                "reviews-detail", "get", review_kwargs, "", None
+            ),
+            "reviews_create": (
+                "reviews-list", "post", title_kwargs, "",
+                {"text": "Benchmark review", "score": 7},
+            ),
+            "reviews_partial_update": (
+                "reviews-detail", "patch", review_kwargs, "", {"score": 3}
+            ),
+            "reviews_destroy": (
+                "reviews-detail", "delete", review_kwargs, "", None
+            ),
+            "comments_list": (
+                "comments-list", "get", comments_kwargs, "", None
+            ),
+            "comments_retrieve": (
+                "comments-detail", "get", comment_kwargs, "", None
+            ),
+            "comments_create": (
+                "comments-list", "post", comments_kwargs, "",
+                {"text": "Benchmark comment"},
+            ),
+            "comments_partial_update": (
+                "comments-detail", "patch", comment_kwargs, "",
+                {"text": "Benchmark comment"},
+            ),
+            "comments_destroy": (
+                "comments-detail", "delete", comment_kwargs, "", None
+            ),
+            "genres_list": ("genre-list", "get", {}, "", None),
+            "genres_create": (
+                "genre-list", "post", {}, "",
+                {"name": "Benchmark", "slug": "benchmark"},
+            ),
+            "genres_destroy": (
+                "genre-detail", "delete", {"slug": genre.slug}, "", None
+            ),
+            "categories_list": ("category-list", "get", {}, "", None),
+            "categories_create": (
+                "category-list", "post", {}, "",
+                {"name": "Benchmark", "slug": "benchmark"},
+            ),
+            "categories_destroy": (
+                "category-detail", "delete", {"slug": category.slug}, "",
+                None,
+            ),
+            "users_list": ("user-list", "get", {}, "", None),
+            "users_retrieve": ("user-detail", "get", user_kwargs, "", None),
+            "users_create": (
+                "user-list", "post", {}, "",
+                {
+                    "username": "benchmark_user",
+                    "email": "benchmark_user@yamdb.fake",
+                },
+            ),
+            "users_partial_update": (
+                "user-detail", "patch", user_kwargs, "",
+                {"bio": "Benchmark"},
+            ),
+            "users_destroy": (
+                "user-detail", "delete", user_kwargs, "", None
+            ),
+            "users_me": ("user-user-profile", "get", {}, "", None),
+            "auth_signup": (
+                "/api/v1/auth/signup/", "post", {}, "",
+                {
+                    "username": "benchmark_signup",
+                    "email": "benchmark_signup@yamdb.fake",
+                },
+            ),
+            "auth_token": (
+                "/api/v1/auth/token/", "post", {}, "",
+                {
+                    "username": admin.username,
+                    "confirmation_code": default_token_generator.make_token(
+                        admin
+                    ),
+                },
+            ),
+        }
+
+    def get_uncovered(self, scenarios) -> list:
+        covered = {url_name for url_name, *_ in scenarios.values()}
+        return sorted({
+            url.name for url in router_v1.urls if url.name not in covered
+        })
+
+    def get_path(self, url_name, kwargs, query):
+        path = url_name if url_name.startswith("/") else reverse(
+            url_name, kwargs=kwargs
+        )
+        return f"{path}?{query}" if query else path
+
+    def run_scenario(self, client, method, path, data, options):
+        timings = []
+        db_timings = []
+        queries = []
+        statuses = Counter()
+        for iteration in range(options["warmup"] + options["repeat"]):
+            if not options["warm_cache"]:
+                invalidate_all()
+            # Каждый запрос выполняется в точке сохранения, которая
+            # откатывается, поэтому запросы на запись повторяемы.
+            counter = RequestQueryCounter()
+            with transaction.atomic():
+                with connection.execute_wrapper(counter):
+                    started = time.perf_counter()
+                    response = getattr(client, method)(
+                        path, data=data, format="json"
+                    )
+                    elapsed = time.perf_counter() - started
+                transaction.set_rollback(True)
+            if iteration < options["warmup"]:
+                continue
+            timings.append(elapsed * 1000)
+            db_timings.append(counter.duration * 1000)
+            queries.append(counter.count)
+            statuses[response.status_code] += 1
+        return {
+            "method": method.upper(),
+            "path": path,
+            "status": statuses.most_common(1)[0][0],
+            "requests": len(timings),
+            "p50_ms": round(statistics.median(timings), 3),
+            "p99_ms": round(percentile(timings, 99), 3),
+            "mean_ms": round(statistics.mean(timings), 3),
+            "db_p50_ms": round(statistics.median(db_timings), 3),
+            "queries": max(queries),
+        }
+
+    def get_meta(self, options):
+        return {
+            "created": timezone.now().isoformat(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "rows": {
+                model.__name__: model.objects.count()
+                for model in (User, Category, Genre, Title, Review, Comment)
+            },
+            "options": {
+                name: options[name]
+                for name in ("repeat", "warmup", "warm_cache", "bulk_size")
+            },
+        }
+
+    def run(self, options) -> dict:
+        meta = self.get_meta(options)
+        results = {}
+        with transaction.atomic():
+            objects = self.get_objects()
+            scenarios = self.get_scenarios(objects, options["bulk_size"])
+            unknown = set(options["only"] or ()) - set(scenarios)
+            if unknown:
+                raise CommandError(
+                    f"Неизвестные сценарии: {', '.join(sorted(unknown))}"
+                )
+            token = AccessToken.for_user(objects["admin"])
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+            for name, (url_name, method, kwargs, query, data) in (
+                scenarios.items()
+            ):
+                if options["only"] and name not in options["only"]:
+                    continue
+                path = self.get_path(url_name, kwargs, query)
+                results[name] = self.run_scenario(
+                    client, method, path, data, options
+                )
+                self.stdout.write(self.format_row(name, results[name]))
+            transaction.set_rollback(True)
+        return {
+            "meta": meta,
+            "uncovered": self.get_uncovered(scenarios),
+            "results": results,
+        }
+
+    def format_row(self, name, row):
+        return (
+            f"{name:<26}{row['status']:>7}{row['p50_ms']:>10.2f}"
+            f"{row['p99_ms']:>10.2f}{row['queries']:>9}"
+        )
+
+    def compare(self, results, path):
+        with open(path, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        self.stdout.write(
+            f"\n{'scenario':<26}{'p50, %':>10}{'p99, %':>10}{'queries':>9}"
+        )
+        for name, row in results.items():
+            if name not in baseline:
+                continue
+            before = baseline[name]
+            p50 = (row["p50_ms"] / before["p50_ms"] - 1) * 100
+            p99 = (row["p99_ms"] / before["p99_ms"] - 1) * 100
+            queries = row["queries"] - before["queries"]
+            self.stdout.write(
+                f"{name:<26}{p50:>+10.1f}{p99:>+10.1f}{queries:>+9}"
+            )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1")
+        self.stdout.write(
+            f"{'scenario':<26}{'status':>7}{'p50, ms':>10}{'p99, ms':>10}"
+            f"{'queries':>9}"
+        )
+        # Ограничение частоты запросов сделало бы повторные запросы к
+        # адресам аутентификации бессмысленными, а бюджет запросов не
+        # учитывает точки сохранения внешней транзакции замера.
+        rest_framework = {
+            **settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}
+        }
+        with override_settings(
+            REST_FRAMEWORK=rest_framework, QUERY_BUDGET_STRICT=False
+        ):
+            report = self.run(options)
+        if report["uncovered"]:
+            self.stderr.write(
+                "Адреса без сценария: " + ", ".join(report["uncovered"])
+            )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2, sort_keys=True)
+        if options["compare"]:
+            self.compare(report["results"], options["compare"])
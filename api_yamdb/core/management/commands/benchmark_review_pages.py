@@ -0,0 +1,182 @@
+import json
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.fields import creation_dates_kept
+from reviews.models import Comment, Review, Title
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Замер времени выборки страниц отзывов и комментариев без "
+        "составных индексов и с ними. Данные создаются во временной "
+        "транзакции и удаляются после замера"
+    )
+
+    INDEXED_MODELS = (Review, Comment)
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reviews", type=int, default=1_000_000)
+        parser.add_argument("--titles", type=int, default=100)
+        parser.add_argument("--comments", type=int, default=100_000)
+        parser.add_argument("--page-size", type=int, default=10)
+        parser.add_argument(
+            "--deep-page",
+            type=int,
+            default=500,
+            help="Page number used for the OFFSET measurement",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--chunk-size", type=int, default=10_000)
+        parser.add_argument(
+            "--output", help="Write the results to this JSON file"
+        )
+
+    def bulk_insert(self, model, objects, chunk_size):
+        chunk = []
+        for obj in objects:
+            chunk.append(obj)
+            if len(chunk) == chunk_size:
+                model.objects.bulk_create(chunk)
+                chunk = []
+        model.objects.bulk_create(chunk)
+
+    def generate(self, options):
+        rng = random.Random(options["seed"])
+        now = timezone.now()
+        per_title = options["reviews"] // options["titles"]
+        self.bulk_insert(User, (
+            User(
+                username=f"bench_user_{idx}",
+                username_lower=f"bench_user_{idx}",
+                email=f"bench_user_{idx}@yamdb.fake",
+            )
+            for idx in range(per_title)
+        ), options["chunk_size"])
+        self.bulk_insert(Title, (
+            Title(name=f"Benchmark title {idx}", year=2000)
+            for idx in range(options["titles"])
+        ), options["chunk_size"])
+        users = list(
+            User.objects.filter(username__startswith="bench_user_")
+            .values_list("pk", flat=True)
+        )
+        titles = list(
+            Title.objects.filter(name__startswith="Benchmark title ")
+            .values_list("pk", flat=True)
+        )
+
+        def random_date():
+            return now - timedelta(seconds=rng.randrange(2 * 365 * 86400))
+
+        with creation_dates_kept():
+            self.bulk_insert(Review, (
+                Review(
+                    title_id=title_id,
+                    author_id=author_id,
+                    text="Benchmark review",
+                    score=rng.randint(1, 10),
+                    pub_date=random_date(),
+                )
+                for title_id in titles for author_id in users
+            ), options["chunk_size"])
+            reviews = list(
+                Review.objects.filter(title_id=titles[0])
+                .values_list("pk", flat=True)[:100]
+            )
+            self.bulk_insert(Comment, (
+                Comment(
+                    review_id=reviews[idx % len(reviews)],
+                    author_id=rng.choice(users),
+                    text="Benchmark comment",
+                    pub_date=random_date(),
+                )
+                for idx in range(options["comments"])
+            ), options["chunk_size"])
+        return titles[0], users[0], reviews[0]
+
+    def get_queries(self, title_id, author_id, review_id, options):
+        page_size = options["page_size"]
+        offset = (options["deep_page"] - 1) * page_size
+        title_reviews = Review.objects.filter(title_id=title_id).order_by(
+            "-pub_date", "id"
+        )
+        pivot = title_reviews.values_list("pub_date", flat=True)[offset]
+        return {
+            "reviews_first_page": title_reviews[:page_size],
+            "reviews_deep_page_offset": title_reviews[
+                offset:offset + page_size
+            ],
+            "reviews_deep_page_keyset": title_reviews.filter(
+                pub_date__lt=pivot
+            )[:page_size],
+            "author_review_history": Review.objects.filter(
+                author_id=author_id
+            ).order_by("-pub_date")[:page_size],
+            "comments_first_page": Comment.objects.filter(
+                review_id=review_id
+            ).order_by("-pub_date", "id")[:page_size],
+        }
+
+    def measure(self, queries, repeat) -> dict:
+        results = {}
+        for name, queryset in queries.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = round(statistics.median(timings), 3)
+        return results
+
+    def set_indexes(self, enabled: bool):
+        schema_editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model in self.INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    if enabled:
+                        statement = index.create_sql(model, schema_editor)
+                    else:
+                        statement = index.remove_sql(model, schema_editor)
+                    cursor.execute(str(statement))
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started = time.perf_counter()
+            ids = self.generate(options)
+            self.stdout.write(
+                f"Generated {options['reviews']} reviews in "
+                f"{time.perf_counter() - started:.1f} s"
+            )
+            queries = self.get_queries(*ids, options)
+            self.set_indexes(False)
+            before = self.measure(queries, options["repeat"])
+            self.set_indexes(True)
+            after = self.measure(queries, options["repeat"])
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{'query':<28}{'before, ms':>12}{'after, ms':>12}"
+        )
+        for name in queries:
+            self.stdout.write(
+                f"{name:<28}{before[name]:>12.3f}{after[name]:>12.3f}"
+            )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(
+                    {"options": options, "before": before, "after": after},
+                    file,
+                    indent=2,
+                    default=str,
+                )
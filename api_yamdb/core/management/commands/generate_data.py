@@ -0,0 +1,308 @@
+import csv
+import os
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.fields import creation_dates_kept
+from .import_data import Command as ImportDataCommand
+
+HEADERS = {
+    "category.csv": ("id", "name", "slug"),
+    "genre.csv": ("id", "name", "slug"),
+    "users.csv": (
+        "id", "username", "email", "role", "bio", "first_name", "last_name"
+    ),
+    "titles.csv": ("id", "name", "year", "category", "description"),
+    "genre_title.csv": ("id", "title_id", "genre_id"),
+    "review.csv": ("id", "title_id", "text", "author", "score", "pub_date"),
+    "comments.csv": ("id", "review_id", "text", "author", "pub_date"),
+}
+CATEGORIES = (
+    ("Фильм", "movie"),
+    ("Книга", "book"),
+    ("Музыка", "music"),
+    ("Сериал", "series"),
+    ("Игра", "game"),
+)
+GENRES = (
+    ("Драма", "drama"),
+    ("Комедия", "comedy"),
+    ("Вестерн", "western"),
+    ("Фэнтези", "fantasy"),
+    ("Фантастика", "sci-fi"),
+    ("Детектив", "detective"),
+    ("Триллер", "thriller"),
+    ("Ужасы", "horror"),
+    ("Роман", "novel"),
+    ("Сказка", "tale"),
+    ("Рок", "rock"),
+    ("Классика", "classical"),
+)
+FIRST_NAMES = ("Анна", "Иван", "Мария", "Олег", "Елена", "Павел", "Ольга")
+LAST_NAMES = ("Иванов", "Смирнов", "Кузнецов", "Попов", "Соколов", "Козлов")
+ADJECTIVES = (
+    "Тихий", "Последний", "Северный", "Забытый", "Красный", "Долгий",
+    "Ночной", "Железный", "Белый", "Старый", "Чужой", "Вечный",
+)
+NOUNS = (
+    "берег", "город", "ветер", "остров", "дом", "путь", "сад", "мост",
+    "лес", "сон", "огонь", "порт",
+)
+SENTENCES = (
+    "Сюжет держит в напряжении до самого конца.",
+    "Персонажи получились живыми и запоминающимися.",
+    "Середина заметно провисает.",
+    "Финал оказался неожиданным.",
+    "Стоит потраченного времени.",
+    "Ожидал большего после всех отзывов.",
+    "Атмосфера передана очень точно.",
+    "Вернусь к этому еще не раз.",
+    "Много затянутых сцен и лишних диалогов.",
+    "Отличная работа авторов.",
+)
+# Чем больше показатель, тем сильнее комментарии сосредоточены на
+# небольшой части отзывов.
+COMMENT_SKEW = 3
+COMMENT_MAX_LENGTH = 155
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерация синтетического набора данных заданного размера. "
+        "Число отзывов на произведение распределено по закону Ципфа: "
+        "у немногих популярных произведений отзывов больше всего. Данные "
+        "записываются в csv файлы для import_data или сразу в базу данных"
+    )
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument(
+            "--output", help="Directory to write import_data CSV files to"
+        )
+        target.add_argument(
+            "--database",
+            action="store_true",
+            help="Replace the data in the database with the generated rows",
+        )
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--titles", type=int, default=1_000)
+        parser.add_argument("--reviews", type=int, default=100_000)
+        parser.add_argument("--comments", type=int, default=100_000)
+        parser.add_argument("--genres", type=int, default=len(GENRES))
+        parser.add_argument(
+            "--categories", type=int, default=len(CATEGORIES)
+        )
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.1,
+            help="Zipf exponent of the reviews per title distribution",
+        )
+        parser.add_argument("--years", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def get_random(self, file):
+        # У каждого файла свой генератор: содержимое файла зависит только
+        # от seed и параметров, но не от порядка генерации.
+        return random.Random(f"{self.options['seed']}:{file}")
+
+    def get_review_counts(self) -> list:
+        """Распределяет отзывы по произведениям по закону Ципфа.
+
+        Один пользователь оставляет не больше одного отзыва на
+        произведение, поэтому число отзывов ограничено числом
+        пользователей, а излишек достается следующим по популярности.
+        """
+        titles = self.options["titles"]
+        limit = self.options["users"]
+        total = min(self.options["reviews"], titles * limit)
+        weights = [
+            1 / rank ** self.options["skew"] for rank in range(1, titles + 1)
+        ]
+        weights_sum = sum(weights)
+        counts = [min(limit, int(total * w / weights_sum)) for w in weights]
+        remaining = total - sum(counts)
+        while remaining:
+            free = [idx for idx, count in enumerate(counts) if count < limit]
+            share = max(1, remaining // len(free))
+            for idx in free:
+                added = min(share, limit - counts[idx], remaining)
+                counts[idx] += added
+                remaining -= added
+                if not remaining:
+                    break
+        self.get_random("popularity").shuffle(counts)
+        return counts
+
+    def format_date(self, rng):
+        seconds = rng.randrange(self.options["years"] * 365 * 86400)
+        date = self.now - timedelta(seconds=seconds)
+        return date.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+    def make_text(self, rng, max_sentences):
+        return " ".join(
+            rng.choice(SENTENCES)
+            for _ in range(rng.randint(1, max_sentences))
+        )
+
+    def get_named_rows(self, items, count):
+        for idx in range(count):
+            name, slug = items[idx % len(items)]
+            if idx >= len(items):
+                name = f"{name} {idx // len(items) + 1}"
+                slug = f"{slug}-{idx // len(items) + 1}"
+            yield idx + 1, name, slug
+
+    def iter_users(self):
+        rng = self.get_random("users.csv")
+        for pk in range(1, self.options["users"] + 1):
+            if pk % 1000 == 0:
+                role = "admin"
+            elif pk % 100 == 0:
+                role = "moderator"
+            else:
+                role = "user"
+            yield (
+                pk,
+                f"user{pk}",
+                f"user{pk}@yamdb.fake",
+                role,
+                "",
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+            )
+
+    def iter_titles(self):
+        rng = self.get_random("titles.csv")
+        for pk in range(1, self.options["titles"] + 1):
+            yield (
+                pk,
+                f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}",
+                rng.randint(1900, self.now.year),
+                rng.randint(1, self.options["categories"]),
+                self.make_text(rng, 3),
+            )
+
+    def iter_title_genres(self):
+        rng = self.get_random("genre_title.csv")
+        genres = range(1, self.options["genres"] + 1)
+        pk = 0
+        for title_id in range(1, self.options["titles"] + 1):
+            count = min(len(genres), rng.randint(1, 3))
+            for genre_id in rng.sample(genres, count):
+                pk += 1
+                yield pk, title_id, genre_id
+
+    def iter_reviews(self):
+        rng = self.get_random("review.csv")
+        users = range(1, self.options["users"] + 1)
+        pk = 0
+        for title_id, count in enumerate(self.review_counts, 1):
+            quality = rng.uniform(3, 9)
+            for author_id in rng.sample(users, count):
+                pk += 1
+                score = min(10, max(1, round(rng.gauss(quality, 1.5))))
+                yield (
+                    pk,
+                    title_id,
+                    self.make_text(rng, 4),
+                    author_id,
+                    score,
+                    self.format_date(rng),
+                )
+
+    def iter_comments(self):
+        rng = self.get_random("comments.csv")
+        reviews = sum(self.review_counts)
+        if not reviews:
+            return
+        for pk in range(1, self.options["comments"] + 1):
+            yield (
+                pk,
+                1 + int(reviews * rng.random() ** COMMENT_SKEW),
+                self.make_text(rng, 2)[:COMMENT_MAX_LENGTH],
+                rng.randint(1, self.options["users"]),
+                self.format_date(rng),
+            )
+
+    def get_rows(self):
+        return {
+            "category.csv": self.get_named_rows(
+                CATEGORIES, self.options["categories"]
+            ),
+            "genre.csv": self.get_named_rows(GENRES, self.options["genres"]),
+            "users.csv": self.iter_users(),
+            "titles.csv": self.iter_titles(),
+            "genre_title.csv": self.iter_title_genres(),
+            "review.csv": self.iter_reviews(),
+            "comments.csv": self.iter_comments(),
+        }
+
+    def write_csv(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for file, rows in self.get_rows().items():
+            started = time.perf_counter()
+            count = 0
+            with open(
+                os.path.join(directory, file), "w",
+                encoding="utf-8", newline=""
+            ) as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(HEADERS[file])
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+            self.stdout.write(
+                f"{file}: {count} rows in "
+                f"{time.perf_counter() - started:.2f} s"
+            )
+
+    def write_database(self):
+        importer = ImportDataCommand(stdout=self.stdout)
+        importer.clear_tables()
+        started = time.perf_counter()
+        total = 0
+        rows = self.get_rows()
+        with creation_dates_kept():
+            for importer.file, model in importer.FILE_TABLE:
+                file_started = time.perf_counter()
+                header = list(HEADERS[importer.file])
+                fields = importer.get_model_fields(
+                    model, importer.rename_column(header)
+                )
+                count = importer.bulk_create_rows(
+                    model, fields, rows[importer.file],
+                    self.options["chunk_size"],
+                )
+                total += count
+                importer.report(
+                    importer.file, count, time.perf_counter() - file_started
+                )
+        importer.finish_bulk(total, started)
+
+    def handle(self, *args, **options):
+        for name in ("users", "titles", "genres", "categories"):
+            if options[name] < 1:
+                raise CommandError(f"--{name} must be at least 1")
+        self.options = options
+        # Даты отсчитываются от начала текущих суток, чтобы повторный
+        # запуск с тем же seed давал те же файлы.
+        self.now = timezone.now().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self.review_counts = self.get_review_counts()
+        if options["output"]:
+            self.write_csv(options["output"])
+        else:
+            self.write_database()
+        counts = sorted(self.review_counts)
+        self.stdout.write(
+            f"Reviews per title: max {counts[-1]}, "
+            f"median {counts[len(counts) // 2]}"
+        )
+        self.stdout.write(self.style.SUCCESS("Data generated successfully"))
@@ -1,18 +1,48 @@
 import os
 import csv
-from django.core.management.base import BaseCommand
-from django.db import utils
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction, utils
 from django.core import exceptions
 from django.contrib.auth import get_user_model
-from reviews.models import Title, Category, Genre, TitleGenre, Review, Comment
+from django.utils import timezone
+from reviews.models import (Title, Category, Genre, TitleGenre, Review,
+                            Comment, NormalizedSearchMixin)
+from reviews.ratings import rebuild_ratings, sync_genre_ratings
+from reviews.search import get_search_backend
+from reviews.signals import denormalization_disabled
+
+from core.cache import invalidate_all
+from core.csv_shards import parse_shard, read_header, split_into_shards
+from core.fields import creation_dates_kept
+
+try:
+    import resource
+except ImportError:
+    resource = None
 
 User = get_user_model()
 
 
+def get_peak_memory_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / 1024 / 1024
+    return peak / 1024
+
+
 class Command(BaseCommand):
     help = (
         "Импорт данных в базу данных из файла csv. "
-        "Все имеющиеся в базе данные будут удалены"
+        "Все имеющиеся в базе данные будут удалены, "
+        "если не указан параметр --incremental"
     )
 
     RELATED_MODELS = {
@@ -38,6 +68,45 @@ class Command(BaseCommand):
             type=str,
             help="The path to the dir with CSV files or to CSV file",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Stream CSV files in chunks and insert rows with bulk_create",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Number of rows inserted per transaction in bulk mode",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help=(
+                "Number of processes parsing CSV files in parallel, "
+                "values above 1 imply --bulk"
+            ),
+        )
+        parser.add_argument(
+            "--shard-size",
+            type=int,
+            default=16 * 1024 * 1024,
+            help="Size in bytes of the CSV parts parsed by one worker",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Insert new and update changed rows by primary key "
+                "instead of reloading the tables"
+            ),
+        )
+        parser.add_argument(
+            "--delete-missing",
+            action="store_true",
+            help="In incremental mode delete rows missing from CSV files",
+        )
 
     def rename_column(self, fieldnames: list) -> list:
         new_fieldnames = []
@@ -56,26 +125,328 @@ class Command(BaseCommand):
                     row[column] = foreign_key.objects.get(pk=value)
             model.objects.get_or_create(**row)
 
+    def get_model_fields(self, model, fieldnames: list) -> list:
+        return [model._meta.get_field(name) for name in fieldnames]
+
+    def make_instance(self, model, fields, row):
+        values = {}
+        for field, value in zip(fields, row):
+            if value == "" and field.null:
+                value = None
+            else:
+                value = field.to_python(value)
+            values[field.attname] = value
+        instance = model(**values)
+        if isinstance(instance, NormalizedSearchMixin):
+            instance.normalize_search_fields()
+        return instance
+
+    def iter_chunks(self, model, fields, rows, chunk_size):
+        rows = iter(rows)
+        while True:
+            chunk = [
+                self.make_instance(model, fields, row)
+                for row in islice(rows, chunk_size)
+            ]
+            if not chunk:
+                return
+            yield chunk
+
+    def bulk_create_rows(self, model, fields, rows, chunk_size) -> int:
+        total = 0
+        for chunk in self.iter_chunks(model, fields, rows, chunk_size):
+            with transaction.atomic():
+                model.objects.bulk_create(chunk, batch_size=chunk_size)
+            total += len(chunk)
+        return total
+
+    def get_compared_fields(self, fields) -> list:
+        return [
+            field for field in fields
+            if not field.primary_key
+            and not getattr(field, "auto_now", False)
+            and not getattr(field, "auto_now_add", False)
+        ]
+
+    def upsert_rows(self, model, fields, rows, chunk_size, seen_pks):
+        """Добавляет новые и обновляет измененные строки таблицы.
+
+        Из базы данных читаются только строки с первичными ключами из
+        текущей части файла.
+        """
+        compared = self.get_compared_fields(fields)
+        compared_names = [field.name for field in compared]
+        updated_names = compared_names + [
+            target
+            for source, target in getattr(
+                model, "normalized_fields", {}
+            ).items()
+            if source in compared_names
+        ]
+        auto_now_names = [
+            field.name for field in model._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+        ]
+        counts = Counter()
+        for chunk in self.iter_chunks(model, fields, rows, chunk_size):
+            now = timezone.now()
+            existing = model.objects.only(*compared_names).in_bulk(
+                [obj.pk for obj in chunk]
+            )
+            to_create = []
+            to_update = []
+            for obj in chunk:
+                if seen_pks is not None:
+                    seen_pks.add(obj.pk)
+                current = existing.get(obj.pk)
+                if current is None:
+                    to_create.append(obj)
+                elif any(
+                    getattr(current, field.attname)
+                    != getattr(obj, field.attname)
+                    for field in compared
+                ):
+                    for name in auto_now_names:
+                        setattr(obj, name, now)
+                    to_update.append(obj)
+            with transaction.atomic():
+                model.objects.bulk_create(to_create, batch_size=chunk_size)
+                if updated_names:
+                    model.objects.bulk_update(
+                        to_update,
+                        updated_names + auto_now_names,
+                        batch_size=chunk_size,
+                    )
+            if model is Title:
+                get_search_backend().index(Title.objects.filter(
+                    pk__in=[obj.pk for obj in to_create + to_update]
+                ))
+            if model is TitleGenre:
+                self.linked_titles.update(
+                    obj.title_id for obj in to_create + to_update
+                )
+            if model is Review:
+                self.changed_titles.update(
+                    obj.title_id for obj in to_create + to_update
+                )
+                self.changed_titles.update(
+                    existing[obj.pk].title_id for obj in to_update
+                )
+            counts["inserted"] += len(to_create)
+            counts["updated"] += len(to_update)
+        return counts
+
+    def delete_missing(self, model, seen_pks, chunk_size) -> int:
+        missing = [
+            pk for pk in model.objects.values_list("pk", flat=True).iterator(
+                chunk_size
+            )
+            if pk not in seen_pks
+        ]
+        for start in range(0, len(missing), chunk_size):
+            model.objects.filter(
+                pk__in=missing[start:start + chunk_size]
+            ).delete()
+        return len(missing)
+
+    def handle_incremental(self, csv_dir, chunk_size, delete_missing):
+        self.changed_titles = set()
+        self.linked_titles = set()
+        counts = {}
+        seen = {}
+        for self.file, model in self.FILE_TABLE:
+            seen[model] = set() if delete_missing else None
+            with open(
+                os.path.join(csv_dir, self.file), "r",
+                encoding="utf-8", errors="ignore", newline=""
+            ) as csv_file:
+                reader = csv.reader(csv_file)
+                fields = self.get_model_fields(
+                    model, self.rename_column(next(reader))
+                )
+                counts[self.file] = self.upsert_rows(
+                    model, fields, reader, chunk_size, seen[model]
+                )
+        if delete_missing:
+            for self.file, model in reversed(self.FILE_TABLE):
+                counts[self.file]["deleted"] = self.delete_missing(
+                    model, seen[model], chunk_size
+                )
+        changed_titles = list(self.changed_titles)
+        for start in range(0, len(changed_titles), chunk_size):
+            rebuild_ratings(changed_titles[start:start + chunk_size])
+        # Новые связи с жанрами могли появиться и у произведений без
+        # изменившихся отзывов. Для остальных произведений рейтинг в
+        # связи копирует rebuild_ratings.
+        linked_titles = list(self.linked_titles - self.changed_titles)
+        for start in range(0, len(linked_titles), chunk_size):
+            sync_genre_ratings(linked_titles[start:start + chunk_size])
+        invalidate_all()
+        for file, _ in self.FILE_TABLE:
+            self.stdout.write(
+                f"{file}: inserted {counts[file]['inserted']}, "
+                f"updated {counts[file]['updated']}, "
+                f"deleted {counts[file]['deleted']}"
+            )
+
+    def clear_tables(self):
+        with denormalization_disabled():
+            for _, model in reversed(self.FILE_TABLE):
+                model.objects.all().delete()
+
+    def report(self, file, rows, elapsed):
+        self.stdout.write(
+            f"{file}: {rows} rows in {elapsed:.2f} s "
+            f"({rows / max(elapsed, 1e-9):.0f} rows/s)"
+        )
+
+    def handle_bulk(self, csv_dir, chunk_size):
+        self.clear_tables()
+        started = time.perf_counter()
+        total_rows = 0
+        for self.file, model in self.FILE_TABLE:
+            file_started = time.perf_counter()
+            with open(
+                os.path.join(csv_dir, self.file), "r",
+                encoding="utf-8", errors="ignore", newline=""
+            ) as csv_file:
+                reader = csv.reader(csv_file)
+                fields = self.get_model_fields(
+                    model, self.rename_column(next(reader))
+                )
+                rows = self.bulk_create_rows(model, fields, reader, chunk_size)
+            total_rows += rows
+            self.report(self.file, rows, time.perf_counter() - file_started)
+        self.finish_bulk(total_rows, started)
+
+    def finish_bulk(self, total_rows, started):
+        rebuild_ratings()
+        get_search_backend().rebuild()
+        invalidate_all()
+        self.report("total", total_rows, time.perf_counter() - started)
+        peak_memory = get_peak_memory_mb()
+        if peak_memory is not None:
+            self.stdout.write(f"Peak memory: {peak_memory:.1f} MB")
+
+    def get_load_levels(self) -> list:
+        """Группирует файлы по уровням графа зависимостей моделей.
+
+        Файлы одного уровня не ссылаются друг на друга и могут загружаться
+        одновременно, каждый следующий уровень зависит только от предыдущих.
+        """
+        models = {model for _, model in self.FILE_TABLE}
+        dependencies = {
+            model: {
+                field.related_model
+                for field in model._meta.concrete_fields
+                if field.is_relation
+                and field.related_model in models
+                and field.related_model is not model
+            }
+            for _, model in self.FILE_TABLE
+        }
+        levels = []
+        loaded = set()
+        pending = list(self.FILE_TABLE)
+        while pending:
+            level = [
+                (file, model) for file, model in pending
+                if dependencies[model] <= loaded
+            ]
+            if not level:
+                raise CommandError("Циклическая зависимость между моделями")
+            levels.append(level)
+            loaded.update(model for _, model in level)
+            pending = [item for item in pending if item not in level]
+        return levels
+
+    def iter_parsed(self, executor, tasks, window):
+        tasks = iter(tasks)
+        pending = deque()
+        for task in islice(tasks, window):
+            pending.append((task, executor.submit(parse_shard, *task[-3:])))
+        while pending:
+            task, future = pending.popleft()
+            for next_task in islice(tasks, 1):
+                pending.append(
+                    (next_task, executor.submit(parse_shard, *next_task[-3:]))
+                )
+            yield task, future.result()
+
+    def handle_parallel(self, csv_dir, chunk_size, workers, shard_size):
+        self.clear_tables()
+        started = time.perf_counter()
+        rows_per_file = Counter()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for level in self.get_load_levels():
+                level_started = time.perf_counter()
+                tasks = []
+                for self.file, model in level:
+                    path = os.path.join(csv_dir, self.file)
+                    header, _ = read_header(path)
+                    fields = self.get_model_fields(
+                        model, self.rename_column(header)
+                    )
+                    tasks.extend(
+                        (self.file, model, fields, path, start, end)
+                        for start, end in split_into_shards(path, shard_size)
+                    )
+                for task, rows in self.iter_parsed(
+                    executor, tasks, workers * 2
+                ):
+                    self.file, model, fields = task[:3]
+                    rows_per_file[self.file] += self.bulk_create_rows(
+                        model, fields, rows, chunk_size
+                    )
+                elapsed = time.perf_counter() - level_started
+                for file, _ in level:
+                    self.report(file, rows_per_file[file], elapsed)
+        self.finish_bulk(sum(rows_per_file.values()), started)
+
+    def handle_sequential(self, csv_dir):
+        for self.file, model in self.FILE_TABLE:
+            with open(
+                os.path.join(csv_dir, self.file), "r",
+                encoding="utf-8", errors="ignore"
+            ) as csv_file:
+                reader = csv.DictReader(csv_file)
+                reader.fieldnames = self.rename_column(reader.fieldnames)
+                model.objects.all().delete()
+                self.create_data(reader, model)
+
+    def run_import(self, csv_dir, options):
+        if options["incremental"]:
+            self.handle_incremental(
+                csv_dir, options["chunk_size"], options["delete_missing"]
+            )
+        elif options["workers"] > 1:
+            self.handle_parallel(
+                csv_dir,
+                options["chunk_size"],
+                options["workers"],
+                options["shard_size"],
+            )
+        elif options["bulk"]:
+            self.handle_bulk(csv_dir, options["chunk_size"])
+        else:
+            self.handle_sequential(csv_dir)
+
     def handle(self, *args, **options):
+        self.file = None
         try:
             csv_dir = options["csv_path"]
-            for file, model in self.FILE_TABLE:
-                with open(
-                    os.path.join(csv_dir, file), "r",
-                    encoding="utf-8", errors="ignore"
-                ) as csv_file:
-                    reader = csv.DictReader(csv_file)
-                    reader.fieldnames = self.rename_column(reader.fieldnames)
-                    model.objects.all().delete()
-                    self.create_data(reader, model)
+            # Файлы содержат даты публикации, которые нужно сохранить, а не
+            # заменить временем импорта.
+            with creation_dates_kept():
+                self.run_import(csv_dir, options)
         except FileNotFoundError:
-            print(f"Ошибка! Указанная папка должна содержать файл {file}")
+            print(f"Ошибка! Указанная папка должна содержать файл {self.file}")
         except utils.IntegrityError as error:
-            print(f"Ошибка при импорте данных из файла {file}: {error}")
+            print(f"Ошибка при импорте данных из файла {self.file}: {error}")
         except exceptions.FieldError as error:
-            print(f"Ошибка при импорте данных из файла {file}: {error}")
+            print(f"Ошибка при импорте данных из файла {self.file}: {error}")
             print("Столбцы в файле должны быть названы как в модели")
         except Exception as error:
-            print(f"Ошибка при импорте данных из файла {file}: {error}")
+            print(f"Ошибка при импорте данных из файла {self.file}: {error}")
         else:
             self.stdout.write(self.style.SUCCESS("Data imported successfully"))
@@ -0,0 +1,230 @@
+import asyncio
+import http.client
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+
+DEFAULT_PATHS = (
+    "/api/v1/titles/",
+    "/api/v1/genres/",
+    "/api/v1/categories/",
+)
+HOST = "localhost"
+
+
+def wsgi_request(application, path):
+    url = urlsplit(path)
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": url.path,
+        "QUERY_STRING": url.query,
+        "SERVER_NAME": HOST,
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": HOST,
+        "REMOTE_ADDR": "127.0.0.1",
+        "wsgi.input": BytesIO(),
+        "wsgi.errors": BytesIO(),
+        "wsgi.url_scheme": "http",
+        "wsgi.version": (1, 0),
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    status = []
+    body = application(environ, lambda code, headers: status.append(code))
+    try:
+        b"".join(body)
+    finally:
+        if hasattr(body, "close"):
+            body.close()
+    return int(status[0].split()[0])
+
+
+async def asgi_request(application, path):
+    url = urlsplit(path)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "root_path": "",
+        "headers": [(b"host", HOST.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": (HOST, 80),
+    }
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await application(scope, receive, send)
+    return status[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочное сравнение пропускной способности WSGI и ASGI "
+        "при одновременных соединениях"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Path to request; may be repeated. Requests cycle over them",
+        )
+        parser.add_argument(
+            "--url",
+            action="append",
+            dest="urls",
+            metavar="NAME=BASE_URL",
+            help=(
+                "Load a running deployment over HTTP instead of calling the "
+                "WSGI and ASGI handlers in-process; may be repeated"
+            ),
+        )
+        parser.add_argument(
+            "--output", help="Write the results to this JSON file"
+        )
+
+    def run_threads(self, call, paths, total, concurrency):
+        def timed(idx):
+            started = time.perf_counter()
+            try:
+                code = call(paths[idx % len(paths)])
+            except Exception:
+                code = None
+            return time.perf_counter() - started, code
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(timed, range(total)))
+
+    def run_asgi(self, application, paths, total, concurrency):
+        async def run():
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def timed(idx):
+                async with semaphore:
+                    started = time.perf_counter()
+                    try:
+                        code = await asgi_request(
+                            application, paths[idx % len(paths)]
+                        )
+                    except Exception:
+                        code = None
+                    return time.perf_counter() - started, code
+
+            return await asyncio.gather(*(timed(idx) for idx in range(total)))
+
+        return asyncio.run(run())
+
+    def get_targets(self, options):
+        paths = options["paths"] or DEFAULT_PATHS
+        total = options["requests"]
+        concurrency = options["concurrency"]
+        if not options["urls"]:
+            wsgi = get_wsgi_application()
+            asgi = get_asgi_application()
+            return {
+                "wsgi": lambda: self.run_threads(
+                    lambda path: wsgi_request(wsgi, path),
+                    paths, total, concurrency,
+                ),
+                "asgi": lambda: self.run_asgi(
+                    asgi, paths, total, concurrency
+                ),
+            }
+        targets = {}
+        for value in options["urls"]:
+            name, separator, base_url = value.partition("=")
+            if not separator:
+                raise CommandError(f"Expected NAME=BASE_URL, got {value!r}")
+            targets[name] = self.make_http_target(
+                base_url.rstrip("/"), paths, total, concurrency
+            )
+        return targets
+
+    def make_http_target(self, base_url, paths, total, concurrency):
+        url = urlsplit(base_url)
+        connection_class = (
+            http.client.HTTPSConnection if url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        local = threading.local()
+
+        def get(path):
+            # Каждый поток держит одно keep-alive соединение.
+            if not hasattr(local, "connection"):
+                local.connection = connection_class(url.netloc, timeout=30)
+            try:
+                local.connection.request("GET", f"{url.path}{path}")
+                response = local.connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                local.connection.close()
+                del local.connection
+                raise
+            return response.status
+
+        return lambda: self.run_threads(get, paths, total, concurrency)
+
+    def summarize(self, results, elapsed) -> dict:
+        timings = sorted(duration * 1000 for duration, _ in results)
+        errors = sum(1 for _, code in results if code is None or code >= 500)
+        return {
+            "requests": len(results),
+            "errors": errors,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(len(results) / elapsed, 1),
+            "p50_ms": round(statistics.median(timings), 2),
+            "p99_ms": round(timings[int(len(timings) * 0.99) - 1], 2),
+        }
+
+    def handle(self, *args, **options):
+        summary = {}
+        for name, run in self.get_targets(options).items():
+            started = time.perf_counter()
+            results = run()
+            summary[name] = self.summarize(
+                results, time.perf_counter() - started
+            )
+
+        self.stdout.write(
+            f"{'target':<10}{'req/s':>10}{'p50, ms':>10}{'p99, ms':>10}"
+            f"{'errors':>8}"
+        )
+        for name, row in summary.items():
+            self.stdout.write(
+                f"{name:<10}{row['throughput_rps']:>10}{row['p50_ms']:>10}"
+                f"{row['p99_ms']:>10}{row['errors']:>8}"
+            )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "concurrency": options["concurrency"],
+                        "results": summary,
+                    },
+                    file,
+                    indent=2,
+                )
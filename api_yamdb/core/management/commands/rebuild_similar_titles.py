@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache import invalidate_namespaces
+from reviews.similarity import BLOCK_CELLS, rebuild_similar_titles
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчет похожих произведений по оценкам пользователей. "
+        "Требует numpy и scipy, запускается периодически как фоновая задача"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count",
+            type=int,
+            help="Number of similar titles stored per title",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100_000,
+            help="Number of reviews read from the database at once",
+        )
+        parser.add_argument(
+            "--block-cells",
+            type=int,
+            default=BLOCK_CELLS,
+            help="Maximum size of a dense block of the similarity matrix",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows inserted per query",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            import numpy  # noqa: F401
+            import scipy  # noqa: F401
+        except ImportError as exc:
+            raise CommandError(
+                "numpy and scipy are required to rebuild similar titles"
+            ) from exc
+        started = time.perf_counter()
+        created = rebuild_similar_titles(
+            options["count"],
+            chunk_size=options["chunk_size"],
+            block_cells=options["block_cells"],
+            batch_size=options["batch_size"],
+        )
+        invalidate_namespaces("titles")
+        self.stdout.write(self.style.SUCCESS(
+            f"Similar titles rebuilt: {created} links in "
+            f"{time.perf_counter() - started:.2f} s"
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from core.cache import invalidate_all
+from reviews.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчет рейтинга произведений по отзывам. "
+        "Исправляет расхождения сохраненных значений с таблицей отзывов"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of titles updated per query",
+        )
+
+    def handle(self, *args, **options):
+        changed = rebuild_ratings(batch_size=options["batch_size"])
+        # Пересчет сохраняет произведения без сигналов, поэтому кэш
+        # ответов сбрасывается целиком.
+        invalidate_all()
+        self.stdout.write(
+            self.style.SUCCESS(f"Ratings rebuilt, titles updated: {changed}")
+        )
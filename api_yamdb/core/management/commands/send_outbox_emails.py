@@ -0,0 +1,43 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from core.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Отправка писем из очереди исходящих писем"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            help="Defaults to the EMAIL_OUTBOX_MAX_ATTEMPTS setting",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting when it is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait between polls in --loop mode",
+        )
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        while True:
+            sent, failed = drain_outbox(
+                batch_size=options["batch_size"],
+                max_attempts=options["max_attempts"],
+                connection=connection,
+            )
+            if sent or failed:
+                self.stdout.write(f"Sent {sent} emails, {failed} failed")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,238 @@
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsRegistry:
+    """Реестр счетчиков и гистограмм в формате Prometheus.
+
+    Каждый поток пишет в собственный словарь, поэтому запись значения
+    не требует блокировки: блокировка берется только при появлении
+    нового потока и при сборе данных. При заданном каталоге `directory`
+    процесс периодически сохраняет свои значения в файл, а `collect`
+    суммирует файлы всех процессов.
+    """
+
+    def __init__(self, directory=None, flush_interval=1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.definitions = {}
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flushed = 0.0
+
+    def counter(self, name: str, documentation: str):
+        self.definitions[name] = ("counter", documentation, None)
+
+    def histogram(self, name: str, documentation: str,
+                  buckets=LATENCY_BUCKETS):
+        self.definitions[name] = ("histogram", documentation, buckets)
+
+    def _get_shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def inc(self, name: str, labels: tuple = (), value=1):
+        shard = self._get_shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + value
+
+    def observe(self, name: str, labels: tuple, value: float):
+        """Добавляет значение в гистограмму.
+
+        Состояние гистограммы хранится списком: число значений в каждом
+        интервале, включая `+Inf`, и их сумма последним элементом.
+        """
+        buckets = self.definitions[name][2]
+        shard = self._get_shard()
+        key = (name, labels)
+        state = shard.get(key)
+        if state is None:
+            state = shard[key] = [0] * (len(buckets) + 2)
+        state[bisect_left(buckets, value)] += 1
+        state[-1] += value
+
+    def reset(self):
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+    def collect_local(self) -> dict:
+        with self._lock:
+            shards = [dict(shard) for shard in self._shards]
+        samples = {}
+        for shard in shards:
+            merge_samples(samples, shard)
+        return samples
+
+    def get_path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"metrics-{pid}.json")
+
+    def flush(self, force=False):
+        """Сохраняет значения процесса в общий каталог.
+
+        Файл пишет только один поток: если другой поток уже сохраняет
+        значения, периодическое сохранение пропускается. Ошибка записи
+        не должна прерывать обработку запроса, поэтому она только
+        записывается в лог.
+        """
+        if not self.directory:
+            return
+        if not self._flush_lock.acquire(blocking=force):
+            return
+        try:
+            now = time.monotonic()
+            if not force and now - self._flushed < self.flush_interval:
+                return
+            self._flushed = now
+            path = self.get_path(os.getpid())
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump([
+                    [name, [list(label) for label in labels], value]
+                    for (name, labels), value in self.collect_local().items()
+                ], file)
+            os.replace(temp_path, path)
+        except Exception:
+            logger.exception(
+                "Не удалось сохранить метрики в %s", self.directory
+            )
+        finally:
+            self._flush_lock.release()
+
+    def collect(self) -> dict:
+        samples = self.collect_local()
+        if not self.directory or not os.path.isdir(self.directory):
+            return samples
+        own_path = self.get_path(os.getpid())
+        for filename in os.listdir(self.directory):
+            path = os.path.join(self.directory, filename)
+            if not filename.endswith(".json") or path == own_path:
+                continue
+            try:
+                with open(path, encoding="utf-8") as file:
+                    rows = json.load(file)
+            except (OSError, ValueError):
+                continue
+            merge_samples(samples, {
+                (name, tuple(tuple(label) for label in labels)): value
+                for name, labels, value in rows
+            })
+        return samples
+
+    def render(self) -> str:
+        samples = self.collect()
+        lines = []
+        for name, (kind, documentation, buckets) in sorted(
+            self.definitions.items()
+        ):
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            series = sorted(
+                (labels, value) for (sample_name, labels), value
+                in samples.items() if sample_name == name
+            )
+            for labels, value in series:
+                if kind == "counter":
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+                    continue
+                cumulative = 0
+                for bound, count in zip((*buckets, "+Inf"), value):
+                    cumulative += count
+                    bucket_labels = format_labels((*labels, ("le", bound)))
+                    lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{name}_sum{format_labels(labels)} {value[-1]}")
+                lines.append(
+                    f"{name}_count{format_labels(labels)} {cumulative}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def merge_samples(target: dict, source: dict):
+    for key, value in source.items():
+        current = target.get(key)
+        if current is None:
+            target[key] = list(value) if isinstance(value, list) else value
+        elif isinstance(value, list):
+            target[key] = [a + b for a, b in zip(current, value)]
+        else:
+            target[key] = current + value
+
+
+def format_labels(labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{escape_label(value)}"' for name, value in labels
+    )
+    return f"{{{pairs}}}"
+
+
+def escape_label(value) -> str:
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def create_registry() -> MetricsRegistry:
+    from django.conf import settings
+
+    registry = MetricsRegistry(
+        directory=getattr(settings, "METRICS_DIR", None),
+        flush_interval=getattr(settings, "METRICS_FLUSH_INTERVAL", 1.0),
+    )
+    registry.counter(
+        "yamdb_requests_total", "Число обработанных HTTP-запросов"
+    )
+    registry.histogram(
+        "yamdb_request_duration_seconds", "Время обработки запроса"
+    )
+    registry.counter(
+        "yamdb_db_queries_total", "Число SQL-запросов"
+    )
+    registry.histogram(
+        "yamdb_db_duration_seconds", "Время выполнения SQL-запросов за запрос"
+    )
+    registry.histogram(
+        "yamdb_serializer_duration_seconds", "Время сериализации ответа"
+    )
+    registry.histogram(
+        "yamdb_response_size_bytes", "Размер тела ответа", SIZE_BUCKETS
+    )
+    registry.counter(
+        "yamdb_cache_requests_total", "Обращения к кэшу ответов API"
+    )
+    return registry
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> MetricsRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = create_registry()
+    return _registry
@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+from django.conf import settings
+
+from .metrics import get_registry
+from .queries import QueryCounter, count_queries
+
+
+def get_view_labels(request) -> tuple:
+    """Возвращает метки представления и действия DRF для запроса."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return (("view", "unresolved"), ("action", ""))
+    view = getattr(match.func, "cls", None)
+    name = view.__name__ if view else match.func.__name__
+    actions = getattr(match.func, "actions", None) or {}
+    method = request.method.lower()
+    return (("view", name), ("action", actions.get(method, method)))
+
+
+class QueryCounterMiddleware:
+    """Основа middleware, которым нужно число SQL-запросов за запрос.
+
+    В синхронном режиме запросы считаются здесь же. В асинхронном режиме
+    представление выполняется в другом потоке со своим соединением, поэтому
+    используется счетчик, сохраненный в `request.query_counter` примесью
+    `QueryBudgetMixin`.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Так Django распознает экземпляр как асинхронный обработчик.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def is_enabled(self) -> bool:
+        return True
+
+    def __call__(self, request):
+        if not self.is_enabled():
+            return self.get_response(request)
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with count_queries() as counter:
+            response = self.get_response(request)
+        return self.process(
+            request, response, counter, time.perf_counter() - started
+        )
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        counter = getattr(request, "query_counter", None) or QueryCounter()
+        return self.process(
+            request, response, counter, time.perf_counter() - started
+        )
+
+    def process(self, request, response, counter, duration):
+        raise NotImplementedError
+
+
+class QueryCountMiddleware(QueryCounterMiddleware):
+    """Добавляет к ответу число SQL-запросов и время их выполнения.
+
+    Заголовки `X-DB-Queries` и `Server-Timing` выставляются только
+    в режиме отладки.
+    """
+
+    def is_enabled(self) -> bool:
+        return settings.DEBUG
+
+    def process(self, request, response, counter, duration):
+        total = duration * 1000
+        response["X-DB-Queries"] = str(counter.count)
+        response["Server-Timing"] = (
+            f'db;dur={counter.duration * 1000:.1f};'
+            f'desc="{counter.count} queries", total;dur={total:.1f}'
+        )
+        return response
+
+
+class MetricsMiddleware(QueryCounterMiddleware):
+    """Записывает в реестр метрик время, SQL-запросы и размер ответа."""
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.registry = get_registry()
+
+    def process(self, request, response, counter, duration):
+        labels = get_view_labels(request)
+        registry = self.registry
+        registry.inc(
+            "yamdb_requests_total",
+            (*labels, ("status", str(response.status_code))),
+        )
+        registry.observe("yamdb_request_duration_seconds", labels, duration)
+        registry.inc("yamdb_db_queries_total", labels, counter.count)
+        registry.observe(
+            "yamdb_db_duration_seconds", labels, counter.duration
+        )
+        if not response.streaming:
+            registry.observe(
+                "yamdb_response_size_bytes", labels, len(response.content)
+            )
+        registry.flush()
+        return response
@@ -0,0 +1,74 @@
+# Generated by Django 3.2 on 2026-10-18 17:34
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="OutgoingEmail",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=255, verbose_name="Тема")),
+                ("message", models.TextField(verbose_name="Текст")),
+                (
+                    "from_email",
+                    models.CharField(max_length=254, verbose_name="Отправитель"),
+                ),
+                ("recipient_list", models.JSONField(verbose_name="Получатели")),
+                (
+                    "created",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата создания"
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Число попыток отправки"
+                    ),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Время следующей попытки",
+                    ),
+                ),
+                (
+                    "sent_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Дата отправки"
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, verbose_name="Последняя ошибка"),
+                ),
+            ],
+            options={
+                "verbose_name": "Исходящее письмо",
+                "verbose_name_plural": "Исходящие письма",
+                "ordering": ("id",),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="outgoingemail",
+            index=models.Index(
+                fields=["sent_at", "next_attempt_at"], name="outbox_pending_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutgoingEmail(models.Model):
+    """Письмо, ожидающее отправки командой `send_outbox_emails`."""
+
+    subject = models.CharField(verbose_name="Тема", max_length=255)
+    message = models.TextField(verbose_name="Текст")
+    from_email = models.CharField(verbose_name="Отправитель", max_length=254)
+    recipient_list = models.JSONField(verbose_name="Получатели")
+    created = models.DateTimeField(
+        verbose_name="Дата создания", auto_now_add=True
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name="Число попыток отправки", default=0
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name="Время следующей попытки", default=timezone.now
+    )
+    sent_at = models.DateTimeField(
+        verbose_name="Дата отправки", null=True, blank=True
+    )
+    last_error = models.TextField(verbose_name="Последняя ошибка", blank=True)
+
+    class Meta:
+        ordering = ("id",)
+        verbose_name = "Исходящее письмо"
+        verbose_name_plural = "Исходящие письма"
+        indexes = [
+            models.Index(
+                fields=("sent_at", "next_attempt_at"),
+                name="outbox_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipient_list)}"
@@ -0,0 +1,123 @@
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+def enqueue_email(subject, message, from_email, recipient_list):
+    """Сохраняет письмо в очередь вместо отправки во время запроса."""
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email,
+        recipient_list=list(recipient_list),
+    )
+
+
+def get_backoff(attempts: int) -> timedelta:
+    """Экспоненциальная задержка перед повторной отправкой со случайной
+    добавкой, чтобы повторы после сбоя не приходили одновременно."""
+    base = settings.EMAIL_OUTBOX_BACKOFF
+    delay = min(base * 2 ** (attempts - 1), settings.EMAIL_OUTBOX_MAX_BACKOFF)
+    return timedelta(seconds=delay + random.uniform(0, base))
+
+
+def get_pending_emails(max_attempts: int):
+    return OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=max_attempts,
+        next_attempt_at__lte=timezone.now(),
+    )
+
+
+def claim_batch(batch_size: int, max_attempts: int) -> list:
+    """Выбирает пачку писем и откладывает их следующую попытку на время
+    аренды, чтобы параллельно запущенные обработчики их не взяли."""
+    with transaction.atomic():
+        emails = list(
+            get_pending_emails(max_attempts)
+            .select_for_update(skip_locked=True)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        OutgoingEmail.objects.filter(
+            pk__in=[email.pk for email in emails]
+        ).update(
+            next_attempt_at=timezone.now()
+            + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+        )
+    return emails
+
+
+def mark_failed(email, error):
+    email.attempts += 1
+    email.last_error = repr(error)
+    email.next_attempt_at = timezone.now() + get_backoff(email.attempts)
+
+
+def send_batch(emails, connection):
+    """Отправляет письма через одно соединение и сохраняет результат.
+
+    После ошибки соединение переоткрывается; если открыть его не
+    удалось, оставшиеся письма пачки откладываются без попытки отправки.
+    Возвращает число отправленных писем и признак недоступности сервера.
+    """
+    sent = 0
+    unavailable = None
+    for email in emails:
+        if unavailable is not None:
+            mark_failed(email, unavailable)
+            continue
+        try:
+            connection.open()
+        except Exception as error:
+            unavailable = error
+            mark_failed(email, error)
+            continue
+        try:
+            EmailMessage(
+                subject=email.subject,
+                body=email.message,
+                from_email=email.from_email,
+                to=email.recipient_list,
+                connection=connection,
+            ).send()
+        except Exception as error:
+            mark_failed(email, error)
+            connection.close()
+            continue
+        email.attempts += 1
+        email.sent_at = timezone.now()
+        email.last_error = ""
+        sent += 1
+    OutgoingEmail.objects.bulk_update(
+        emails, ("attempts", "sent_at", "last_error", "next_attempt_at")
+    )
+    return sent, unavailable is not None
+
+
+def drain_outbox(batch_size=100, max_attempts=None, connection=None):
+    """Отправляет все письма, срок отправки которых наступил.
+
+    Возвращает число отправленных и неотправленных писем.
+    """
+    max_attempts = max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    connection = connection or get_connection()
+    sent = failed = 0
+    try:
+        while True:
+            emails = claim_batch(batch_size, max_attempts)
+            if not emails:
+                break
+            batch_sent, unavailable = send_batch(emails, connection)
+            sent += batch_sent
+            failed += len(emails) - batch_sent
+            if unavailable:
+                break
+    finally:
+        connection.close()
+    return sent, failed
@@ -0,0 +1,34 @@
+import time
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class QueryBudgetExceeded(Exception):
+    """Представление выполнило больше SQL-запросов, чем разрешено."""
+
+
+class QueryCounter:
+    """Считает SQL-запросы и время их выполнения.
+
+    Экземпляр передается в `connection.execute_wrapper`.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+@contextmanager
+def count_queries(using=DEFAULT_DB_ALIAS):
+    counter = QueryCounter()
+    with connections[using].execute_wrapper(counter):
+        yield counter
@@ -0,0 +1,12 @@
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from .metrics import get_registry
+
+
+@require_GET
+def metrics(request):
+    return HttpResponse(
+        get_registry().render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
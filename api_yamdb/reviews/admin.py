@@ -15,7 +15,12 @@ class UserAdmin(admin.ModelAdmin):
 
 
 class TitleAdmin(admin.ModelAdmin):
-    list_display = ("pk", "name", "year", "description", "category")
+    list_display = (
+        "pk", "name", "year", "description", "category", "rating"
+    )
+    readonly_fields = (
+        "score_sum", "review_count", "score_histogram", "rating"
+    )
 
 
 admin.site.register(Title, TitleAdmin)
@@ -0,0 +1,49 @@
+import threading
+from contextlib import contextmanager
+
+_state = threading.local()
+
+
+def get_deleted_ids(kind: str) -> set:
+    deleted_ids = getattr(_state, kind, None)
+    if deleted_ids is None:
+        deleted_ids = set()
+        setattr(_state, kind, deleted_ids)
+    return deleted_ids
+
+
+@contextmanager
+def objects_deleted(kind: str, object_ids):
+    """Отмечает объекты, удаляемые в текущем потоке."""
+    object_ids = set(object_ids) - get_deleted_ids(kind)
+    get_deleted_ids(kind).update(object_ids)
+    try:
+        yield
+    finally:
+        get_deleted_ids(kind).difference_update(object_ids)
+
+
+def titles_deleted(title_ids):
+    """Отмечает произведения, удаляемые в текущем потоке.
+
+    Рейтинг и кэш ответов удаляемого произведения не нужно обновлять
+    при каскадном удалении каждого его отзыва.
+    """
+    return objects_deleted("title_ids", title_ids)
+
+
+def is_title_deleted(title_id) -> bool:
+    return title_id in get_deleted_ids("title_ids")
+
+
+def authors_deleted(author_ids):
+    """Отмечает пользователей, удаляемых в текущем потоке.
+
+    Рейтинг произведений с отзывами удаляемого пользователя
+    пересчитывается один раз после удаления, а не для каждого отзыва.
+    """
+    return objects_deleted("author_ids", author_ids)
+
+
+def is_author_deleted(author_id) -> bool:
+    return author_id in get_deleted_ids("author_ids")
@@ -0,0 +1,63 @@
+# Generated by Django 3.2 on 2026-10-18 18:31
+
+from django.db import migrations, models
+
+NORMALIZED_FIELDS = (
+    ("Category", "name", "name_lower"),
+    ("Genre", "name", "name_lower"),
+    ("User", "username", "username_lower"),
+)
+
+
+def fill_normalized_fields(apps, schema_editor):
+    for model_name, source, target in NORMALIZED_FIELDS:
+        model = apps.get_model("reviews", model_name)
+        objects = list(model.objects.only("pk", source))
+        for obj in objects:
+            setattr(obj, target, getattr(obj, source).casefold())
+        model.objects.bulk_update(objects, (target,), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0004_title_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="name_lower",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=256,
+                verbose_name="Название категории в нижнем регистре",
+            ),
+        ),
+        migrations.AddField(
+            model_name="genre",
+            name="name_lower",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=256,
+                verbose_name="Название жанра в нижнем регистре",
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="username_lower",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=150,
+                verbose_name="Имя пользователя в нижнем регистре",
+            ),
+        ),
+        migrations.RunPython(
+            fill_normalized_fields, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0005_search_normalized_fields"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="comment",
+            options={
+                "ordering": ["-pub_date", "id"],
+                "verbose_name": "Комментарий",
+                "verbose_name_plural": "Комментарии",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="review",
+            options={
+                "ordering": ["-pub_date", "id"],
+                "verbose_name": "Отзыв",
+                "verbose_name_plural": "Отзывы",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["review", "-pub_date", "id"],
+                name="comment_review_pub_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["author", "-pub_date"],
+                name="comment_author_pub_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["title", "-pub_date", "id"],
+                name="review_title_pub_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["author", "-pub_date"],
+                name="review_author_pub_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 3.2 on 2026-10-18 17:59
+
+import math
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import migrations, models
+
+TRENDING_EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def fill_leaderboards(apps, schema_editor):
+    Title = apps.get_model("reviews", "Title")
+    TitleGenre = apps.get_model("reviews", "TitleGenre")
+    Review = apps.get_model("reviews", "Review")
+    for rating in range(1, 11):
+        TitleGenre.objects.filter(title__rating=rating).update(rating=rating)
+
+    decay = math.log(2) / settings.TRENDING_HALF_LIFE
+    scores = {}
+    for title_id, pub_date in (
+        Review.objects.order_by().values_list("title_id", "pub_date")
+        .iterator()
+    ):
+        value = (pub_date - TRENDING_EPOCH).total_seconds() * decay
+        score = scores.get(title_id)
+        scores[title_id] = value if score is None else (
+            max(score, value) + math.log1p(math.exp(-abs(score - value)))
+        )
+    Title.objects.bulk_update(
+        [
+            Title(pk=title_id, trending_score=score)
+            for title_id, score in scores.items()
+        ],
+        ("trending_score",),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0006_review_comment_listing_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="title",
+            name="trending_score",
+            field=models.FloatField(
+                editable=False,
+                help_text=(
+                    "Логарифм суммы весов отзывов, вес убывает "
+                    "экспоненциально с возрастом отзыва"
+                ),
+                null=True,
+                verbose_name="Популярность за последнее время",
+            ),
+        ),
+        migrations.AddField(
+            model_name="titlegenre",
+            name="rating",
+            field=models.PositiveSmallIntegerField(
+                editable=False,
+                help_text="Копия рейтинга для лучших произведений жанра",
+                null=True,
+                verbose_name="Рейтинг произведения",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["-trending_score", "id"], name="title_trending_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="titlegenre",
+            index=models.Index(
+                fields=["genre", "rating", "title"],
+                name="titlegenre_rating_idx",
+            ),
+        ),
+        migrations.RunPython(fill_leaderboards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2 on 2026-10-18 18:04
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_rating_keys(apps, schema_editor):
+    Title = apps.get_model("reviews", "Title")
+    Title.objects.filter(rating__isnull=False).update(rating_key=F("rating"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0007_title_leaderboards"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="title",
+            name="rating_key",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                editable=False,
+                help_text="Рейтинг произведения или 0, если отзывов нет",
+                verbose_name="Ключ сортировки по рейтингу",
+            ),
+        ),
+        migrations.RunPython(fill_rating_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["rating_key", "id"], name="title_rating_key_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["category", "rating_key", "id"],
+                name="title_category_rating_key_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(fields=["year", "id"], name="title_year_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(fields=["name", "id"], name="title_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["review_count", "id"], name="title_review_count_idx"
+            ),
+        ),
+    ]
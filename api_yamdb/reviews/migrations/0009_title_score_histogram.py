@@ -0,0 +1,51 @@
+# Generated by Django 3.2 on 2026-10-18 18:09
+
+from django.db import migrations, models
+from django.db.models import Count
+
+import reviews.models
+
+
+def fill_score_histograms(apps, schema_editor):
+    Title = apps.get_model("reviews", "Title")
+    Review = apps.get_model("reviews", "Review")
+    histograms = {}
+    for title_id, score, count in (
+        Review.objects.order_by().values_list("title_id", "score")
+        .annotate(count=Count("pk"))
+        .iterator()
+    ):
+        histogram = histograms.setdefault(
+            title_id, reviews.models.empty_score_histogram()
+        )
+        histogram[score - 1] = count
+    Title.objects.bulk_update(
+        [
+            Title(pk=title_id, score_histogram=histogram)
+            for title_id, histogram in histograms.items()
+        ],
+        ("score_histogram",),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0008_title_sort_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="title",
+            name="score_histogram",
+            field=models.JSONField(
+                default=reviews.models.empty_score_histogram,
+                editable=False,
+                help_text="Число отзывов с оценками от 1 до 10",
+                verbose_name="Распределение оценок",
+            ),
+        ),
+        migrations.RunPython(
+            fill_score_histograms, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 3.2 on 2026-10-18 18:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reviews", "0009_title_score_histogram"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SimilarTitle",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "score",
+                    models.FloatField(
+                        help_text=(
+                            "Косинусное сходство оценок, поставленных "
+                            "произведениям"
+                        ),
+                        verbose_name="Сходство",
+                    ),
+                ),
+                (
+                    "rank",
+                    models.PositiveSmallIntegerField(
+                        verbose_name="Место в списке похожих произведений"
+                    ),
+                ),
+                (
+                    "similar",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_to",
+                        to="reviews.title",
+                        verbose_name="Похожее произведение",
+                    ),
+                ),
+                (
+                    "title",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_links",
+                        to="reviews.title",
+                        verbose_name="Произведение",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Похожее произведение",
+                "verbose_name_plural": "Похожие произведения",
+                "ordering": ["title", "rank"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="similartitle",
+            constraint=models.UniqueConstraint(
+                fields=("title", "rank"), name="unique_similar_title_rank"
+            ),
+        ),
+    ]
@@ -4,6 +4,46 @@ from django.db.models.constraints import UniqueConstraint
 from django.core.validators import (MinValueValidator, MaxValueValidator,
                                     RegexValidator)
 
+from core.fields import CreationDateTimeField
+from .deletion import authors_deleted, titles_deleted
+
+
+MAX_SCORE = 10
+
+
+def normalize_search_value(value: str) -> str:
+    return value.casefold()
+
+
+def empty_score_histogram() -> list:
+    return [0] * MAX_SCORE
+
+
+class NormalizedSearchMixin:
+    """Хранит нормализованные копии полей для индексируемого поиска.
+
+    `normalized_fields` сопоставляет исходное поле с полем, в котором
+    хранится его значение в нижнем регистре.
+    """
+
+    normalized_fields = {}
+
+    def normalize_search_fields(self):
+        for source, target in self.normalized_fields.items():
+            setattr(
+                self, target, normalize_search_value(getattr(self, source))
+            )
+
+    def save(self, *args, **kwargs):
+        self.normalize_search_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = set(update_fields) | {
+                target for source, target in self.normalized_fields.items()
+                if source in update_fields
+            }
+        super().save(*args, **kwargs)
+
 
 USER_ROLE = (
     ("user", "user"),
@@ -12,7 +52,16 @@ USER_ROLE = (
 )
 
 
-class User(AbstractUser):
+class User(NormalizedSearchMixin, AbstractUser):
+    normalized_fields = {"username": "username_lower"}
+
+    username_lower = models.CharField(
+        max_length=150,
+        db_index=True,
+        editable=False,
+        default="",
+        verbose_name="Имя пользователя в нижнем регистре",
+    )
     bio = models.TextField(
         verbose_name="Биография",
         blank=True,
@@ -37,13 +86,26 @@ class User(AbstractUser):
     def is_admin(self):
         return self.role == "admin" or self.is_superuser or self.is_staff
 
+    def delete(self, *args, **kwargs):
+        with authors_deleted([self.pk]):
+            return super().delete(*args, **kwargs)
+
+
+class Category(NormalizedSearchMixin, models.Model):
+    normalized_fields = {"name": "name_lower"}
 
-class Category(models.Model):
     name = models.CharField(
         max_length=256,
         verbose_name="Название категории",
         help_text="Укажите название категории (не более 256 символов)",
     )
+    name_lower = models.CharField(
+        max_length=256,
+        db_index=True,
+        editable=False,
+        default="",
+        verbose_name="Название категории в нижнем регистре",
+    )
     slug = models.SlugField(
         max_length=50,
         unique=True,
@@ -66,12 +128,21 @@ class Category(models.Model):
         return self.name[:30]
 
 
-class Genre(models.Model):
+class Genre(NormalizedSearchMixin, models.Model):
+    normalized_fields = {"name": "name_lower"}
+
     name = models.CharField(
         max_length=256,
         verbose_name="Название жанра",
         help_text="Укажите название жанра (не более 256 символов)",
     )
+    name_lower = models.CharField(
+        max_length=256,
+        db_index=True,
+        editable=False,
+        default="",
+        verbose_name="Название жанра в нижнем регистре",
+    )
     slug = models.SlugField(
         max_length=50,
         unique=True,
@@ -94,6 +165,12 @@ class Genre(models.Model):
         return self.name[:30]
 
 
+class TitleQuerySet(models.QuerySet):
+    def delete(self):
+        with titles_deleted(self.values_list("pk", flat=True)):
+            return super().delete()
+
+
 class Title(models.Model):
     name = models.CharField(
         max_length=256,
@@ -124,28 +201,135 @@ class Title(models.Model):
         verbose_name="Жанры произведения",
         help_text="Укажите, к какому жанру относится произведение",
     )
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Сумма оценок",
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Количество отзывов",
+    )
+    rating = models.PositiveSmallIntegerField(
+        null=True,
+        editable=False,
+        verbose_name="Рейтинг произведения",
+    )
+    score_histogram = models.JSONField(
+        default=empty_score_histogram,
+        editable=False,
+        verbose_name="Распределение оценок",
+        help_text="Число отзывов с оценками от 1 до 10",
+    )
+    rating_key = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Ключ сортировки по рейтингу",
+        help_text="Рейтинг произведения или 0, если отзывов нет",
+    )
+    trending_score = models.FloatField(
+        null=True,
+        editable=False,
+        verbose_name="Популярность за последнее время",
+        help_text=(
+            "Логарифм суммы весов отзывов, вес убывает экспоненциально "
+            "с возрастом отзыва"
+        ),
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Произведение"
         verbose_name_plural = "Произведения"
         ordering = ["pk"]
+        indexes = [
+            models.Index(
+                fields=["rating_key", "id"], name="title_rating_key_idx"
+            ),
+            models.Index(
+                fields=["category", "rating_key", "id"],
+                name="title_category_rating_key_idx",
+            ),
+            models.Index(fields=["year", "id"], name="title_year_idx"),
+            models.Index(fields=["name", "id"], name="title_name_idx"),
+            models.Index(
+                fields=["review_count", "id"], name="title_review_count_idx"
+            ),
+            models.Index(
+                fields=["-trending_score", "id"], name="title_trending_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name[:30]
 
+    def delete(self, *args, **kwargs):
+        with titles_deleted([self.pk]):
+            return super().delete(*args, **kwargs)
+
 
 class TitleGenre(models.Model):
     title = models.ForeignKey(Title, on_delete=models.CASCADE)
     genre = models.ForeignKey(Genre, on_delete=models.CASCADE, null=True)
+    rating = models.PositiveSmallIntegerField(
+        null=True,
+        editable=False,
+        verbose_name="Рейтинг произведения",
+        help_text="Копия рейтинга для лучших произведений жанра",
+    )
 
     class Meta:
         unique_together = ("title", "genre")
         ordering = ["pk"]
+        indexes = [
+            models.Index(
+                fields=["genre", "rating", "title"],
+                name="titlegenre_rating_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title}: {self.genre}"
 
 
+class SimilarTitle(models.Model):
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name="similar_links",
+        verbose_name="Произведение",
+    )
+    similar = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name="similar_to",
+        verbose_name="Похожее произведение",
+    )
+    score = models.FloatField(
+        verbose_name="Сходство",
+        help_text="Косинусное сходство оценок, поставленных произведениям",
+    )
+    rank = models.PositiveSmallIntegerField(
+        verbose_name="Место в списке похожих произведений",
+    )
+
+    class Meta:
+        verbose_name = "Похожее произведение"
+        verbose_name_plural = "Похожие произведения"
+        ordering = ["title", "rank"]
+        constraints = [
+            UniqueConstraint(
+                fields=["title", "rank"],
+                name="unique_similar_title_rank",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.title} -> {self.similar}"
+
+
 class Review(models.Model):
     title = models.ForeignKey(
         Title,
@@ -160,17 +344,26 @@ class Review(models.Model):
     )
     score = models.PositiveIntegerField(
         verbose_name="Рейтинг произведения",
-        validators=[MinValueValidator(1), MaxValueValidator(10)],
+        validators=[MinValueValidator(1), MaxValueValidator(MAX_SCORE)],
     )
-    pub_date = models.DateTimeField(
+    pub_date = CreationDateTimeField(
         verbose_name="Дата публикации отзыва",
-        auto_now_add=True,
     )
 
     class Meta:
         verbose_name = "Отзыв"
         verbose_name_plural = "Отзывы"
-        ordering = ["-pub_date"]
+        ordering = ["-pub_date", "id"]
+        indexes = [
+            models.Index(
+                fields=["title", "-pub_date", "id"],
+                name="review_title_pub_date_idx",
+            ),
+            models.Index(
+                fields=["author", "-pub_date"],
+                name="review_author_pub_date_idx",
+            ),
+        ]
         constraints = [
             UniqueConstraint(
                 fields=["title", "author"],
@@ -197,15 +390,24 @@ class Comment(models.Model):
         on_delete=models.CASCADE,
         related_name="comments",
     )
-    pub_date = models.DateTimeField(
+    pub_date = CreationDateTimeField(
         verbose_name="Дата публикации комментария",
-        auto_now_add=True,
     )
 
     class Meta:
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
-        ordering = ["-pub_date"]
+        ordering = ["-pub_date", "id"]
+        indexes = [
+            models.Index(
+                fields=["review", "-pub_date", "id"],
+                name="comment_review_pub_date_idx",
+            ),
+            models.Index(
+                fields=["author", "-pub_date"],
+                name="comment_author_pub_date_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.text[:30]
@@ -0,0 +1,238 @@
+import math
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Review, Title, TitleGenre, empty_score_histogram
+
+RATING_FIELDS = (
+    "score_sum", "review_count", "score_histogram", "rating", "rating_key"
+)
+MAX_RATING = 10
+TRENDING_EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def calculate_rating(score_sum: int, review_count: int):
+    if not review_count:
+        return None
+    return round(score_sum / review_count)
+
+
+def get_score_at(histogram, position: int) -> int:
+    """Оценка, стоящая на месте `position` в упорядоченном списке оценок."""
+    for score, count in enumerate(histogram, 1):
+        if position < count:
+            return score
+        position -= count
+    raise IndexError(position)
+
+
+def get_score_distribution(histogram) -> dict:
+    """Среднее, медиана и байесовская оценка по распределению оценок.
+
+    Байесовская оценка смещает среднее к RATING_PRIOR_MEAN так, будто у
+    произведения есть еще RATING_PRIOR_WEIGHT отзывов с этой оценкой:
+    чем меньше отзывов, тем ближе оценка к априорной.
+    """
+    review_count = sum(histogram)
+    score_sum = sum(
+        score * count for score, count in enumerate(histogram, 1)
+    )
+    prior_weight = settings.RATING_PRIOR_WEIGHT
+    bayesian = (settings.RATING_PRIOR_MEAN * prior_weight + score_sum) / (
+        prior_weight + review_count
+    )
+    mean = median = None
+    if review_count:
+        mean = round(score_sum / review_count, 2)
+        median = (
+            get_score_at(histogram, (review_count - 1) // 2)
+            + get_score_at(histogram, review_count // 2)
+        ) / 2
+    return {
+        "count": review_count,
+        "mean": mean,
+        "median": median,
+        "bayesian": round(bayesian, 2),
+        "histogram": {
+            str(score): count for score, count in enumerate(histogram, 1)
+        },
+    }
+
+
+def get_trending_value(moment) -> float:
+    """Логарифм веса отзыва, опубликованного в момент `moment`.
+
+    Веса отсчитываются от общей точки, поэтому отношение весов двух
+    отзывов зависит только от разницы их возраста: вес уменьшается вдвое
+    за TRENDING_HALF_LIFE секунд.
+    """
+    seconds = (moment - TRENDING_EPOCH).total_seconds()
+    return seconds * math.log(2) / settings.TRENDING_HALF_LIFE
+
+
+def get_trending_threshold(now=None) -> float:
+    """Наименьшая популярность произведения в списке набирающих
+    популярность: вес одного отзыва, опубликованного TRENDING_WINDOW
+    секунд назад."""
+    now = now or timezone.now()
+    return get_trending_value(
+        now - timedelta(seconds=settings.TRENDING_WINDOW)
+    )
+
+
+def add_trending_activity(score, value: float) -> float:
+    """Добавляет вес отзыва к популярности, хранящейся в виде логарифма."""
+    if score is None:
+        return value
+    return max(score, value) + math.log1p(math.exp(-abs(score - value)))
+
+
+def remove_trending_activity(score, value: float):
+    if score is None or value >= score:
+        return None
+    return score + math.log1p(-math.exp(value - score))
+
+
+def apply_review_score(title_id: int, added_score=None, removed_score=None,
+                       pub_date=None):
+    """Атомарно учитывает добавленную и удаленную оценку в сумме оценок,
+    числе отзывов и распределении оценок произведения.
+
+    Изменение оценки отзыва передается как удаление старой и добавление
+    новой. Если передана дата публикации добавленного или удаленного
+    отзыва, вместе с рейтингом обновляется популярность произведения.
+    Копии рейтинга в таблице жанров произведения обновляются, только если
+    рейтинг изменился.
+    """
+    with transaction.atomic():
+        title = (
+            Title.objects.select_for_update()
+            .only("pk", *RATING_FIELDS, "trending_score")
+            .filter(pk=title_id)
+            .first()
+        )
+        if title is None:
+            return
+        histogram = list(title.score_histogram)
+        score_delta = count_delta = 0
+        if added_score is not None:
+            histogram[added_score - 1] += 1
+            score_delta += added_score
+            count_delta += 1
+        if removed_score is not None:
+            histogram[removed_score - 1] -= 1
+            score_delta -= removed_score
+            count_delta -= 1
+        previous_rating = title.rating
+        title.score_sum += score_delta
+        title.review_count += count_delta
+        title.score_histogram = histogram
+        title.rating = calculate_rating(title.score_sum, title.review_count)
+        title.rating_key = title.rating or 0
+        # Сохраняются только изменившиеся поля: по ним обработчики
+        # сигналов решают, какие ответы из кэша устарели.
+        update_fields = ["score_sum", "score_histogram"]
+        if count_delta:
+            update_fields.append("review_count")
+        if title.rating != previous_rating:
+            update_fields.extend(("rating", "rating_key"))
+        if pub_date is not None and count_delta:
+            change_activity = (
+                add_trending_activity if count_delta > 0
+                else remove_trending_activity
+            )
+            title.trending_score = change_activity(
+                title.trending_score, get_trending_value(pub_date)
+            )
+            update_fields.append("trending_score")
+        title.save(update_fields=update_fields)
+        if title.rating != previous_rating:
+            TitleGenre.objects.filter(title_id=title_id).update(
+                rating=title.rating
+            )
+
+
+def sync_genre_ratings(title_ids=None) -> int:
+    """Копирует рейтинг произведений в таблицу жанров произведений."""
+    links = TitleGenre.objects.all()
+    if title_ids is not None:
+        links = links.filter(title_id__in=title_ids)
+    changed = links.filter(title__rating__isnull=True).exclude(
+        rating__isnull=True
+    ).update(rating=None)
+    for rating in range(1, MAX_RATING + 1):
+        changed += links.filter(title__rating=rating).exclude(
+            rating=rating
+        ).update(rating=rating)
+    return changed
+
+
+def get_trending_scores(reviews) -> dict:
+    scores = {}
+    for title_id, pub_date in (
+        reviews.order_by().values_list("title_id", "pub_date").iterator()
+    ):
+        scores[title_id] = add_trending_activity(
+            scores.get(title_id), get_trending_value(pub_date)
+        )
+    return scores
+
+
+def is_same_score(first, second) -> bool:
+    if first is None or second is None:
+        return first is second
+    return math.isclose(first, second, rel_tol=1e-9)
+
+
+def rebuild_ratings(title_ids=None, batch_size=1000) -> int:
+    """Пересчитывает рейтинг и популярность произведений по таблице
+    отзывов и копии рейтинга в таблице жанров произведений."""
+    titles = Title.objects.only("pk", *RATING_FIELDS, "trending_score")
+    reviews = Review.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+        reviews = reviews.filter(title_id__in=title_ids)
+    histograms = {}
+    for title_id, score, count in (
+        reviews.order_by().values_list("title_id", "score")
+        .annotate(count=Count("pk"))
+    ):
+        histograms.setdefault(title_id, empty_score_histogram())[
+            score - 1
+        ] = count
+    trending_scores = get_trending_scores(reviews)
+    changed = []
+    trending_changed = []
+    for title in titles.iterator(chunk_size=batch_size):
+        trending_score = trending_scores.get(title.pk)
+        if not is_same_score(title.trending_score, trending_score):
+            title.trending_score = trending_score
+            trending_changed.append(title)
+        histogram = histograms.get(title.pk, empty_score_histogram())
+        score_sum = sum(
+            score * count for score, count in enumerate(histogram, 1)
+        )
+        review_count = sum(histogram)
+        rating = calculate_rating(score_sum, review_count)
+        if (
+            title.score_sum, title.review_count, title.score_histogram,
+            title.rating, title.rating_key,
+        ) == (score_sum, review_count, histogram, rating, rating or 0):
+            continue
+        title.score_sum = score_sum
+        title.review_count = review_count
+        title.score_histogram = histogram
+        title.rating = rating
+        title.rating_key = rating or 0
+        changed.append(title)
+    with transaction.atomic():
+        Title.objects.bulk_update(changed, RATING_FIELDS, batch_size)
+        Title.objects.bulk_update(
+            trending_changed, ("trending_score",), batch_size
+        )
+        sync_genre_ratings(title_ids)
+    return len(changed)
@@ -0,0 +1,153 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .models import Title
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def get_search_tokens(query: str) -> list:
+    return TOKEN_RE.findall(query.lower())
+
+
+class BaseTitleSearchBackend:
+    """Интерфейс полнотекстового поиска по названию и описанию."""
+
+    def search(self, queryset, query: str):
+        """Возвращает queryset найденных произведений по релевантности."""
+        raise NotImplementedError
+
+    def index(self, titles):
+        pass
+
+    def remove(self, title_ids):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+class SimpleSearchBackend(BaseTitleSearchBackend):
+    """Поиск без индекса для баз данных без поддержки полнотекстового."""
+
+    def search(self, queryset, query):
+        tokens = get_search_tokens(query)
+        if not tokens:
+            return queryset.none()
+        for token in tokens:
+            queryset = queryset.filter(
+                Q(name__icontains=token) | Q(description__icontains=token)
+            )
+        return queryset
+
+
+class PostgresSearchBackend(BaseTitleSearchBackend):
+    config = "russian"
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                    SearchVector)
+
+        tokens = get_search_tokens(query)
+        if not tokens:
+            return queryset.none()
+        vector = SearchVector("name", weight="A", config=self.config)
+        vector += SearchVector("description", weight="B", config=self.config)
+        search_query = SearchQuery(
+            " & ".join(f"{token}:*" for token in tokens),
+            search_type="raw",
+            config=self.config,
+        )
+        return (
+            queryset.annotate(search_rank=SearchRank(vector, search_query))
+            .filter(search_rank__gt=0)
+            .order_by("-search_rank", "pk")
+        )
+
+
+class SQLiteFTSBackend(BaseTitleSearchBackend):
+    """Поиск по виртуальной таблице SQLite FTS5.
+
+    Идентификатор строки индекса совпадает с первичным ключом произведения,
+    при ранжировании совпадение в названии весит больше, чем в описании.
+    """
+
+    table = "reviews_title_fts"
+    name_weight = 10.0
+    description_weight = 1.0
+
+    def get_match_expression(self, query: str) -> str:
+        return " ".join(f'"{token}"*' for token in get_search_tokens(query))
+
+    def search(self, queryset, query):
+        match = self.get_match_expression(query)
+        if not match:
+            return queryset.none()
+        title_table = Title._meta.db_table
+        return queryset.extra(
+            select={
+                "search_rank": (
+                    f"bm25({self.table}, {self.name_weight}, "
+                    f"{self.description_weight})"
+                )
+            },
+            tables=[self.table],
+            where=[
+                f"{self.table}.rowid = {title_table}.id",
+                f"{self.table} MATCH %s",
+            ],
+            params=[match],
+            order_by=["search_rank", "pk"],
+        )
+
+    def index(self, titles):
+        titles = list(titles)
+        if not titles:
+            return
+        # FTS5 заменяет строку индекса с тем же rowid, поэтому старые записи
+        # не нужно удалять отдельным запросом.
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(rowid, name, description) "
+                "VALUES (%s, %s, %s)",
+                [
+                    (title.pk, title.name, title.description)
+                    for title in titles
+                ],
+            )
+
+    def remove(self, title_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s",
+                [(title_id,) for title_id in title_ids],
+            )
+
+    def rebuild(self):
+        title_table = Title._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, name, description) "
+                f"SELECT id, name, description FROM {title_table}"
+            )
+
+
+VENDOR_BACKENDS = {
+    "sqlite": SQLiteFTSBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def get_search_backend() -> BaseTitleSearchBackend:
+    backend_path = getattr(settings, "TITLE_SEARCH_BACKEND", None)
+    if backend_path:
+        return import_string(backend_path)()
+    return VENDOR_BACKENDS.get(connection.vendor, SimpleSearchBackend)()
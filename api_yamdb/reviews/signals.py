@@ -0,0 +1,125 @@
+from contextlib import contextmanager
+
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .deletion import is_author_deleted, is_title_deleted
+from .models import Review, Title, User
+from .ratings import apply_review_score, rebuild_ratings
+from .search import get_search_backend
+
+SEARCH_FIELDS = {"name", "description"}
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_score(sender, instance, **kwargs):
+    instance._previous_score = None
+    if instance.pk is not None:
+        instance._previous_score = (
+            Review.objects.filter(pk=instance.pk)
+            .values_list("title_id", "score")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    score = int(instance.score)
+    pub_date = instance.pub_date
+    previous = getattr(instance, "_previous_score", None)
+    if previous is None:
+        apply_review_score(instance.title_id, score, pub_date=pub_date)
+        return
+    previous_title_id, previous_score = previous
+    if previous_title_id != instance.title_id:
+        apply_review_score(
+            previous_title_id, removed_score=previous_score,
+            pub_date=pub_date,
+        )
+        apply_review_score(instance.title_id, score, pub_date=pub_date)
+    elif previous_score != score:
+        apply_review_score(instance.title_id, score, previous_score)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    if is_title_deleted(instance.title_id) or is_author_deleted(
+        instance.author_id
+    ):
+        return
+    apply_review_score(
+        instance.title_id, removed_score=int(instance.score),
+        pub_date=instance.pub_date,
+    )
+
+
+@receiver(pre_delete, sender=User)
+def remember_reviewed_titles(sender, instance, **kwargs):
+    instance._reviewed_title_ids = []
+    if is_author_deleted(instance.pk):
+        instance._reviewed_title_ids = list(
+            Review.objects.filter(author=instance)
+            .order_by().values_list("title_id", flat=True).distinct()
+        )
+
+
+@receiver(post_delete, sender=User)
+def update_ratings_on_author_delete(sender, instance, **kwargs):
+    # Отзывы удаленного пользователя уже удалены каскадно без обновления
+    # рейтинга, поэтому рейтинг его произведений пересчитывается сразу
+    # для всех отзывов.
+    title_ids = getattr(instance, "_reviewed_title_ids", None)
+    if title_ids:
+        rebuild_ratings(title_ids)
+
+
+@receiver(post_save, sender=Title)
+def update_search_index_on_save(sender, instance, update_fields, **kwargs):
+    if update_fields is not None and not SEARCH_FIELDS & set(update_fields):
+        return
+    get_search_backend().index([instance])
+
+
+@receiver(post_delete, sender=Title)
+def update_search_index_on_delete(sender, instance, **kwargs):
+    get_search_backend().remove([instance.pk])
+
+
+DENORMALIZATION_RECEIVERS = [
+    (pre_save, remember_previous_score, Review),
+    (post_save, update_rating_on_save, Review),
+    (post_delete, update_rating_on_delete, Review),
+    (pre_delete, remember_reviewed_titles, User),
+    (post_delete, update_ratings_on_author_delete, User),
+    (post_save, update_search_index_on_save, Title),
+    (post_delete, update_search_index_on_delete, Title),
+]
+
+
+def connect_denormalization_receiver(signal, receiver_func, sender):
+    """Подключает обработчик, отключаемый в `denormalization_disabled`."""
+    signal.connect(receiver_func, sender=sender)
+    DENORMALIZATION_RECEIVERS.append((signal, receiver_func, sender))
+
+
+@contextmanager
+def denormalization_disabled():
+    """Отключает обновление рейтинга, поискового индекса и кэша.
+
+    Используется при массовых операциях, после выхода из контекста
+    рейтинг и индекс нужно перестроить через
+    `reviews.ratings.rebuild_ratings` и `get_search_backend().rebuild()`,
+    а кэш ответов сбросить через `core.cache.invalidate_all`.
+    """
+    for signal, receiver_func, sender in DENORMALIZATION_RECEIVERS:
+        signal.disconnect(receiver_func, sender=sender)
+    try:
+        yield
+    finally:
+        for signal, receiver_func, sender in DENORMALIZATION_RECEIVERS:
+            signal.connect(receiver_func, sender=sender)
@@ -0,0 +1,128 @@
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Review, SimilarTitle
+
+# Наибольшее число ячеек плотного блока матрицы сходства: 4 млн float32
+# занимают 16 МБ независимо от числа произведений.
+BLOCK_CELLS = 4_000_000
+
+
+def load_review_matrix(reviews, chunk_size: int):
+    """Загружает оценки в разреженную матрицу «произведение × автор».
+
+    Отзывы читаются из базы порциями по `chunk_size` строк прямо в
+    заранее выделенные numpy-массивы, поэтому кортежи Python в памяти
+    есть только для одной порции. Возвращает матрицу и массив
+    идентификаторов произведений, соответствующих ее строкам.
+    """
+    import numpy as np
+    from scipy import sparse
+
+    total = reviews.count()
+    title_ids = np.empty(total, dtype=np.int32)
+    author_ids = np.empty(total, dtype=np.int32)
+    scores = np.empty(total, dtype=np.float32)
+    rows = (
+        reviews.order_by()
+        .values_list("title_id", "author_id", "score")
+        .iterator(chunk_size=chunk_size)
+    )
+    position = 0
+    while position < total:
+        chunk = list(islice(rows, min(chunk_size, total - position)))
+        if not chunk:
+            break
+        end = position + len(chunk)
+        (
+            title_ids[position:end],
+            author_ids[position:end],
+            scores[position:end],
+        ) = np.array(chunk, dtype=np.int64).T
+        position = end
+    titles, title_index = np.unique(
+        title_ids[:position], return_inverse=True
+    )
+    authors, author_index = np.unique(
+        author_ids[:position], return_inverse=True
+    )
+    del title_ids, author_ids
+    matrix = sparse.csr_matrix(
+        (scores[:position], (title_index, author_index)),
+        shape=(len(titles), len(authors)),
+    )
+    return matrix, titles
+
+
+def iter_nearest_titles(matrix, count: int, block_cells: int = BLOCK_CELLS):
+    """Находит для каждой строки матрицы `count` ближайших по косинусному
+    сходству строк.
+
+    Сходство считается умножением нормированной матрицы на
+    транспонированную блоками строк, размер плотного блока ограничен
+    `block_cells`. Для каждого блока возвращает номер первой строки,
+    номера соседей и сходство, упорядоченные по убыванию сходства.
+    """
+    import numpy as np
+    from scipy import sparse
+
+    size = matrix.shape[0]
+    count = min(count, size - 1)
+    if count < 1:
+        return
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1))).ravel()
+    norms[norms == 0] = 1
+    matrix = sparse.diags(1 / norms) @ matrix
+    transposed = matrix.T.tocsc()
+    block_rows = max(1, block_cells // size)
+    for start in range(0, size, block_rows):
+        stop = min(start + block_rows, size)
+        similarity = (matrix[start:stop] @ transposed).toarray()
+        rows = np.arange(stop - start)
+        similarity[rows, rows + start] = -1
+        neighbours = np.argpartition(-similarity, count - 1, axis=1)[
+            :, :count
+        ]
+        scores = np.take_along_axis(similarity, neighbours, axis=1)
+        order = np.lexsort((neighbours, -scores), axis=1)
+        yield (
+            start,
+            np.take_along_axis(neighbours, order, axis=1),
+            np.take_along_axis(scores, order, axis=1),
+        )
+
+
+def rebuild_similar_titles(count=None, chunk_size=100_000,
+                           block_cells=BLOCK_CELLS, batch_size=1000) -> int:
+    """Пересчитывает таблицу похожих произведений по таблице отзывов.
+
+    Похожими считаются произведения, которые оценили одни и те же
+    пользователи: сходство равно косинусу между векторами оценок двух
+    произведений. Произведения без общих авторов отзывов не связываются.
+    """
+    count = count or settings.SIMILAR_TITLES_COUNT
+    matrix, title_ids = load_review_matrix(Review.objects.all(), chunk_size)
+    created = 0
+    with transaction.atomic():
+        SimilarTitle.objects.all().delete()
+        for start, neighbours, scores in iter_nearest_titles(
+            matrix, count, block_cells
+        ):
+            links = [
+                SimilarTitle(
+                    title_id=int(title_ids[start + row]),
+                    similar_id=int(title_ids[neighbour]),
+                    score=float(score),
+                    rank=rank,
+                )
+                for row in range(len(neighbours))
+                for rank, (neighbour, score) in enumerate(
+                    zip(neighbours[row], scores[row]), 1
+                )
+                if score > 0
+            ]
+            SimilarTitle.objects.bulk_create(links, batch_size)
+            created += len(links)
+    return created
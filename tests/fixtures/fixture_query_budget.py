@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budget(settings):
+    settings.QUERY_BUDGET_STRICT = True
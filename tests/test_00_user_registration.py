@@ -2,6 +2,7 @@ from http import HTTPStatus
 
 import pytest
 from django.core import mail
+from django.core.management import call_command
 from django.db.utils import IntegrityError
 
 from tests.utils import (invalid_data_for_user_patch_and_creation,
@@ -110,6 +111,7 @@ class Test00UserRegistration:
         }
 
         response = client.post(self.url_signup, data=valid_data)
+        call_command('send_outbox_emails')
         outbox_after = mail.outbox  # email outbox after user create
 
         assert response.status_code != HTTPStatus.NOT_FOUND, (
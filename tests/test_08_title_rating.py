@@ -0,0 +1,170 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Review, Title, User
+from tests.utils import create_reviews, create_titles
+
+
+def delete_title_queries(admin_client, review_count):
+    title = Title.objects.create(
+        name='Произведение', year=2000,
+        category=Category.objects.get_or_create(name='Фильм', slug='movie')[0],
+    )
+    for idx in range(review_count):
+        author, _ = User.objects.get_or_create(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+        )
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5
+        )
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.delete(f'/api/v1/titles/{title.pk}/')
+    assert response.status_code == HTTPStatus.NO_CONTENT
+    return len(context.captured_queries)
+
+
+def delete_author_queries(admin_client, review_count):
+    category, _ = Category.objects.get_or_create(name='Фильм', slug='movie')
+    author = User.objects.create(
+        username=f'author{review_count}',
+        email=f'author{review_count}@yamdb.fake',
+    )
+    for idx in range(review_count):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5
+        )
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.delete(f'/api/v1/users/{author.username}/')
+    assert response.status_code == HTTPStatus.NO_CONTENT
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, client, admin_client,
+                                              admin, user, user_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        assert self.get_rating(client, title_id) == 5
+
+        response = user_client.patch(
+            f'{url}{reviews[1]["id"]}/', data={'score': 9}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки в отзыве.'
+        )
+
+        response = admin_client.delete(f'{url}{reviews[0]["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 9, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+        response = user_client.delete(f'{url}{reviews[1]["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) is None, (
+            'Если у произведения не осталось отзывов - значением поля '
+            '`rating` должно быть `None`.'
+        )
+
+    def test_02_recalculate_ratings_command(self, admin_client, admin, user,
+                                            user_client):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        Title.objects.update(score_sum=0, review_count=0, rating=None)
+
+        call_command('recalculate_ratings')
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.score_sum, title.review_count, title.rating) == (
+            10, 2, 5
+        ), (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'сохраненный рейтинг произведений по таблице отзывов.'
+        )
+
+    def test_03_title_delete_skips_review_ratings(self, admin_client):
+        # Первый запрос загружает администратора в кэш пользователей.
+        delete_title_queries(admin_client, 0)
+        assert delete_title_queries(admin_client, 2) == (
+            delete_title_queries(admin_client, 50)
+        ), (
+            'Проверьте, что при удалении произведения рейтинг не '
+            'пересчитывается для каждого удаляемого отзыва.'
+        )
+        assert not Review.objects.exists()
+
+    def test_04_queryset_delete(self, admin_client, admin, user,
+                                user_client):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        Title.objects.filter(pk=titles[0]['id']).delete()
+        assert not Review.objects.exists()
+        review = Review.objects.create(
+            title=Title.objects.get(), author=admin, text='Отзыв', score=3
+        )
+        review.delete()
+        assert Title.objects.get().review_count == 0, (
+            'Проверьте, что после удаления произведения рейтинг других '
+            'произведений по-прежнему обновляется.'
+        )
+
+    def test_05_author_delete_rebuilds_ratings_once(self, admin_client):
+        # Первый запрос загружает администратора в кэш пользователей.
+        delete_author_queries(admin_client, 0)
+        assert delete_author_queries(admin_client, 2) == (
+            delete_author_queries(admin_client, 30)
+        ), (
+            'Проверьте, что при удалении пользователя рейтинг не '
+            'пересчитывается для каждого удаляемого отзыва.'
+        )
+        assert not Review.objects.exists()
+
+    def test_06_author_delete_updates_ratings(self, client, admin_client,
+                                              admin, user):
+        titles, _, _ = create_titles(admin_client)
+        title = Title.objects.get(pk=titles[0]['id'])
+        Review.objects.create(title=title, author=admin, text='Отзыв', score=2)
+        Review.objects.create(title=title, author=user, text='Отзыв', score=10)
+        list_url = '/api/v1/titles/'
+        url = f'/api/v1/titles/{title.pk}/'
+        etag = client.get(list_url)['ETag']
+        assert client.get(url).json()['rating'] == 6
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title.refresh_from_db()
+        assert (title.review_count, title.rating) == (1, 2), (
+            'Проверьте, что после удаления пользователя рейтинг '
+            'произведений с его отзывами пересчитывается.'
+        )
+        assert client.get(url).json()['rating'] == 2, (
+            'Проверьте, что после удаления пользователя кэш произведений '
+            'с его отзывами сбрасывается.'
+        )
+        response = client.get(list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после удаления пользователя ETag списка '
+            'произведений меняется.'
+        )
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title, TitleGenre
+
+
+def create_catalog(titles_count):
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.create(name='Ужасы', slug='horror'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000, category=category)
+        for idx in range(titles_count)
+    )
+    TitleGenre.objects.bulk_create(
+        TitleGenre(title=title, genre=genre)
+        for title in Title.objects.all() for genre in genres
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+    url = '/api/v1/titles/'
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context), response.json()
+
+    def test_01_title_list_query_count_is_constant(self, client):
+        create_catalog(1)
+        small_page_queries, data = self.count_queries(client, self.url)
+        assert len(data['results']) == 1
+
+        Title.objects.all().delete()
+        Genre.objects.all().delete()
+        Category.objects.all().delete()
+        create_catalog(25)
+        full_page_queries, data = self.count_queries(client, self.url)
+        assert len(data['results']) == 10
+        assert all(len(title['genre']) == 2 for title in data['results'])
+
+        assert small_page_queries == full_page_queries, (
+            f'Проверьте, что число запросов к базе данных при GET-запросе к '
+            f'`{self.url}` не зависит от количества произведений на '
+            f'странице: {small_page_queries} запросов для одного '
+            f'произведения и {full_page_queries} для десяти.'
+        )
+
+    def test_02_title_detail_query_count(self, client):
+        create_catalog(1)
+        title = Title.objects.get()
+        queries, data = self.count_queries(client, f'{self.url}{title.pk}/')
+        assert len(data['genre']) == 2
+        assert queries <= 3, (
+            f'Проверьте, что GET-запрос к `{self.url}{{title_id}}/` '
+            'загружает категорию и жанры произведения без лишних запросов.'
+        )
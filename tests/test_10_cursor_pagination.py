@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Comment, Review, Title
+
+
+def create_reviews(django_user_model, count):
+    title = Title.objects.create(name='Терминатор', year=1984)
+    for idx in range(count):
+        author = django_user_model.objects.create_user(
+            username=f'reviewer{idx}', email=f'reviewer{idx}@yamdb.fake'
+        )
+        Review.objects.create(
+            title=title, author=author, text=f'review {idx}', score=5
+        )
+        Comment.objects.create(
+            review=Review.objects.order_by('pk').first(),
+            author=author,
+            text=f'comment {idx}',
+        )
+    return title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    def collect_pages(self, client, url):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме пагинации не выполняется '
+                'подсчет общего количества объектов.'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return ids
+
+    def test_01_reviews_cursor_mode(self, client, django_user_model):
+        title = create_reviews(django_user_model, 25)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+
+        ids = self.collect_pages(client, f'{url}?pagination=cursor')
+        expected = list(
+            title.reviews.order_by('-pub_date', 'id')
+            .values_list('id', flat=True)
+        )
+        assert ids == expected, (
+            f'Проверьте, что курсорная пагинация `{url}?pagination=cursor` '
+            'возвращает все отзывы без повторов, начиная с новых.'
+        )
+
+        response = client.get(url)
+        assert response.json()['count'] == 25, (
+            f'Проверьте, что по умолчанию `{url}` использует постраничную '
+            'пагинацию.'
+        )
+
+    def test_02_comments_cursor_mode(self, client, django_user_model):
+        title = create_reviews(django_user_model, 12)
+        review = title.reviews.order_by('pk').first()
+        url = f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+
+        ids = self.collect_pages(client, f'{url}?pagination=cursor')
+        assert sorted(ids) == sorted(
+            review.comments.values_list('id', flat=True)
+        ), (
+            f'Проверьте, что курсорная пагинация `{url}?pagination=cursor` '
+            'возвращает все комментарии без повторов.'
+        )
@@ -0,0 +1,121 @@
+import csv
+import os
+import shutil
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleGenre, User)
+from tests.conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+SNAPSHOT_FIELDS = (
+    (Category, ('id', 'name', 'slug')),
+    (Genre, ('id', 'name', 'slug')),
+    (User, ('id', 'username', 'email', 'role', 'bio')),
+    (Title, ('id', 'name', 'year', 'category_id', 'score_sum',
+             'review_count', 'score_histogram', 'rating')),
+    (TitleGenre, ('id', 'title_id', 'genre_id')),
+    (Review, ('id', 'title_id', 'author_id', 'text', 'score')),
+    (Comment, ('id', 'review_id', 'author_id', 'text')),
+)
+
+
+def take_snapshot():
+    return {
+        model.__name__: list(model.objects.order_by('pk').values_list(*fields))
+        for model, fields in SNAPSHOT_FIELDS
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ImportData:
+
+    def test_01_bulk_and_parallel_import_match_sequential(self):
+        call_command('import_data', DATA_PATH)
+        expected = take_snapshot()
+        assert expected['Review'], 'Проверьте, что отзывы импортированы.'
+
+        for options in (
+            {'bulk': True, 'chunk_size': 10},
+            {'workers': 2, 'shard_size': 2048, 'chunk_size': 10},
+        ):
+            call_command('import_data', DATA_PATH, **options)
+            assert take_snapshot() == expected, (
+                'Проверьте, что импорт с параметрами '
+                f'{options} дает тот же результат, что и обычный импорт.'
+            )
+
+    def test_02_incremental_import(self, tmp_path, capsys):
+        call_command('import_data', DATA_PATH)
+        shutil.copytree(DATA_PATH, tmp_path, dirs_exist_ok=True)
+        review_path = tmp_path / 'review.csv'
+        with open(review_path, encoding='utf-8', newline='') as csv_file:
+            rows = list(csv.reader(csv_file))
+        header, first, deleted, *rest = rows
+        first[header.index('score')] = '1'
+        author = deleted[header.index('author')]
+        reviewed = {
+            row[header.index('title_id')] for row in rows[1:]
+            if row[header.index('author')] == author
+        }
+        new_review = list(deleted)
+        new_review[header.index('id')] = '1000'
+        new_review[header.index('title_id')] = str(next(
+            pk for pk in Title.objects.values_list('pk', flat=True)
+            if str(pk) not in reviewed
+        ))
+        with open(review_path, 'w', encoding='utf-8', newline='') as csv_file:
+            csv.writer(csv_file).writerows([header, first, *rest, new_review])
+        capsys.readouterr()
+
+        call_command(
+            'import_data', str(tmp_path), incremental=True,
+            delete_missing=True
+        )
+        output = capsys.readouterr().out
+        assert 'review.csv: inserted 1, updated 1, deleted 1' in output, (
+            'Проверьте, что в режиме --incremental для каждой таблицы '
+            'выводится количество добавленных, измененных и удаленных строк.'
+        )
+        assert 'titles.csv: inserted 0, updated 0, deleted 0' in output
+        incremental = take_snapshot()
+
+        call_command('import_data', str(tmp_path))
+        assert incremental == take_snapshot(), (
+            'Проверьте, что импорт с параметром --incremental приводит базу '
+            'данных к тому же состоянию, что и полная загрузка файлов.'
+        )
+
+    def test_03_incremental_genre_links(self, tmp_path):
+        call_command('import_data', DATA_PATH)
+        shutil.copytree(DATA_PATH, tmp_path, dirs_exist_ok=True)
+        title = Title.objects.filter(rating__isnull=False).first()
+        genre = Genre.objects.exclude(titlegenre__title=title).first()
+        links_path = tmp_path / 'genre_title.csv'
+        with open(links_path, encoding='utf-8', newline='') as csv_file:
+            rows = list(csv.reader(csv_file))
+        rows.append(['1000', str(title.pk), str(genre.pk)])
+        with open(links_path, 'w', encoding='utf-8', newline='') as csv_file:
+            csv.writer(csv_file).writerows(rows)
+
+        with CaptureQueriesContext(connection) as context:
+            call_command('import_data', str(tmp_path), incremental=True)
+        link = TitleGenre.objects.get(pk=1000)
+        assert link.rating == title.rating, (
+            'Проверьте, что в режиме --incremental рейтинг произведения '
+            'копируется в новые связи с жанрами.'
+        )
+        updates = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "reviews_titlegenre"')
+        ]
+        assert updates and all(
+            '"title_id" IN' in sql for sql in updates
+        ), (
+            'Проверьте, что в режиме --incremental рейтинг копируется только '
+            'в связи произведений, для которых изменились связи с жанрами.'
+        )
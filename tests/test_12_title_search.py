@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleSearch:
+    url = '/api/v1/titles/search/'
+
+    def search(self, client, query, **params):
+        response = client.get(self.url, data={'q': query, **params})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}?q=<запрос>` '
+            'возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_requires_query(self, client):
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Если в GET-запросе к `{self.url}` не передан параметр `q` - '
+            'должен вернуться ответ со статусом 400.'
+        )
+
+    def test_02_search_by_prefix_and_description(self, client, admin_client):
+        create_titles(admin_client)
+        assert self.search(client, 'терм') == ['Терминатор'], (
+            'Проверьте, что поиск находит произведения по началу слова в '
+            'названии без учета регистра.'
+        )
+        assert self.search(client, 'yippie') == ['Крепкий орешек'], (
+            'Проверьте, что поиск выполняется и по описанию произведения.'
+        )
+        assert self.search(client, 'терм', category='books') == []
+        assert self.search(client, 'терм', genre='horror') == ['Терминатор']
+
+    def test_03_search_ranks_name_above_description(self, client,
+                                                    admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Назад в будущее',
+            'year': 1985,
+            'genre': titles[0]['genre'],
+            'category': titles[0]['category'],
+            'description': 'Совсем не терминатор',
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.search(client, 'терминатор') == [
+            'Терминатор', 'Назад в будущее'
+        ], (
+            'Проверьте, что совпадение в названии произведения ранжируется '
+            'выше совпадения в описании.'
+        )
+
+    def test_04_search_index_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        admin_client.patch(url, data={'name': 'Робокоп'})
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'робокоп') == ['Робокоп'], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        admin_client.delete(url)
+        assert self.search(client, 'робокоп') == [], (
+            'Проверьте, что произведение удаляется из поискового индекса '
+            'вместе с произведением.'
+        )
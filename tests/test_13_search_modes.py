@@ -0,0 +1,48 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13SearchModes:
+    url = '/api/v1/genres/'
+
+    def search(self, client, **params):
+        response = client.get(self.url, data=params)
+        assert response.status_code == HTTPStatus.OK
+        return [genre['slug'] for genre in response.json()['results']]
+
+    def test_01_prefix_search_is_case_insensitive(self, client, admin_client):
+        create_genre(admin_client)
+        assert self.search(client, search='ко') == ['comedy'], (
+            f'Проверьте, что GET-запрос к `{self.url}?search=<name>` '
+            'находит жанры по началу названия без учета регистра.'
+        )
+        assert self.search(client, search='КОМЕДИЯ') == ['comedy']
+        assert self.search(client, search='медия') == []
+
+    def test_02_exact_and_regex_modes(self, client, admin_client):
+        create_genre(admin_client)
+        assert self.search(client, search='ко', search_mode='exact') == []
+        assert self.search(
+            client, search='комедия', search_mode='exact'
+        ) == ['comedy']
+        assert self.search(
+            client, search='^(ужасы|драма)$', search_mode='regex'
+        ) == ['horror', 'drama'], (
+            f'Проверьте, что GET-запрос к `{self.url}?search_mode=regex` '
+            'выполняет поиск по регулярному выражению.'
+        )
+        response = client.get(self.url, data={'search_mode': 'fuzzy'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_users_prefix_search(self, admin_client, admin, user):
+        response = admin_client.get(
+            '/api/v1/users/', data={'search': 'testad'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert [
+            found['username'] for found in response.json()['results']
+        ] == [admin.username]
@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+
+from core.metrics import get_registry
+from tests.utils import create_genre, create_single_review, create_titles
+
+
+def get_cache_counters(namespace):
+    samples = get_registry().collect()
+    return {
+        result: samples.get((
+            'yamdb_cache_requests_total',
+            (('namespace', namespace), ('result', result)),
+        ), 0)
+        for result in ('hits', 'misses')
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ResponseCache:
+
+    def get(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response
+
+    def test_01_genre_list_is_cached_and_invalidated(self, client,
+                                                     admin_client):
+        url = '/api/v1/genres/'
+        create_genre(admin_client)
+        counters = get_cache_counters('genres')
+        assert self.get(client, url)['X-Cache'] == 'MISS'
+        response = self.get(client, url)
+        assert response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{url}` возвращает '
+            'ответ из кэша.'
+        )
+        assert response.json()['count'] == 3
+
+        admin_client.post(url, data={'name': 'Триллер', 'slug': 'thriller'})
+        response = self.get(client, url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 4, (
+            f'Проверьте, что кэш ответов `{url}` сбрасывается при создании '
+            'жанра.'
+        )
+        assert get_cache_counters('genres') == {
+            'hits': counters['hits'] + 1, 'misses': counters['misses'] + 2
+        }
+
+    def test_02_title_cache_follows_reviews(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert self.get(client, url).json()['rating'] is None
+        assert self.get(client, url)['X-Cache'] == 'HIT'
+
+        create_single_review(admin_client, titles[0]['id'], 'Отлично', 8)
+        response = self.get(client, url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 8, (
+            f'Проверьте, что кэш ответа `{url}` сбрасывается при появлении '
+            'нового отзыва о произведении.'
+        )
+
+        admin_client.delete('/api/v1/genres/horror/')
+        title = self.get(client, url).json()
+        assert 'horror' not in [genre['slug'] for genre in title['genre']], (
+            'Проверьте, что кэш ответов о произведениях сбрасывается при '
+            'удалении жанра.'
+        )
+
+    def test_03_review_invalidates_only_its_title(self, client, admin_client,
+                                                  user_client):
+        titles, _, _ = create_titles(admin_client)
+        first = f'/api/v1/titles/{titles[0]["id"]}/'
+        second = f'/api/v1/titles/{titles[1]["id"]}/'
+        for url in (first, second, '/api/v1/titles/'):
+            self.get(client, url)
+
+        review = create_single_review(
+            admin_client, titles[0]['id'], 'Отлично', 8
+        ).json()
+        assert self.get(client, second)['X-Cache'] == 'HIT', (
+            'Проверьте, что отзыв о произведении не сбрасывает кэш ответов '
+            'о других произведениях.'
+        )
+        assert self.get(client, first)['X-Cache'] == 'MISS'
+        assert self.get(client, '/api/v1/titles/')['X-Cache'] == 'MISS'
+
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 8)
+        self.get(client, '/api/v1/titles/')
+        response = admin_client.patch(
+            f'{first}reviews/{review["id"]}/', data={'text': 'Другой текст'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get(client, '/api/v1/titles/')['X-Cache'] == 'HIT', (
+            'Проверьте, что изменение отзыва, не меняющее рейтинг, не '
+            'сбрасывает кэш списка произведений.'
+        )
@@ -0,0 +1,126 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConditionalGet:
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response.get('ETag')
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `ETag`.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с заголовком '
+            '`If-None-Match`, совпадающим с `ETag`, возвращает ответ со '
+            'статусом 304.'
+        )
+        assert not context.captured_queries, (
+            f'Проверьте, что ответ 304 на GET-запрос к `{url}` не требует '
+            'запросов к базе данных.'
+        )
+        return etag
+
+    def test_01_reviews_etag(self, client, admin_client, admin, user,
+                             user_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = self.check_not_modified(client, url)
+        detail_etag = self.check_not_modified(
+            client, f'{url}{reviews[0]["id"]}/'
+        )
+
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'text': 'new'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после изменения отзыва GET-запрос к `{url}` '
+            'с устаревшим `ETag` возвращает новые данные.'
+        )
+        response = client.get(
+            f'{url}{reviews[0]["id"]}/', HTTP_IF_NONE_MATCH=detail_etag
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        etag = response['ETag']
+        user_client.delete(f'{url}{reviews[1]["id"]}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_comments_and_titles_etag(self, client, admin_client, admin,
+                                         user, user_client):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        self.check_not_modified(
+            client,
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/'
+        )
+        self.check_not_modified(client, '/api/v1/titles/')
+        etag = self.check_not_modified(
+            client, f'/api/v1/titles/{titles[0]["id"]}/'
+        )
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'year': 1985}
+        )
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/', HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['year'] == 1985
+
+    def test_03_missing_object(self, client):
+        response = client.get('/api/v1/titles/404/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert not response.has_header('ETag')
+
+    def test_04_related_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = self.check_not_modified(client, url)
+        for slug in titles[0]['genre']:
+            admin_client.delete(f'/api/v1/genres/{slug}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после удаления жанра произведения условный '
+            'запрос возвращает новые данные.'
+        )
+        assert response.json()['genre'] == []
+
+        etag = response['ETag']
+        admin_client.delete(f'/api/v1/categories/{titles[0]["category"]}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['category'] is None
+
+    def test_05_review_list_queries(self, client, admin_client, admin, user,
+                                    user_client):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{url}?pagination=cursor')
+        assert response.status_code == HTTPStatus.OK
+        queries = [query['sql'] for query in context.captured_queries]
+        assert not any('COUNT(' in sql for sql in queries), (
+            'Проверьте, что курсорная пагинация отзывов не подсчитывает '
+            'все отзывы.'
+        )
+        assert len([
+            sql for sql in queries if sql.startswith(
+                'SELECT "reviews_title"."id"'
+            )
+        ]) == 1, 'Проверьте, что произведение загружается один раз.'
@@ -0,0 +1,70 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16QueryBudget:
+
+    def test_01_debug_headers(self, client, settings):
+        settings.DEBUG = True
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.get('X-DB-Queries', '').isdigit(), (
+            'Проверьте, что в режиме отладки ответ содержит заголовок '
+            '`X-DB-Queries` с числом SQL-запросов.'
+        )
+        assert response.get('Server-Timing', '').startswith('db;dur='), (
+            'Проверьте, что в режиме отладки ответ содержит заголовок '
+            '`Server-Timing` со временем выполнения SQL-запросов.'
+        )
+
+        settings.DEBUG = False
+        response = client.get('/api/v1/titles/')
+        assert 'X-DB-Queries' not in response, (
+            'Проверьте, что заголовок `X-DB-Queries` не добавляется вне '
+            'режима отладки.'
+        )
+
+    def test_02_reviews_without_n_plus_one(self, admin_client, admin, user,
+                                           user_client,
+                                           django_assert_max_num_queries):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with django_assert_max_num_queries(6):
+            response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == 2
+
+    def test_03_budget_exceeded(self, client, monkeypatch):
+        from api.views import TitleViewSet
+        from core.queries import QueryBudgetExceeded
+
+        monkeypatch.setattr(
+            TitleViewSet, 'query_budgets', {'list': 0}
+        )
+        with pytest.raises(QueryBudgetExceeded):
+            client.get('/api/v1/titles/')
+
+    def test_04_budget_warning(self, client, monkeypatch, settings, caplog):
+        from api.views import TitleViewSet
+
+        settings.QUERY_BUDGET_STRICT = False
+        monkeypatch.setattr(
+            TitleViewSet, 'query_budgets', {'list': 0}
+        )
+        with caplog.at_level(logging.WARNING, logger='api.mixins'):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что вне строгого режима превышение бюджета '
+            'SQL-запросов не прерывает обработку запроса.'
+        )
+        assert 'TitleViewSet.list' in caplog.text, (
+            'Проверьте, что превышение бюджета SQL-запросов записывается '
+            'в лог.'
+        )
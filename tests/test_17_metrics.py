@@ -0,0 +1,111 @@
+import os
+import threading
+from http import HTTPStatus
+
+import pytest
+
+from core.metrics import MetricsRegistry
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Metrics:
+
+    def test_01_metrics_endpoint(self, client):
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        response = client.get('/metrics')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что эндпоинт `/metrics` доступен.'
+        )
+        content = response.content.decode()
+        for line in (
+            'yamdb_requests_total{view="TitleViewSet",action="list",'
+            'status="200"}',
+            'yamdb_request_duration_seconds_bucket{view="TitleViewSet",'
+            'action="list",le="+Inf"}',
+            'yamdb_db_queries_total{view="TitleViewSet",action="list"}',
+            'yamdb_serializer_duration_seconds_count{view="TitleViewSet",'
+            'action="list"}',
+            'yamdb_response_size_bytes_sum{view="TitleViewSet",'
+            'action="list"}',
+            'yamdb_cache_requests_total{namespace="titles",result="hits"}',
+        ):
+            assert line in content, (
+                f'Проверьте, что ответ `/metrics` содержит `{line}`.'
+            )
+
+    def test_02_threads(self):
+        registry = MetricsRegistry()
+        registry.counter('test_total', 'test')
+        registry.histogram('test_seconds', 'test', buckets=(0.1, 1.0))
+
+        def work():
+            for _ in range(1000):
+                registry.inc('test_total', (('view', 'a'),))
+                registry.observe('test_seconds', (('view', 'a'),), 0.5)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        samples = registry.collect()
+        assert samples[('test_total', (('view', 'a'),))] == 4000, (
+            'Проверьте, что значения счетчиков из разных потоков '
+            'суммируются.'
+        )
+        assert samples[('test_seconds', (('view', 'a'),))][:3] == [
+            0, 4000, 0
+        ]
+        content = registry.render()
+        assert 'test_seconds_bucket{view="a",le="0.1"} 0' in content
+        assert 'test_seconds_bucket{view="a",le="1.0"} 4000' in content
+        assert 'test_seconds_count{view="a"} 4000' in content
+
+    def test_03_shared_directory(self, tmp_path):
+        other = MetricsRegistry(directory=str(tmp_path))
+        other.counter('test_total', 'test')
+        other.inc('test_total', (), 3)
+        other.flush(force=True)
+        os.replace(
+            other.get_path(os.getpid()), tmp_path / 'metrics-0.json'
+        )
+
+        registry = MetricsRegistry(directory=str(tmp_path))
+        registry.counter('test_total', 'test')
+        registry.inc('test_total', (), 2)
+        assert registry.collect()[('test_total', ())] == 5, (
+            'Проверьте, что значения других процессов из общего каталога '
+            'суммируются со значениями текущего процесса.'
+        )
+
+    def test_04_concurrent_flush(self, tmp_path):
+        registry = MetricsRegistry(directory=str(tmp_path), flush_interval=0)
+        registry.counter('test_total', 'test')
+        errors = []
+
+        def work():
+            try:
+                for _ in range(300):
+                    registry.inc('test_total')
+                    registry.flush()
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors, (
+            'Проверьте, что одновременное сохранение метрик из нескольких '
+            'потоков не приводит к ошибкам.'
+        )
+        registry.flush(force=True)
+        assert os.listdir(tmp_path) == [f'metrics-{os.getpid()}.json']
+
+    def test_05_failed_flush_does_not_raise(self, tmp_path):
+        registry = MetricsRegistry(directory=str(tmp_path / 'missing'))
+        registry.counter('test_total', 'test')
+        registry.inc('test_total')
+        registry.flush(force=True)
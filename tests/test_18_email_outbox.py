@@ -0,0 +1,108 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from core.models import OutgoingEmail
+from core.outbox import drain_outbox, enqueue_email
+
+
+class FailingConnection:
+
+    def __init__(self, fail_open=False):
+        self.fail_open = fail_open
+        self.opened = 0
+
+    def open(self):
+        self.opened += 1
+        if self.fail_open:
+            raise ConnectionError('SMTP недоступен')
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18EmailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    def test_01_signup_enqueues_email(self, client):
+        outbox_before_count = len(mail.outbox)
+        response = client.post(self.url_signup, data={
+            'email': 'outbox@yamdb.fake', 'username': 'outbox_user'
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST-запрос к `{self.url_signup}` не '
+            'отправляет письмо во время обработки запроса.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient_list == ['outbox@yamdb.fake']
+        assert email.sent_at is None
+
+        call_command('send_outbox_emails')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `send_outbox_emails` отправляет '
+            'письма из очереди.'
+        )
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 1
+
+        call_command('send_outbox_emails')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что отправленное письмо не отправляется повторно.'
+        )
+
+    def test_02_batches(self):
+        outbox_before_count = len(mail.outbox)
+        for idx in range(5):
+            enqueue_email('subject', 'text', 'noreply@yamdb.com',
+                          [f'user{idx}@yamdb.fake'])
+        assert drain_outbox(batch_size=2) == (5, 0)
+        assert len(mail.outbox) == outbox_before_count + 5
+
+    def test_03_retry_with_backoff(self):
+        email = enqueue_email('subject', 'text', 'noreply@yamdb.com',
+                              ['retry@yamdb.fake'])
+        assert drain_outbox(connection=FailingConnection()) == (0, 1)
+        email.refresh_from_db()
+        assert email.sent_at is None and email.attempts == 1
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что после ошибки отправки следующая попытка '
+            'откладывается.'
+        )
+        assert 'SMTP' in email.last_error
+        assert drain_outbox() == (0, 0), (
+            'Проверьте, что письмо не отправляется до наступления времени '
+            'следующей попытки.'
+        )
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        assert drain_outbox() == (1, 0)
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 2
+
+    def test_04_unavailable_server(self, settings):
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        for idx in range(3):
+            enqueue_email('subject', 'text', 'noreply@yamdb.com',
+                          [f'user{idx}@yamdb.fake'])
+        connection = FailingConnection(fail_open=True)
+        assert drain_outbox(connection=connection) == (0, 3)
+        assert connection.opened == 1, (
+            'Проверьте, что при недоступном почтовом сервере остальные '
+            'письма пачки откладываются без новых подключений.'
+        )
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        assert drain_outbox(connection=connection) == (0, 3)
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        assert drain_outbox() == (0, 0), (
+            'Проверьте, что письма не отправляются после исчерпания '
+            'попыток.'
+        )
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+
+from core.models import OutgoingEmail
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19SignupThrottling:
+    url_signup = '/api/v1/auth/signup/'
+    url_token = '/api/v1/auth/token/'
+
+    @pytest.fixture
+    def rates(self, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                'signup_ip': '5/min',
+                'signup_user': '2/min',
+                'token_ip': '3/min',
+                'token_user': '2/min',
+            },
+        }
+
+    def test_01_repeat_signup_coalesced(self, client):
+        data = {'email': 'coalesce@yamdb.fake', 'username': 'coalesce'}
+        for _ in range(3):
+            response = client.post(self.url_signup, data=data)
+            assert response.status_code == HTTPStatus.OK
+        assert OutgoingEmail.objects.count() == 1, (
+            f'Проверьте, что повторные POST-запросы к `{self.url_signup}` '
+            'в течение окна SIGNUP_EMAIL_WINDOW не создают новых писем.'
+        )
+
+    def test_02_signup_user_throttled(self, client, rates):
+        data = {'email': 'limited@yamdb.fake', 'username': 'limited'}
+        for _ in range(2):
+            response = client.post(self.url_signup, data=data)
+            assert response.status_code == HTTPStatus.OK
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{self.url_signup}` с '
+            'одним `username` ограничиваются.'
+        )
+        retry_after = response.get('Retry-After')
+        assert retry_after and 0 < int(retry_after) <= 30, (
+            'Проверьте, что ответ со статусом 429 содержит заголовок '
+            '`Retry-After` со временем до пополнения корзины.'
+        )
+
+        response = client.post(self.url_signup, data={
+            'email': 'other@yamdb.fake', 'username': 'other'
+        })
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ограничение по `username` не распространяется '
+            'на других пользователей.'
+        )
+
+    def test_03_token_ip_throttled(self, client, rates):
+        for idx in range(3):
+            response = client.post(self.url_token, data={
+                'username': f'user_{idx}', 'confirmation_code': '12345'
+            })
+            assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+        response = client.post(self.url_token, data={
+            'username': 'user_4', 'confirmation_code': '12345'
+        })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{self.url_token}` с '
+            'одного IP-адреса ограничиваются.'
+        )
+        assert response.get('Retry-After')
+
+    def test_04_forwarded_for_not_trusted(self, client, rates, settings):
+        for idx in range(4):
+            response = client.post(
+                self.url_token,
+                data={'username': f'user_{idx}', 'confirmation_code': '1'},
+                HTTP_X_FORWARDED_FOR=f'10.0.0.{idx}',
+            )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что без доверенных прокси-серверов адрес клиента '
+            'не берется из заголовка `X-Forwarded-For`.'
+        )
+
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK, 'NUM_PROXIES': 1
+        }
+        for idx in range(4):
+            response = client.post(
+                self.url_token,
+                data={'username': f'proxy_{idx}', 'confirmation_code': '1'},
+                HTTP_X_FORWARDED_FOR=f'10.0.1.{idx}, 192.168.0.{idx}',
+            )
+            assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS, (
+                'Проверьте, что за доверенным прокси-сервером адрес клиента '
+                'берется из последней записи заголовка `X-Forwarded-For`.'
+            )
@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def user_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'reviews_user' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20CachedAuthentication:
+
+    def test_01_no_user_query(self, user_client):
+        user_client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get('/api/v1/genres/')
+        assert response.status_code == HTTPStatus.OK
+        assert not user_queries(context), (
+            'Проверьте, что аутентифицированный GET-запрос не загружает '
+            'пользователя из базы данных, если он есть в кэше.'
+        )
+
+    def test_02_role_change(self, admin_client, user, user_client):
+        data = {'name': 'Жанр', 'slug': 'genre'}
+        response = user_client.post('/api/v1/genres/', data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        response = user_client.post('/api/v1/genres/', data=data)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что изменение роли пользователя сбрасывает кэш '
+            'аутентификации.'
+        )
+
+    def test_03_deleted_user(self, admin_client, user, user_client):
+        user_client.get('/api/v1/users/me/')
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        response = user_client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что удаление пользователя сбрасывает кэш '
+            'аутентификации.'
+        )
+
+    def test_04_me_returns_full_profile(self, user, user_client):
+        user_client.get('/api/v1/titles/')
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email
+        assert response.json()['bio'] == user.bio
@@ -0,0 +1,68 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.asgi import get_asgi_application
+
+from tests.utils import create_reviews
+
+
+def asgi_get(path, query=''):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(get_asgi_application()(scope, receive, send))
+    body = b''.join(
+        message.get('body', b'') for message in messages
+        if message['type'] == 'http.response.body'
+    )
+    return messages[0]['status'], body
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Asgi:
+
+    def test_01_same_responses(self, client, admin_client, admin, user,
+                               user_client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        for path in (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            '/api/v1/genres/',
+            '/api/v1/categories/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+        ):
+            status, body = asgi_get(path)
+            assert status == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{path}` через ASGI '
+                'возвращает ответ со статусом 200.'
+            )
+            assert json.loads(body) == client.get(path).json(), (
+                f'Проверьте, что ответы на GET-запрос к `{path}` через ASGI '
+                'и WSGI совпадают.'
+            )
+
+        status, _ = asgi_get('/api/v1/titles/0/reviews/')
+        assert status == HTTPStatus.NOT_FOUND
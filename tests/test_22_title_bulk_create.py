@@ -0,0 +1,140 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleBulkCreate:
+    url = '/api/v1/titles/bulk/'
+
+    def make_titles(self, count, genres, category):
+        return [
+            {
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'description': f'Описание {idx}',
+                'genre': genres,
+                'category': category,
+            }
+            for idx in range(count)
+        ]
+
+    def test_01_bulk_create(self, admin_client, client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        client.get('/api/v1/titles/')
+        data = self.make_titles(
+            5, [genres[0]['slug'], genres[1]['slug']], categories[0]['slug']
+        )
+        response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.url}` со '
+            'списком корректных произведений возвращает ответ со статусом '
+            '201.'
+        )
+        created = response.json()
+        assert [title['name'] for title in created] == [
+            title['name'] for title in data
+        ]
+        assert all(title['id'] for title in created)
+        assert created[0]['genre'] == [genres[0]['slug'], genres[1]['slug']]
+        assert created[0]['category'] == categories[0]['slug']
+
+        response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 5, (
+            'Проверьте, что после массового создания произведений кэш '
+            'списка произведений сбрасывается.'
+        )
+        response = client.get('/api/v1/titles/search/', {'q': 'Описание'})
+        assert response.json()['count'] == 5, (
+            'Проверьте, что созданные произведения попадают в поисковый '
+            'индекс.'
+        )
+
+    def test_02_per_item_errors(self, admin_client, client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = self.make_titles(3, [genres[0]['slug']], categories[0]['slug'])
+        data[1]['genre'] = ['unknown', genres[0]['slug']]
+        data[2]['category'] = 'unknown'
+        data[2]['year'] = 3000
+        response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert len(errors) == 3 and errors[0] == {}, (
+            'Проверьте, что ответ содержит ошибки для каждого произведения '
+            'из запроса.'
+        )
+        assert errors[1] == {} and set(errors[2]) == {'year'}, (
+            'Проверьте, что слаги проверяются после проверки полей '
+            'произведения.'
+        )
+        assert client.get('/api/v1/titles/').json()['count'] == 0, (
+            'Проверьте, что при ошибке хотя бы в одном произведении ни одно '
+            'произведение не создается.'
+        )
+
+        data[2]['year'] = 2000
+        response = admin_client.post(self.url, data=data, format='json')
+        errors = response.json()
+        assert list(errors[1]) == ['genre'] and list(errors[2]) == [
+            'category'
+        ]
+
+    def test_03_permissions_and_limits(self, admin_client, user_client,
+                                       settings):
+        response = user_client.post(self.url, data=[], format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что POST-запрос к `{self.url}` доступен только '
+            'администратору.'
+        )
+        response = admin_client.post(self.url, data=[], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        settings.TITLE_BULK_MAX_ITEMS = 2
+        data = self.make_titles(3, [], 'films')
+        response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_bulk_insert_queries(self, admin_client, client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        genre_slugs = [genres[0]['slug']]
+        category = categories[0]['slug']
+        admin_client.post(
+            self.url, data=self.make_titles(1, genre_slugs, category),
+            format='json'
+        )
+        Title.objects.all().delete()
+
+        query_counts = []
+        for count in (2, 20):
+            data = self.make_titles(count, genre_slugs, category)
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(
+                    self.url, data=data, format='json'
+                )
+            assert response.status_code == HTTPStatus.CREATED
+            query_counts.append(len(context))
+            created = {title['id']: title['name'] for title in response.json()}
+            stored = dict(
+                Title.objects.filter(pk__in=created).values_list('pk', 'name')
+            )
+            assert created == stored, (
+                'Проверьте, что ответ содержит идентификаторы произведений, '
+                'сохраненных в базе.'
+            )
+        assert query_counts[0] == query_counts[1], (
+            'Проверьте, что число запросов к базе при массовом создании '
+            'произведений не зависит от их количества.'
+        )
+        response = client.get('/api/v1/titles/search/', {'q': 'Описание'})
+        assert response.json()['count'] == 22, (
+            'Проверьте, что созданные произведения попадают в поисковый '
+            'индекс.'
+        )
@@ -0,0 +1,115 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def titlegenre_queries(context, statement=''):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'reviews_titlegenre' in query['sql']
+        and query['sql'].startswith(statement)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TitleGenreUpdate:
+
+    def test_01_genre_diff(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(
+                url, data={'genre': ['comedy', 'drama']}, format='json'
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert sorted(response.json()['genre']) == ['comedy', 'drama']
+        assert len(titlegenre_queries(context, 'INSERT')) == 1, (
+            'Проверьте, что при изменении жанров произведения новые связи '
+            'добавляются одним запросом.'
+        )
+        assert len(titlegenre_queries(context, 'DELETE')) == 1, (
+            'Проверьте, что при изменении жанров произведения лишние связи '
+            'удаляются одним запросом.'
+        )
+
+        genres = client.get(url).json()['genre']
+        assert sorted(genre['slug'] for genre in genres) == [
+            'comedy', 'drama'
+        ], (
+            'Проверьте, что после изменения жанров кэш произведения '
+            'сбрасывается.'
+        )
+
+    def test_02_patch_without_genres(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(url, data={'name': 'Новое'})
+        assert response.status_code == HTTPStatus.OK
+        assert not [
+            sql for sql in titlegenre_queries(context)
+            if not sql.startswith('SELECT "reviews_genre"')
+        ], (
+            'Проверьте, что PATCH-запрос без `genre` не изменяет и не '
+            'сравнивает связи произведения с жанрами.'
+        )
+        updates = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "reviews_title"')
+        ]
+        assert len(updates) == 1 and 'score_sum' not in updates[0], (
+            'Проверьте, что PATCH-запрос сохраняет только изменившиеся поля '
+            'произведения и не перезаписывает рейтинг.'
+        )
+
+    def test_03_same_genres(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        genres = titles[0]['genre']
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(
+                url, data={'genre': genres}, format='json'
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert not titlegenre_queries(context, 'INSERT')
+        assert not titlegenre_queries(context, 'DELETE')
+
+    def test_04_genre_only_patch_refreshes_list(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        list_url = '/api/v1/titles/'
+        response = client.get(list_url)
+        etag = response['ETag']
+        assert client.get(list_url, {'genre': 'drama'}).json()['count'] == 1
+
+        response = admin_client.patch(
+            url, data={'genre': [*titles[0]['genre'], 'drama']},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        response = client.get(list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления жанров произведению ETag '
+            'списка произведений меняется.'
+        )
+        title = next(
+            item for item in response.json()['results']
+            if item['id'] == titles[0]['id']
+        )
+        assert sorted(genre['slug'] for genre in title['genre']) == [
+            'comedy', 'drama', 'horror'
+        ], (
+            'Проверьте, что после добавления жанров произведению кэш '
+            'списка произведений сбрасывается.'
+        )
+        response = client.get(list_url, {'genre': 'drama'})
+        assert response.json()['count'] == 2, (
+            'Проверьте, что после добавления жанра произведение находится '
+            'фильтром по этому жанру.'
+        )
@@ -0,0 +1,114 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_titles
+
+
+def table_queries(context, table):
+    return [
+        query['sql'] for query in context.captured_queries
+        if f'"{table}"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24SparseFields:
+    url = '/api/v1/titles/'
+
+    def test_01_title_list_fields(self, admin_client, client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{self.url}?fields=id,name')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert results and all(
+            set(title) == {'id', 'name'} for title in results
+        ), (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        assert not table_queries(context, 'reviews_titlegenre'), (
+            'Проверьте, что жанры не загружаются, если поле `genre` не '
+            'запрошено.'
+        )
+        assert not table_queries(context, 'reviews_category'), (
+            'Проверьте, что категория не загружается, если поле `category` '
+            'не запрошено.'
+        )
+        title_query = next(
+            sql for sql in table_queries(context, 'reviews_title')
+            if 'LIMIT' in sql
+        )
+        assert '"description"' not in title_query, (
+            'Проверьте, что незапрошенные поля не читаются из базы данных.'
+        )
+
+    def test_02_title_omit(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(
+            f'{self.url}{titles[0]["id"]}/?omit=description,genre'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()) == {
+            'id', 'name', 'year', 'rating', 'category', 'scores'
+        }, 'Проверьте, что параметр `omit` исключает поля из ответа.'
+
+        response = client.get(f'{self.url}?fields=name,genre&omit=genre')
+        assert all(
+            set(title) == {'name'} for title in response.json()['results']
+        )
+
+    def test_03_unknown_field(self, client):
+        response = client.get(f'{self.url}?fields=id,secret')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что при запросе неизвестного поля возвращается '
+            'ответ со статусом 400.'
+        )
+        assert 'fields' in response.json()
+
+    def test_04_full_response_unchanged(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.url)
+        assert set(response.json()['results'][0]) == {
+            'id', 'name', 'year', 'rating', 'description', 'genre',
+            'category'
+        }
+
+    def test_05_review_fields(self, admin_client, admin, client):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = f'{self.url}{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                f'{url}?fields=id,score&pagination=cursor'
+            )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['results'] == [{'id': reviews[0]['id'], 'score': 5}]
+        assert not table_queries(context, 'reviews_user'), (
+            'Проверьте, что автор отзыва не загружается, если поле `author` '
+            'не запрошено.'
+        )
+
+    def test_06_user_fields(self, admin_client, admin):
+        response = admin_client.get('/api/v1/users/?fields=username,role')
+        assert response.status_code == HTTPStatus.OK
+        assert {'username': admin.username, 'role': 'admin'} in (
+            response.json()['results']
+        )
+        response = admin_client.get('/api/v1/users/me/?omit=bio,email')
+        assert set(response.json()) == {
+            'username', 'first_name', 'last_name', 'role'
+        }
+
+    def test_07_write_ignores_fields(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.patch(
+            f'{self.url}{titles[0]["id"]}/?fields=id',
+            data={'name': 'Новое название'},
+            format='json',
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == 'Новое название'
@@ -0,0 +1,96 @@
+import csv
+import json
+
+import pytest
+from django.core.management import call_command
+from django.utils.dateparse import parse_datetime
+
+from reviews.models import Comment, Review, Title, User
+
+GENERATE_OPTIONS = {
+    'users': 500, 'titles': 20, 'reviews': 400, 'comments': 100, 'seed': 7
+}
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as csv_file:
+        return list(csv.reader(csv_file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25GenerateData:
+
+    def test_01_csv_is_seeded_and_importable(self, tmp_path):
+        first = tmp_path / 'first'
+        second = tmp_path / 'second'
+        call_command('generate_data', output=str(first), **GENERATE_OPTIONS)
+        call_command('generate_data', output=str(second), **GENERATE_OPTIONS)
+        for path in first.iterdir():
+            assert read_csv(path) == read_csv(second / path.name), (
+                'Проверьте, что при одинаковом seed генерируются одинаковые '
+                'данные.'
+            )
+
+        reviews = read_csv(first / 'review.csv')[1:]
+        assert len(reviews) == GENERATE_OPTIONS['reviews']
+        assert len({(row[1], row[3]) for row in reviews}) == len(reviews), (
+            'Проверьте, что пользователь оставляет не больше одного отзыва '
+            'на произведение.'
+        )
+
+        expected_dates = {
+            int(row[0]): parse_datetime(row[5]) for row in reviews
+        }
+        for options in ({'bulk': True}, {'workers': 2, 'shard_size': 4096}):
+            call_command('import_data', str(first), **options)
+            assert Review.objects.count() == GENERATE_OPTIONS['reviews']
+            assert Comment.objects.count() == GENERATE_OPTIONS['comments']
+            assert dict(
+                Review.objects.values_list('pk', 'pub_date')
+            ) == expected_dates, (
+                'Проверьте, что при импорте сгенерированных файлов '
+                f'с параметрами {options} сохраняются даты отзывов.'
+            )
+
+    def test_02_reviews_are_skewed(self):
+        call_command('generate_data', database=True, **GENERATE_OPTIONS)
+        assert Title.objects.count() == GENERATE_OPTIONS['titles']
+        assert User.objects.count() == GENERATE_OPTIONS['users']
+        counts = sorted(
+            Title.objects.values_list('review_count', flat=True),
+            reverse=True,
+        )
+        assert sum(counts) == GENERATE_OPTIONS['reviews']
+        assert counts[0] >= 5 * counts[len(counts) // 2], (
+            'Проверьте, что у популярных произведений отзывов значительно '
+            'больше, чем у остальных.'
+        )
+        assert Title.objects.filter(rating__isnull=False).exists()
+        pub_dates = set(Review.objects.values_list('pub_date', flat=True))
+        assert len(pub_dates) > 1, (
+            'Проверьте, что при записи в базу сохраняются сгенерированные '
+            'даты отзывов.'
+        )
+
+    def test_03_benchmark_covers_every_endpoint(self, tmp_path):
+        call_command('generate_data', database=True, **GENERATE_OPTIONS)
+        output = tmp_path / 'benchmark.json'
+        call_command(
+            'benchmark_api', repeat=2, warmup=0, output=str(output)
+        )
+        report = json.loads(output.read_text(encoding='utf-8'))
+        assert report['uncovered'] == []
+        covered = {row['path'] for row in report['results'].values()}
+        assert '/api/v1/auth/signup/' in covered
+        for name, row in report['results'].items():
+            assert row['status'] < 400, (
+                f'Сценарий {name} завершился ответом {row["status"]}.'
+            )
+            assert row['queries'] > 0 and row['p99_ms'] >= row['p50_ms']
+
+        counts = (Title.objects.count(), Review.objects.count())
+        call_command('benchmark_api', repeat=1, warmup=0,
+                     only=['titles_destroy'], compare=str(output))
+        assert (Title.objects.count(), Review.objects.count()) == counts, (
+            'Проверьте, что замер не изменяет данные в базе.'
+        )
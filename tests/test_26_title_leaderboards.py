@@ -0,0 +1,194 @@
+import json
+import math
+from base64 import b64encode
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.fields import creation_dates_kept
+from reviews.models import Category, Genre, Review, Title, TitleGenre, User
+from reviews.ratings import rebuild_ratings
+
+TOP_URL = '/api/v1/titles/top/'
+TRENDING_URL = '/api/v1/titles/trending/'
+
+
+def create_catalog(scores_by_title):
+    """Создает произведения с отзывами и возвращает их в порядке
+    `scores_by_title`."""
+    movies = Category.objects.create(name='Фильм', slug='movie')
+    books = Category.objects.create(name='Книга', slug='book')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    users = [
+        User.objects.create(username=f'user{idx}', email=f'u{idx}@yamdb.fake')
+        for idx in range(max(map(len, scores_by_title), default=0))
+    ]
+    titles = []
+    for idx, scores in enumerate(scores_by_title):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000,
+            category=movies if idx % 2 else books,
+        )
+        TitleGenre.objects.create(
+            title=title, genre=drama if idx % 3 else comedy
+        )
+        for user, score in zip(users, scores):
+            Review.objects.create(
+                title=title, author=user, text='Отзыв', score=score
+            )
+        titles.append(title)
+    return titles
+
+
+def walk_pages(client, url):
+    ids = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        ids.extend(title['id'] for title in data['results'])
+        url = data['next']
+    return ids
+
+
+def expected_top(queryset):
+    return list(
+        queryset.filter(rating__isnull=False)
+        .order_by('-rating', '-id').values_list('id', flat=True)
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26TitleLeaderboards:
+
+    def test_01_top_walks_all_pages(self, client):
+        create_catalog([[score] for score in (5, 9, 9, 2, 9, 7) * 4] + [[]])
+        ids = walk_pages(client, TOP_URL)
+        assert ids == expected_top(Title.objects.all()), (
+            'Проверьте, что `/api/v1/titles/top/` возвращает произведения '
+            'с рейтингом по убыванию рейтинга без пропусков и повторов.'
+        )
+
+    def test_02_top_by_genre_and_category(self, client):
+        create_catalog([[score, 10 - score] for score in range(1, 10)] * 3)
+        assert walk_pages(client, f'{TOP_URL}?genre=drama') == expected_top(
+            Title.objects.filter(genre__slug='drama')
+        )
+        assert walk_pages(client, f'{TOP_URL}?category=book') == (
+            expected_top(Title.objects.filter(category__slug='book'))
+        )
+        response = client.get(f'{TOP_URL}?genre=unknown')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.get(f'{TOP_URL}?genre=drama&category=book')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_genre_leaderboard_follows_reviews(self, client):
+        first, second = create_catalog([[4], [6]])
+        url = f'{TOP_URL}?genre=comedy'
+        assert walk_pages(client, url) == [first.pk]
+        second.refresh_from_db()
+        TitleGenre.objects.create(
+            title=second, genre=Genre.objects.get(slug='comedy'),
+            rating=second.rating,
+        )
+        assert walk_pages(client, url) == [second.pk, first.pk]
+
+        review = first.reviews.get()
+        review.score = 10
+        review.save()
+        assert walk_pages(client, url) == [first.pk, second.pk], (
+            'Проверьте, что лучшие произведения жанра пересчитываются при '
+            'изменении оценки.'
+        )
+        review.delete()
+        assert walk_pages(client, url) == [second.pk]
+
+    def test_04_top_page_reads_by_index(self, client):
+        create_catalog([[score] for score in (3, 8) * 30])
+        response = client.get(TOP_URL)
+        next_url = response.json()['next']
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(next_url)
+        assert response.status_code == HTTPStatus.OK
+        assert not any(
+            'OFFSET' in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что следующие страницы выбираются по значению '
+            'курсора, а не со смещением.'
+        )
+        response = client.get(f'{TOP_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_05_trending(self, client):
+        old, quiet, popular, fresh = create_catalog([[], [], [], []])
+        users = [
+            User.objects.create(username=f'author{idx}', email=f'a{idx}@ya.ru')
+            for idx in range(5)
+        ]
+        now = timezone.now()
+        with creation_dates_kept():
+            for title, age, count in (
+                (old, timedelta(days=30), 5),
+                (quiet, timedelta(days=3), 1),
+                (popular, timedelta(days=2), 3),
+                (fresh, timedelta(hours=1), 1),
+            ):
+                for user in users[:count]:
+                    Review.objects.create(
+                        title=title, author=user, text='Отзыв', score=5,
+                        pub_date=now - age,
+                    )
+        ids = walk_pages(client, TRENDING_URL)
+        assert ids == [popular.pk, fresh.pk, quiet.pk], (
+            'Проверьте, что `/api/v1/titles/trending/` сортирует '
+            'произведения по недавней активности и не включает '
+            'произведения без отзывов за последнюю неделю.'
+        )
+
+        Review.objects.filter(title=popular).delete()
+        assert walk_pages(client, TRENDING_URL) == [fresh.pk, quiet.pk]
+
+    def test_06_rebuild_matches_incremental(self):
+        create_catalog([[7, 3, 9], [1], [10, 10]])
+        Review.objects.filter(score=3).delete()
+        expected = {
+            title.pk: (title.trending_score, title.rating)
+            for title in Title.objects.all()
+        }
+        expected_links = list(
+            TitleGenre.objects.values_list('pk', 'rating')
+        )
+        Title.objects.update(trending_score=None)
+        TitleGenre.objects.update(rating=None)
+        rebuild_ratings()
+        for title in Title.objects.all():
+            score, rating = expected[title.pk]
+            assert math.isclose(title.trending_score, score, rel_tol=1e-9)
+            assert title.rating == rating
+        assert list(
+            TitleGenre.objects.values_list('pk', 'rating')
+        ) == expected_links
+
+    @pytest.mark.parametrize('url, position', [
+        (TOP_URL, ['x', 'y']),
+        (TOP_URL, [None, None]),
+        (f'{TOP_URL}?genre=drama', ['x', 1]),
+        (TRENDING_URL, ['x', 'y']),
+        (TRENDING_URL, [{'a': 1}, 1]),
+    ])
+    def test_07_tampered_cursor(self, client, url, position):
+        create_catalog([[5], [7]])
+        cursor = b64encode(
+            json.dumps(position).encode(), altchars=b'-_'
+        ).decode()
+        separator = '&' if '?' in url else '?'
+        response = client.get(f'{url}{separator}cursor={cursor}')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что `{url}` отклоняет курсор со значениями '
+            'неподходящего типа ответом со статусом 404.'
+        )
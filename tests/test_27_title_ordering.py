@@ -0,0 +1,145 @@
+import json
+from base64 import b64encode
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Review, Title, User
+
+URL = '/api/v1/titles/'
+
+
+def create_titles(count):
+    category = Category.objects.create(name='Фильм', slug='movie')
+    users = [
+        User.objects.create(username=f'user{idx}', email=f'u{idx}@yamdb.fake')
+        for idx in range(3)
+    ]
+    for idx in range(count):
+        title = Title.objects.create(
+            name=f'Произведение {idx % 7}', year=1990 + idx % 5,
+            category=category,
+        )
+        for user in users[:idx % 4]:
+            Review.objects.create(
+                title=title, author=user, text='Отзыв', score=1 + idx % 10
+            )
+
+
+def make_cursor(position):
+    return b64encode(json.dumps(position).encode(), altchars=b'-_').decode()
+
+
+def walk_pages(client, url):
+    ids = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        ids.extend(title['id'] for title in data['results'])
+        url = data['next']
+    return ids
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27TitleOrdering:
+
+    @pytest.mark.parametrize('ordering, expected', (
+        ('rating', ('rating_key', 'id')),
+        ('-rating', ('-rating_key', '-id')),
+        ('year', ('year', 'id')),
+        ('-name', ('-name', '-id')),
+        ('-review_count', ('-review_count', '-id')),
+    ))
+    def test_01_ordering(self, client, ordering, expected):
+        create_titles(25)
+        expected_ids = list(
+            Title.objects.order_by(*expected).values_list('id', flat=True)
+        )
+        response = client.get(f'{URL}?ordering={ordering}')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['count'] == len(expected_ids)
+        assert [title['id'] for title in data['results']] == (
+            expected_ids[:len(data['results'])]
+        ), (
+            'Проверьте, что параметр `ordering` сортирует произведения по '
+            'указанному полю.'
+        )
+        assert walk_pages(
+            client, f'{URL}?ordering={ordering}&pagination=cursor'
+        ) == expected_ids, (
+            'Проверьте, что курсорная пагинация проходит все страницы '
+            'в заданном порядке без пропусков и повторов.'
+        )
+
+    def test_02_unrated_titles_come_first(self, client):
+        create_titles(8)
+        ids = walk_pages(client, f'{URL}?ordering=rating&pagination=cursor')
+        unrated = set(
+            Title.objects.filter(rating__isnull=True)
+            .values_list('id', flat=True)
+        )
+        assert set(ids[:len(unrated)]) == unrated
+
+    def test_03_invalid_ordering(self, client):
+        response = client.get(f'{URL}?ordering=description')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что сортировка по неизвестному полю возвращает '
+            'ответ со статусом 400.'
+        )
+        assert 'ordering' in response.json()
+
+    def test_04_deep_page_reads_by_index(self, client):
+        create_titles(40)
+        url = f'{URL}?ordering=-year&pagination=cursor&fields=id,name'
+        next_url = client.get(url).json()['next']
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(next_url)
+        assert response.status_code == HTTPStatus.OK
+        assert not any(
+            'OFFSET' in query['sql'] for query in context.captured_queries
+        ), (
+            'Проверьте, что следующие страницы выбираются по значению '
+            'курсора, а не со смещением.'
+        )
+        titles = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT "reviews_title"."id"')
+        ]
+        assert len(titles) == 1, (
+            'Проверьте, что ключ сортировки загружается вместе со страницей.'
+        )
+
+    def test_05_rating_key_follows_reviews(self):
+        create_titles(0)
+        title = Title.objects.create(
+            name='Произведение', year=2000, category=Category.objects.get()
+        )
+        review = Review.objects.create(
+            title=title, author=User.objects.first(), text='Отзыв', score=7
+        )
+        title.refresh_from_db()
+        assert title.rating_key == title.rating == 7
+        review.delete()
+        title.refresh_from_db()
+        assert title.rating is None and title.rating_key == 0
+
+    @pytest.mark.parametrize('ordering, position', [
+        ('-rating', ['abc', 1]),
+        ('name', [None, None]),
+        ('year', [{'a': 1}, 1]),
+        ('', [{'a': 1}]),
+        ('', [[1]]),
+    ])
+    def test_06_tampered_cursor(self, client, ordering, position):
+        create_titles(3)
+        response = client.get(URL, {
+            'ordering': ordering, 'cursor': make_cursor(position)
+        })
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что курсор со значениями неподходящего типа '
+            'отклоняется ответом со статусом 404.'
+        )
@@ -0,0 +1,115 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Review, Title, User
+from reviews.ratings import rebuild_ratings
+
+
+def create_title(scores):
+    title = Title.objects.create(
+        name='Произведение', year=2000,
+        category=Category.objects.create(name='Фильм', slug='movie'),
+    )
+    reviews = [
+        Review.objects.create(
+            title=title,
+            author=User.objects.create(
+                username=f'user{idx}', email=f'u{idx}@yamdb.fake'
+            ),
+            text='Отзыв',
+            score=score,
+        )
+        for idx, score in enumerate(scores)
+    ]
+    return title, reviews
+
+
+def rating_url(title):
+    return f'/api/v1/titles/{title.pk}/rating/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28TitleScores:
+
+    def test_01_histogram_follows_reviews(self):
+        title, reviews = create_title([3, 8, 8, 10])
+        title.refresh_from_db()
+        assert title.score_histogram == [0, 0, 1, 0, 0, 0, 0, 2, 0, 1], (
+            'Проверьте, что распределение оценок обновляется при создании '
+            'отзыва.'
+        )
+        reviews[0].score = 9
+        reviews[0].save()
+        reviews[3].delete()
+        title.refresh_from_db()
+        assert title.score_histogram == [0, 0, 0, 0, 0, 0, 0, 2, 1, 0], (
+            'Проверьте, что распределение оценок обновляется при изменении '
+            'и удалении отзыва.'
+        )
+        assert title.score_sum == 25 and title.review_count == 3
+
+    def test_02_rating_endpoint(self, client, settings):
+        settings.RATING_PRIOR_MEAN = 5
+        settings.RATING_PRIOR_WEIGHT = 4
+        title, _ = create_title([2, 4, 9, 9])
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(rating_url(title))
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'count': 4,
+            'mean': 6.0,
+            'median': 6.5,
+            'bayesian': 5.5,
+            'histogram': {
+                '1': 0, '2': 1, '3': 0, '4': 1, '5': 0,
+                '6': 0, '7': 0, '8': 0, '9': 2, '10': 0,
+            },
+        }
+        assert not any(
+            '"reviews_review"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что распределение оценок не вычисляется по таблице '
+            'отзывов.'
+        )
+
+        Review.objects.filter(score=2).delete()
+        data = client.get(rating_url(title)).json()
+        assert (data['count'], data['median']) == (3, 9), (
+            'Проверьте, что ответ обновляется после изменения отзывов.'
+        )
+
+    def test_03_without_reviews(self, client, settings):
+        settings.RATING_PRIOR_MEAN = 5.5
+        title, _ = create_title([])
+        data = client.get(rating_url(title)).json()
+        assert (data['count'], data['mean'], data['median']) == (0, None, None)
+        assert data['bayesian'] == 5.5
+        response = client.get('/api/v1/titles/0/rating/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_title_detail(self, client):
+        title, _ = create_title([5, 6, 7])
+        response = client.get(f'/api/v1/titles/{title.pk}/')
+        assert response.json()['scores']['median'] == 6, (
+            'Проверьте, что распределение оценок выводится на странице '
+            'произведения.'
+        )
+        response = client.get(
+            f'/api/v1/titles/{title.pk}/?fields=id,scores'
+        )
+        assert set(response.json()) == {'id', 'scores'}
+        assert response.json()['scores']['count'] == 3
+        response = client.get('/api/v1/titles/')
+        assert 'scores' not in response.json()['results'][0]
+
+    def test_05_rebuild(self):
+        title, _ = create_title([1, 1, 10])
+        expected = Title.objects.get().score_histogram
+        Title.objects.update(score_histogram=[0] * 10)
+        rebuild_ratings()
+        title.refresh_from_db()
+        assert title.score_histogram == expected
@@ -0,0 +1,138 @@
+import math
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Review, SimilarTitle, Title, User
+from reviews.similarity import rebuild_similar_titles
+
+SCORES = (
+    # Авторы отзывов: 0    1     2     3     4
+    (10, 9, None, 1, None),
+    (9, 10, None, 2, None),
+    (None, 2, 8, None, 7),
+    (1, None, 9, None, 8),
+    (None, None, None, None, None),
+)
+
+
+def create_catalog(scores=SCORES):
+    category = Category.objects.create(name='Фильм', slug='movie')
+    users = [
+        User.objects.create(username=f'user{idx}', email=f'u{idx}@yamdb.fake')
+        for idx in range(len(scores[0]))
+    ]
+    titles = []
+    for idx, row in enumerate(scores):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        for user, score in zip(users, row):
+            if score is not None:
+                Review.objects.create(
+                    title=title, author=user, text='Отзыв', score=score
+                )
+        titles.append(title)
+    return titles
+
+
+def cosine(first, second):
+    dot = sum(
+        a * b for a, b in zip(first, second) if a is not None and b is not None
+    )
+    norm = math.sqrt(
+        sum(a * a for a in first if a is not None)
+        * sum(b * b for b in second if b is not None)
+    )
+    return dot / norm
+
+
+def expected_neighbours(count):
+    expected = {}
+    for idx, row in enumerate(SCORES):
+        if all(score is None for score in row):
+            continue
+        similar = sorted(
+            (
+                (-cosine(row, other), other_idx)
+                for other_idx, other in enumerate(SCORES)
+                if other_idx != idx and any(
+                    score is not None for score in other
+                )
+            ),
+        )
+        expected[idx] = [
+            (other_idx, -score) for score, other_idx in similar[:count]
+            if score < 0
+        ]
+    return expected
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29SimilarTitles:
+
+    @pytest.mark.parametrize('block_cells', (1, 4_000_000))
+    def test_01_matches_cosine_similarity(self, block_cells):
+        titles = create_catalog()
+        rebuild_similar_titles(2, chunk_size=3, block_cells=block_cells)
+        for idx, neighbours in expected_neighbours(2).items():
+            links = SimilarTitle.objects.filter(title=titles[idx])
+            assert [
+                (link.similar_id, link.rank) for link in links
+            ] == [
+                (titles[other].pk, rank)
+                for rank, (other, _) in enumerate(neighbours, 1)
+            ], (
+                'Проверьте, что для произведения сохраняются самые похожие '
+                'произведения по убыванию косинусного сходства оценок.'
+            )
+            for link, (_, score) in zip(links, neighbours):
+                assert math.isclose(link.score, score, rel_tol=1e-5)
+        assert not SimilarTitle.objects.filter(title=titles[4]).exists()
+
+    def test_02_endpoint_reads_neighbour_table(self, client):
+        titles = create_catalog()
+        call_command('rebuild_similar_titles', count=2)
+        url = f'/api/v1/titles/{titles[0].pk}/similar/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert [title['id'] for title in response.json()] == [
+            titles[1].pk, titles[2].pk
+        ]
+        assert response.json()[0]['category'] == {
+            'name': 'Фильм', 'slug': 'movie'
+        }
+        assert not any(
+            '"reviews_review"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что похожие произведения читаются из таблицы '
+            'похожих произведений, а не вычисляются по отзывам.'
+        )
+
+        response = client.get(f'{url}?fields=id,name')
+        assert all(set(title) == {'id', 'name'} for title in response.json())
+
+    def test_03_empty_and_missing(self, client):
+        titles = create_catalog()
+        response = client.get(f'/api/v1/titles/{titles[4].pk}/similar/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == []
+        response = client.get('/api/v1/titles/0/similar/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_rebuild_replaces_links(self):
+        titles = create_catalog()
+        rebuild_similar_titles(3)
+        Review.objects.filter(title=titles[2]).delete()
+        rebuild_similar_titles(3)
+        assert not SimilarTitle.objects.filter(title=titles[2]).exists()
+        assert not SimilarTitle.objects.filter(similar=titles[2]).exists()
+        titles[0].delete()
+        assert not SimilarTitle.objects.filter(
+            similar_id=titles[0].pk
+        ).exists()